@@ -0,0 +1,127 @@
+import datetime
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Optional
+from app.auth import jwt_utils
+from app.utils import file_utils
+from app.utils.tracing import span
+
+
+@dataclass(frozen=True)
+class AuthContext:
+    """Identité de l'utilisateur connecté, extraite du token JWT."""
+    user_id: int
+    role: str
+    nom: str
+    prenom: str
+    expiry: datetime.datetime
+
+    @classmethod
+    def from_payload(cls, payload: dict) -> "AuthContext":
+        """Construit le contexte à partir d'un payload JWT décodé."""
+        return cls(
+            user_id=payload.get("user_id"),
+            role=payload.get("role"),
+            nom=payload.get("nom"),
+            prenom=payload.get("prenom"),
+            expiry=datetime.datetime.fromtimestamp(
+                payload.get("exp", 0), tz=datetime.timezone.utc
+            )
+        )
+
+    @property
+    def is_expired(self) -> bool:
+        return datetime.datetime.now(datetime.timezone.utc) >= self.expiry
+
+
+class _AuthScope:
+    """Contexte d'authentification mémorisé pour la durée d'un bloc."""
+    def __init__(self):
+        self.resolved = False
+        self.context = None
+
+
+_current_scope: ContextVar[Optional[_AuthScope]] = ContextVar(
+    "auth_scope", default=None
+)
+
+
+def resolve_auth_context() -> Optional[AuthContext]:
+    """Lit, déchiffre et vérifie le token stocké localement."""
+    with span("auth", "Lecture et vérification du token"):
+        token = file_utils.load_token()
+        if not token:
+            return None
+
+        payload = jwt_utils.decode_token(token)
+        if not payload:
+            return None
+        return AuthContext.from_payload(payload)
+
+
+def get_auth_context() -> Optional[AuthContext]:
+    """
+    Retourne le contexte d'authentification de la commande en cours.
+
+    Dans un bloc `auth_scope()`, le token n'est lu, déchiffré et vérifié
+    qu'une seule fois (puis de nouveau s'il a expiré entre-temps, dans
+    un bloc de longue durée comme le shell interactif) ; en dehors, il
+    est résolu à chaque appel.
+    """
+    scope = _current_scope.get()
+    if scope is None:
+        return resolve_auth_context()
+
+    if not scope.resolved or (
+        scope.context is not None and scope.context.is_expired
+    ):
+        scope.context = resolve_auth_context()
+        scope.resolved = True
+    return scope.context
+
+
+def invalidate_auth_context():
+    """Force une nouvelle résolution (après un login ou un logout)."""
+    scope = _current_scope.get()
+    if scope is not None:
+        scope.resolved = False
+        scope.context = None
+
+
+@contextmanager
+def auth_scope(context: Optional[AuthContext] = None):
+    """
+    Mémorise le contexte d'authentification pour la durée du bloc.
+    Les blocs imbriqués réutilisent le contexte du bloc englobant.
+
+    Un `context` fourni est utilisé tel quel, sans lire le token (tests de
+    charge, exécutions pour le compte d'un collaborateur donné).
+    """
+    if _current_scope.get() is not None:
+        yield
+        return
+
+    scope = _AuthScope()
+    if context is not None:
+        scope.context = context
+        scope.resolved = True
+    reset_token = _current_scope.set(scope)
+    try:
+        yield
+    finally:
+        _current_scope.reset(reset_token)
+
+
+def auth_stats() -> dict:
+    """Nombre de lectures de clé, de déchiffrements et de vérifications."""
+    return {
+        "key_reads": file_utils.STATS["key_reads"],
+        "decrypts": file_utils.STATS["decrypts"],
+        "jwt_verifies": jwt_utils.STATS["verifies"],
+    }
+
+
+def reset_auth_stats():
+    file_utils.STATS.clear()
+    jwt_utils.STATS.clear()
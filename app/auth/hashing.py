@@ -0,0 +1,123 @@
+import os
+from contextlib import contextmanager
+from contextvars import ContextVar
+from concurrent.futures import ProcessPoolExecutor
+from argon2 import PasswordHasher
+from app.core.config import settings
+
+ph = PasswordHasher(
+    time_cost=settings.ARGON2_TIME_COST,
+    memory_cost=settings.ARGON2_MEMORY_COST,
+    parallelism=settings.ARGON2_PARALLELISM,
+)
+
+# Hasheur propre à chaque processus du pool
+_worker_hasher = None
+
+# Rehash en attente de la commande de connexion en cours :
+# (id du collaborateur, ancien hash, mot de passe), voir `deferred_rehashes`
+_pending_rehashes: ContextVar = ContextVar("pending_rehashes", default=None)
+
+
+def hash_password(password: str) -> str:
+    """Hache un mot de passe avec les paramètres Argon2 configurés."""
+    return ph.hash(password)
+
+
+@contextmanager
+def deferred_rehashes():
+    """
+    Collecte les mises à niveau de hash signalées dans le bloc, pour les
+    confier une fois la connexion affichée à un processus détaché
+    (`app.auth.rehash`).
+    Les mots de passe en clair sont effacés à la sortie du bloc, y compris
+    après un échec ou une exception.
+    """
+    pending = []
+    reset_token = _pending_rehashes.set(pending)
+    try:
+        yield pending
+    finally:
+        pending.clear()
+        _pending_rehashes.reset(reset_token)
+
+
+def schedule_rehash(collaborateur_id, password_hash: str, password: str):
+    """
+    Met de côté la mise à niveau d'un hash dans le bloc
+    `deferred_rehashes` en cours. Hors d'un tel bloc, rien n'est conservé :
+    le hash sera mis à niveau à une prochaine connexion.
+    """
+    pending = _pending_rehashes.get()
+    if pending is not None:
+        pending.append((collaborateur_id, password_hash, password))
+
+
+def pop_pending_rehashes() -> list:
+    """Retourne et vide la liste des rehash en attente du bloc en cours."""
+    pending = _pending_rehashes.get()
+    if not pending:
+        return []
+    popped = list(pending)
+    pending.clear()
+    return popped
+
+
+def argon2_parameters(hasher: PasswordHasher = None) -> dict:
+    """Paramètres d'un hasheur, transmis aux processus du pool."""
+    hasher = hasher or ph
+    return {
+        "time_cost": hasher.time_cost,
+        "memory_cost": hasher.memory_cost,
+        "parallelism": hasher.parallelism,
+    }
+
+
+def _init_worker(parameters):
+    global _worker_hasher
+    _worker_hasher = PasswordHasher(**parameters)
+
+
+def _hash_in_worker(password):
+    return _worker_hasher.hash(password)
+
+
+def hash_workers(workers: int = None) -> int:
+    """Nombre de processus de hachage (HASH_WORKERS, ou un par CPU)."""
+    workers = settings.HASH_WORKERS if workers is None else workers
+    return workers or os.cpu_count() or 1
+
+
+@contextmanager
+def hashing_pool(workers: int = None):
+    """
+    Fournit une fonction hachant une liste de mots de passe dans un pool
+    de processus, réutilisable pour plusieurs lots : Argon2 ne libère que
+    partiellement le GIL, des threads ne suffiraient pas.
+    """
+    workers = hash_workers(workers)
+    if workers <= 1:
+        yield lambda passwords: [ph.hash(password) for password in passwords]
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(argon2_parameters(),)
+    ) as pool:
+        def hash_many(passwords):
+            passwords = list(passwords)
+            chunksize = max(1, len(passwords) // (workers * 4))
+            return list(
+                pool.map(_hash_in_worker, passwords, chunksize=chunksize)
+            )
+        yield hash_many
+
+
+def hash_passwords(passwords, workers: int = None) -> list:
+    """Hache plusieurs mots de passe en parallèle, dans leur ordre."""
+    passwords = list(passwords)
+    if not passwords:
+        return []
+    with hashing_pool(min(hash_workers(workers), len(passwords))) as hash_many:
+        return hash_many(passwords)
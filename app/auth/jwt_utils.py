@@ -1,7 +1,11 @@
 import jwt
 import datetime
+from collections import Counter
 from app.core.config import settings
 
+# Compteur de vérifications de signature JWT
+STATS = Counter()
+
 
 def generate_token(user_id: int, role: str, nom: str, prenom: str):
     """Génère un token JWT pour un utilisateur."""
@@ -18,6 +22,7 @@ def generate_token(user_id: int, role: str, nom: str, prenom: str):
 
 def decode_token(token: str):
     """Décode et vérifie un token JWT."""
+    STATS["verifies"] += 1
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=["HS256"])
         return payload
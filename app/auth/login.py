@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from app.crud.collaborateurs import authentifier_collaborateur_from_crud
 from app.auth.jwt_utils import generate_token
+from app.auth.rate_limit import LoginRateLimiter
 from app.utils.file_utils import save_token
 
 
@@ -12,10 +13,22 @@ def authentifier_collaborateur(db: Session, login: str, password: str):
     return None
 
 
-def login(db: Session, login: str, password: str):
-    """Authentifie un utilisateur et retourne un JWT."""
+def login(db: Session, login: str, password: str, limiter=None):
+    """
+    Authentifie un utilisateur et retourne un JWT. Après trop d'échecs
+    récents pour ce login ou ce poste, la vérification Argon2 n'est même
+    pas tentée.
+    """
+    limiter = limiter or LoginRateLimiter()
+    retry_after = limiter.retry_after(login)
+    if retry_after:
+        print("Erreur : Trop de tentatives de connexion. Réessayez dans "
+              f"{retry_after} s.")
+        return None
+
     collaborateur = authentifier_collaborateur(db, login, password)
     if collaborateur:
+        limiter.reset(login)
         role = collaborateur.departement.nom
         token = generate_token(
             user_id=collaborateur.id,
@@ -27,5 +40,6 @@ def login(db: Session, login: str, password: str):
         print("Authentification réussie. Votre jeton a été sauvegardé.")
         return token
     else:
+        limiter.record_failure(login)
         print("Erreur : Login ou mot de passe incorrect.")
         return None
@@ -0,0 +1,111 @@
+from typing import Optional
+from rich.console import Console
+from app.auth.context import get_auth_context
+from app.utils.sentry import sentry_sdk
+
+console = Console()
+
+# Clé de ctx.meta : présente lorsque la commande passe par CustomCLI
+META_KEY = "epicevents.permission_index"
+
+
+class _Node:
+    __slots__ = ("children", "granted")
+
+    def __init__(self):
+        self.children = {}
+        self.granted = False
+
+
+class PermissionIndex:
+    """
+    Arbre préfixe des commandes autorisées par rôle, construit une seule
+    fois à partir de ROLE_COMMANDS. Autoriser un groupe (« clients »)
+    autorise toutes ses sous-commandes ; un chemin complet
+    (« clients list ») n'autorise que cette sous-commande.
+    """
+
+    def __init__(self, role_commands: dict):
+        self.role_commands = {
+            role: list(paths) for role, paths in role_commands.items()
+        }
+        self._roots = {}
+        for role, paths in self.role_commands.items():
+            root = self._roots.setdefault(role, _Node())
+            for path in paths:
+                node = root
+                for name in path.split():
+                    node = node.children.setdefault(name, _Node())
+                node.granted = True
+
+    def commands(self, role: str) -> list:
+        """Commandes déclarées pour le rôle, dans l'ordre de ROLE_COMMANDS."""
+        return self.role_commands.get(role, [])
+
+    def allows(self, role: str, path) -> bool:
+        """
+        Indique si le rôle peut invoquer `path` (suite de noms de commande).
+        Un groupe est accessible dès qu'une de ses sous-commandes l'est.
+        """
+        node = self._roots.get(role)
+        if node is None:
+            return False
+        for name in path:
+            if node.granted:
+                return True
+            node = node.children.get(name)
+            if node is None:
+                return False
+        return True
+
+
+_index: Optional[PermissionIndex] = None
+
+
+def get_permission_index() -> PermissionIndex:
+    """Index des permissions, construit au premier appel."""
+    global _index
+    if _index is None:
+        from app.utils.config import get_role_commands
+
+        _index = PermissionIndex(get_role_commands())
+    return _index
+
+
+def command_path(ctx, cmd_name: str = None) -> list:
+    """Chemin d'une commande (« clients », « list »), sans le programme."""
+    names = []
+    while ctx is not None and ctx.parent is not None:
+        names.append(ctx.info_name)
+        ctx = ctx.parent
+    names.reverse()
+    if cmd_name is not None:
+        names.append(cmd_name)
+    return names
+
+
+def current_role() -> Optional[str]:
+    auth = get_auth_context()
+    return auth.role if auth else None
+
+
+def denial_message(path, role: str) -> str:
+    return (
+        f"Accès refusé : La commande '{' '.join(path)}' n'est pas "
+        f"disponible pour votre rôle '{role}'. "
+    )
+
+
+def check_command(ctx, path, index: PermissionIndex = None):
+    """
+    Arrête la commande (code 1) si le rôle connecté n'a pas accès à
+    `path`. Sans utilisateur connecté, la vérification revient aux
+    commandes elles-mêmes (role_required).
+    """
+    index = index or get_permission_index()
+    role = current_role()
+    if role and not index.allows(role, path):
+        error_message = denial_message(path, role)
+        console.print(f"[bold red]{error_message}[/bold red]")
+        sentry_sdk.capture_message(error_message, level="warning")
+        ctx.exit(1)
@@ -1,7 +1,9 @@
 from functools import wraps
+import click
 from rich.console import Console
-from app.auth.jwt_utils import decode_token
-from app.utils.file_utils import load_token
+from app.auth.context import get_auth_context
+from app.auth.permission_index import META_KEY, command_path, denial_message
+from app.utils.config import record_error
 import jwt
 from app.utils.sentry import sentry_sdk
 
@@ -13,18 +15,18 @@ def role_required(allowed_roles):
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
-            token = load_token()
-            if not token:
+            auth = get_auth_context()
+            if not auth:
                 error_message = (
                     "Vous devez être connecté pour utiliser cette commande."
                 )
                 console.print(f"[bold red]{error_message}[/bold red]")
                 sentry_sdk.capture_message(error_message, level="warning")
+                record_error(error_message)
                 return
 
             try:
-                payload = decode_token(token)
-                user_role = payload.get("role")
+                user_role = auth.role
 
                 if user_role not in allowed_roles:
                     error_message = (
@@ -35,8 +37,23 @@ def role_required(allowed_roles):
                     )
                     console.print(f"[bold red]{error_message}[/bold red]")
                     sentry_sdk.capture_message(error_message, level="warning")
+                    record_error(error_message)
                     return
 
+                # Sous ROLE_COMMANDS, via l'index partagé avec la CLI
+                ctx = click.get_current_context(silent=True)
+                index = ctx.meta.get(META_KEY) if ctx else None
+                if index is not None:
+                    path = command_path(ctx)
+                    if path and not index.allows(user_role, path):
+                        error_message = denial_message(path, user_role)
+                        console.print(f"[bold red]{error_message}[/bold red]")
+                        sentry_sdk.capture_message(
+                            error_message, level="warning"
+                        )
+                        record_error(error_message)
+                        return
+
                 return func(*args, **kwargs)
             except jwt.ExpiredSignatureError:
                 error_message = (
@@ -45,10 +62,20 @@ def role_required(allowed_roles):
                 )
                 console.print(f"[bold red]{error_message}[/bold red]")
                 sentry_sdk.capture_message(error_message, level="warning")
+                record_error(error_message)
+            except ValueError as e:
+                # Règle métier refusée par le service : message tel quel
+                error_message = str(e)
+                if not error_message.startswith("Erreur"):
+                    error_message = f"Erreur : {error_message}"
+                console.print(f"[bold red]{error_message}[/bold red]")
+                sentry_sdk.capture_exception(e)
+                record_error(error_message)
             except Exception as e:
                 error_message = f"Erreur d'authentification : {e}"
                 console.print(f"[bold red]{error_message}[/bold red]")
                 sentry_sdk.capture_exception(e)
+                record_error(error_message)
         return wrapper
     return decorator
 
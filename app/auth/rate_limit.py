@@ -0,0 +1,87 @@
+import os
+import sqlite3
+import time
+from contextlib import closing
+from app.core.config import settings
+
+
+def client_key() -> str:
+    """
+    Identifie le poste à l'origine de la connexion : adresse de la session
+    SSH sur un bastion partagé, sinon la machine locale.
+    """
+    ssh_client = os.environ.get("SSH_CLIENT", "").split()
+    return ssh_client[0] if ssh_client else "local"
+
+
+class LoginRateLimiter:
+    """
+    Limite les échecs de connexion sur une fenêtre glissante, par login et
+    par poste, dans une petite base SQLite locale partagée par les processus.
+    """
+
+    def __init__(self, path: str = None, window: int = None,
+                 max_attempts: int = None, max_per_client: int = None,
+                 clock=time.time):
+        self.path = path or settings.LOGIN_ATTEMPTS_FILE
+        self.window = window or settings.LOGIN_WINDOW_SECONDS
+        self.max_attempts = max_attempts or settings.LOGIN_MAX_ATTEMPTS
+        self.max_per_client = (
+            max_per_client or settings.LOGIN_MAX_ATTEMPTS_PER_CLIENT
+        )
+        self.clock = clock
+
+    def connect(self):
+        created = not os.path.exists(self.path)
+        connection = sqlite3.connect(self.path, timeout=5)
+        if created:
+            os.chmod(self.path, 0o600)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS attempts (key TEXT, ts REAL)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS ix_attempts_key_ts "
+            "ON attempts (key, ts)"
+        )
+        return connection
+
+    def keys(self, login: str):
+        return [
+            (f"login:{login}", self.max_attempts),
+            (f"client:{client_key()}", self.max_per_client),
+        ]
+
+    def retry_after(self, login: str) -> int:
+        """
+        Secondes à attendre avant une nouvelle tentative (0 : autorisée).
+        """
+        now = self.clock()
+        wait = 0
+        with closing(self.connect()) as connection, connection:
+            connection.execute(
+                "DELETE FROM attempts WHERE ts <= ?", (now - self.window,)
+            )
+            for key, limit in self.keys(login):
+                count, oldest = connection.execute(
+                    "SELECT COUNT(*), MIN(ts) FROM attempts WHERE key = ?",
+                    (key,)
+                ).fetchone()
+                if count >= limit:
+                    wait = max(wait, int(oldest + self.window - now) + 1)
+        return wait
+
+    def record_failure(self, login: str):
+        """Enregistre un échec pour le login et pour le poste."""
+        now = self.clock()
+        with closing(self.connect()) as connection, connection:
+            connection.executemany(
+                "INSERT INTO attempts (key, ts) VALUES (?, ?)",
+                [(key, now) for key, _ in self.keys(login)]
+            )
+
+    def reset(self, login: str):
+        """Oublie les échecs du login après une connexion réussie."""
+        with closing(self.connect()) as connection, connection:
+            connection.execute(
+                "DELETE FROM attempts WHERE key = ?", (f"login:{login}",)
+            )
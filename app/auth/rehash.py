@@ -0,0 +1,55 @@
+import json
+import os
+import subprocess
+import sys
+
+# Racine du projet : le processus de mise à niveau y importe `app`
+PROJECT_ROOT = os.path.dirname(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+)
+
+
+def start_rehash_worker(pending):
+    """
+    Confie les mises à niveau de hash `pending` (id, ancien hash, mot de
+    passe) à un processus détaché, sans attendre le hachage : la commande
+    de connexion rend la main aussitôt. Les mots de passe passent par un
+    tube, jamais par la ligne de commande ni par le disque. Retourne le
+    processus lancé, ou None si rien n'est à faire ou si le lancement
+    échoue (le hash sera mis à niveau à une prochaine connexion).
+    """
+    if not pending:
+        return None
+    try:
+        process = subprocess.Popen(
+            [sys.executable, "-m", "app.auth.rehash"],
+            stdin=subprocess.PIPE, stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL, cwd=PROJECT_ROOT,
+            start_new_session=True,
+        )
+        with process.stdin:
+            process.stdin.write(json.dumps(pending).encode("utf-8"))
+    except OSError:
+        return None
+    return process
+
+
+def main(stream=None, session_factory=None) -> int:
+    """
+    Point d'entrée du processus détaché : lit les mises à niveau en
+    attente sur l'entrée standard et les applique. Retourne le nombre de
+    hashs mis à niveau.
+    """
+    from app.crud.collaborateurs import apply_pending_rehashes
+
+    if session_factory is None:
+        from app.db.session import SessionLocal as session_factory
+
+    stream = stream or sys.stdin.buffer
+    pending = [tuple(entry) for entry in json.loads(stream.read() or "[]")]
+    with session_factory() as db:
+        return apply_pending_rehashes(db, pending)
+
+
+if __name__ == "__main__":
+    main()
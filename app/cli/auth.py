@@ -1,7 +1,7 @@
-from app.auth.login import login
-from app.db.session import SessionLocal
-from app.auth.jwt_utils import decode_token
-from app.utils.file_utils import load_token, delete_token
+from app.auth.context import get_auth_context, invalidate_auth_context
+from app.db.scope import session_scope
+from app.utils.config import print_error
+from app.utils.file_utils import delete_token
 import click
 from rich.console import Console
 
@@ -28,14 +28,25 @@ def user_login(username, password):
     """
     Commande pour se connecter en utilisant la fonction login existante.
     """
-    with SessionLocal() as db:
+    # Import local : SQLAlchemy et Argon2 ne sont chargés que pour le login
+    from app.auth.hashing import deferred_rehashes, pop_pending_rehashes
+    from app.auth.login import login
+    from app.auth.rehash import start_rehash_worker
+
+    # Le mot de passe en attente de rehash est effacé en sortie de bloc,
+    # quelle que soit l'issue de la connexion
+    with deferred_rehashes(), session_scope() as db:
         token = login(db, username, password)  # Appelle la fonction login
+        invalidate_auth_context()
         if token:
             console.print("[bold green]Connexion réussie ![/bold green]")
             console.print("[yellow]Votre token JWT a été sauvegardé.[/yellow]")
+            # Mise à niveau du hash dans un processus détaché : la
+            # commande rend la main sans attendre le hachage
+            start_rehash_worker(pop_pending_rehashes())
         else:
-            console.print(
-                "[bold red]Échec de la connexion. Identifiants "
+            print_error(
+                console, "[bold red]Échec de la connexion. Identifiants "
                 "invalides.[/bold red]"
             )
 
@@ -45,17 +56,12 @@ def user_status():
     """
     Vérifie si l'utilisateur est connecté et affiche son rôle.
     """
-    token = load_token()
-    if not token:
-        console.print("[bold red]Vous n'êtes pas connecté.[/bold red]")
-        return
-
-    payload = decode_token(token)
-    if payload:
-        user_id = payload.get("user_id")
-        role = payload.get("role")
-        nom = payload.get("nom")
-        prenom = payload.get("prenom")
+    auth = get_auth_context()
+    if auth:
+        user_id = auth.user_id
+        role = auth.role
+        nom = auth.nom
+        prenom = auth.prenom
         console.print("[bold green]Vous êtes connecté.[/bold green]")
         console.print(f"ID Utilisateur : [cyan]{user_id}[/cyan]")
         console.print(f"Nom : [yellow]{nom}[/yellow]")
@@ -63,7 +69,10 @@ def user_status():
 
         console.print(f"Rôle : [yellow]{role}[/yellow]")
     else:
-        console.print("[bold red]Token invalide ou expiré.[/bold red]")
+        print_error(
+            console, "[bold red]Vous n'êtes pas connecté, ou votre token est "
+            "invalide ou expiré.[/bold red]"
+        )
 
 
 @auth_group.command(
@@ -76,7 +85,9 @@ def logout():
     """
     console.print("[bold cyan]Tentative de déconnexion...[/bold cyan]")
 
-    if delete_token():
+    deleted = delete_token()
+    invalidate_auth_context()
+    if deleted:
         console.print("[bold green]Déconnexion réussie. Votre token a été "
                       "supprimé.[/bold green]")
     else:
@@ -0,0 +1,152 @@
+import io
+import shlex
+import sys
+from contextlib import ExitStack
+import click
+from rich.console import Console
+from rich.markup import escape
+from app.auth.context import auth_scope
+from app.db.scope import command_session_scope
+from app.utils.config import non_interactive
+from app.utils.sentry import sentry_sdk
+
+console = Console()
+
+
+def read_commands(lines):
+    """
+    Découpe les lignes d'un fichier batch en arguments de commande.
+    Les lignes vides et les commentaires (#) sont ignorés.
+    """
+    for lineno, line in enumerate(lines, start=1):
+        try:
+            args = shlex.split(line, comments=True)
+        except ValueError as e:
+            yield lineno, e
+            continue
+        if args:
+            yield lineno, args
+
+
+class BatchRunner:
+    """
+    Exécute une suite de commandes dans un seul processus, avec une seule
+    résolution de l'authentification et une seule session de base de
+    données.
+
+    En mode `atomic`, toutes les commandes s'exécutent dans une même
+    transaction : les `commit()` des commandes deviennent des savepoints,
+    et la transaction n'est validée que si aucune commande n'a échoué.
+    """
+
+    def __init__(self, cli, atomic=False):
+        self.cli = cli
+        self.atomic = atomic
+        self.failed = False
+        self.errors = []
+        self.executed = 0
+        self.failures = 0
+
+    def run(self, lines):
+        """Exécute les commandes et retourne le nombre d'échecs."""
+        from sqlalchemy import event
+        from app.db import session
+
+        with ExitStack() as stack:
+            options = {}
+            transaction = None
+            if self.atomic:
+                connection = stack.enter_context(session.engine.connect())
+                transaction = connection.begin()
+                options = {
+                    "bind": connection,
+                    "join_transaction_mode": "create_savepoint",
+                }
+
+            def open_session():
+                db = session.SessionLocal(**options)
+                event.listen(
+                    db, "after_soft_rollback", self.mark_failed
+                )
+                return db
+
+            with non_interactive() as self.errors, auth_scope(), \
+                    command_session_scope(open_session):
+                self.run_commands(lines)
+
+            if transaction is not None:
+                if self.failures:
+                    transaction.rollback()
+                    console.print(
+                        "[bold red]Transaction annulée : aucune modification "
+                        "n'a été enregistrée.[/bold red]"
+                    )
+                else:
+                    transaction.commit()
+
+        console.print(
+            f"[bold cyan]Batch terminé : {self.executed} commande(s), "
+            f"{self.failures} échec(s).[/bold cyan]"
+        )
+        return self.failures
+
+    def run_commands(self, lines):
+        for lineno, args in read_commands(lines):
+            self.executed += 1
+            if isinstance(args, ValueError):
+                ok = False
+                console.print(
+                    f"[bold red]Ligne {lineno} : {escape(str(args))}"
+                    "[/bold red]"
+                )
+            else:
+                # Seuls le groupe et la commande sont affichés : les
+                # arguments peuvent contenir des mots de passe.
+                console.print(
+                    f"[bold cyan]▶ Ligne {lineno} : "
+                    f"{escape(' '.join(args[:2]))}[/bold cyan]"
+                )
+                ok = self.run_command(args)
+
+            if not ok:
+                self.failures += 1
+                console.print(
+                    f"[bold red]Échec de la commande ligne {lineno}."
+                    "[/bold red]"
+                )
+                if self.atomic:
+                    break
+
+    def run_command(self, args):
+        """Exécute une commande ; retourne False si elle a échoué."""
+        self.failed = False
+        self.errors.clear()
+        # Une saisie manquante ne doit pas lire l'entrée du batch
+        stdin, sys.stdin = sys.stdin, io.StringIO()
+        try:
+            result = self.cli.main(
+                args=args, prog_name="main.py", standalone_mode=False
+            )
+        except click.exceptions.Abort:
+            console.print(
+                "[bold red]Erreur : saisie interactive impossible en mode "
+                "batch.[/bold red]"
+            )
+            return False
+        except click.ClickException as e:
+            console.print(f"[bold red]Erreur : {escape(e.format_message())}"
+                          "[/bold red]")
+            return False
+        except Exception as e:
+            sentry_sdk.capture_exception(e)
+            console.print(
+                f"[bold red]Erreur inattendue : {escape(str(e))}[/bold red]"
+            )
+            return False
+        finally:
+            sys.stdin = stdin
+        return not (self.failed or self.errors or result)
+
+    def mark_failed(self, db, previous_transaction=None):
+        """Une commande qui annule ses modifications est en échec."""
+        self.failed = True
@@ -1,18 +1,27 @@
 import click
 from rich.console import Console
+from rich.markup import escape
 import re
 from app.services.client_service import (
     list_all_clients,
     create_client_for_commercial,
     update_client_by_commercial,
-    get_client_details
+    get_client_details,
+    import_clients,
+    search_clients,
+    IMPORT_CHUNK_SIZE,
+    SEARCH_PAGE_SIZE
 )
 from app.crud.clients import get_client_id
-from app.utils.file_utils import load_token
-from app.auth.jwt_utils import decode_token
-from app.db.session import SessionLocal
+from app.auth.context import get_auth_context
+from app.db.session import session_scope
 from app.auth.permissions import role_required
-from app.utils.config import CustomGroup
+from app.utils.config import (
+    CustomGroup, ask, pagination_options, print_error, print_next_page_hint
+)
+from app.utils.records import RECORD_FORMATS, guess_format, read_records
+from app.utils.rendering import print_table
+from app.crud.clients import search_words
 
 console = Console()
 
@@ -35,98 +44,174 @@ def clients_group(ctx):
 @clients_group.command(name="list")
 @role_required(["gestion", "support", "commercial"])
 @click.option("-all", "-a", is_flag=True)
-def list_clients(all):
+@pagination_options
+def list_clients(all, page_size, after_id, stream):
     """
     Liste les clients disponibles dans le CRM.
     """
-    token = load_token()
-    if not token:
-        console.print("[bold red]Erreur : Vous devez être connecté pour "
-                      "accéder à cette commande.[/bold red]")
-        return
-
-    # Décoder le token et vérifier le rôle
-    payload = decode_token(token)
-    if not payload:
-        console.print("[bold red]Erreur : Token invalide ou expiré. "
-                      "Veuillez vous reconnecter.[/bold red]")
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
         return
 
-    role = payload.get("role")
+    role = auth.role
     console.print(f"[bold cyan]Rôle actuel : {role}[/bold cyan]")
 
     # Se connecter à la base de données
-    with SessionLocal() as db:
+    with session_scope() as db:
         try:
-            clients = list_all_clients(db=db, token=token, all_clients=all)
+            clients = list_all_clients(
+                db=db, auth=auth, all_clients=all, page_size=page_size,
+                after_id=after_id, stream=stream
+            )
 
-            if clients:
-                mode = "TOUS" if all else "MES CLIENTS"
-                console.print(
-                    f"[bold green]Liste des clients ({mode}):[/bold green]"
-                )
-                for client in clients:
+            count, last = 0, None
+            for client in clients or []:
+                if not count:
+                    mode = "TOUS" if all else "MES CLIENTS"
                     console.print(
-                        f"[bold yellow]ID {client.id}[/bold yellow] - "
-                        f"{client.nom_complet} - {client.email} - "
-                        f"{client.telephone}"
+                        f"[bold green]Liste des clients ({mode}):"
+                        "[/bold green]"
                     )
-            else:
+                console.print(
+                    f"[bold yellow]ID {client.id}[/bold yellow] - "
+                    f"{client.nom_complet} - {client.email} - "
+                    f"{client.telephone}"
+                )
+                count, last = count + 1, client
+
+            if not count:
                 console.print("[bold magenta]Aucun client trouvé."
                               "[/bold magenta]")
+            print_next_page_hint(console, count, last, page_size)
         except Exception as e:
-            console.print(
+            print_error(
+                console,
                 f"[bold red]Erreur lors de la récupération des clients : "
                 f"{e}[/bold red]"
             )
 
 
+@clients_group.command(name="search")
+@role_required(["gestion", "support", "commercial"])
+@click.argument("term", nargs=-1, required=True)
+@click.option("--page", type=click.IntRange(min=1), default=1,
+              help="Numéro de la page de résultats.")
+@click.option("--page-size", type=click.IntRange(min=1),
+              default=SEARCH_PAGE_SIZE, show_default=True,
+              help="Nombre de résultats par page.")
+def search(term, page, page_size):
+    """
+    Recherche des clients par nom, email, entreprise ou téléphone (début
+    de mot), les plus pertinents d'abord.
+    """
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
+        return
+
+    term = " ".join(term)
+    if not search_words(term):
+        print_error(
+            console,
+            "[bold red]Erreur : Le terme de recherche est vide."
+            "[/bold red]"
+        )
+        return
+
+    with session_scope() as db:
+        try:
+            clients = search_clients(
+                db, auth, term, page=page, page_size=page_size
+            )
+            count, _ = print_table(
+                console,
+                f"[bold green]Clients correspondant à « {escape(term)} » "
+                f"(page {page})[/bold green]",
+                [
+                    ("ID", {"style": "cyan"}),
+                    ("Nom", {"style": "magenta"}),
+                    ("Email", {"style": "yellow"}),
+                    ("Téléphone", {"style": "green"}),
+                    ("Entreprise", {"style": "green"}),
+                ],
+                clients or [],
+                lambda client: (
+                    str(client.id), escape(client.nom_complet),
+                    escape(client.email), client.telephone or "",
+                    escape(client.nom_entreprise or "")
+                )
+            )
+
+            if not count:
+                console.print("[bold magenta]Aucun client trouvé."
+                              "[/bold magenta]")
+            elif count == page_size:
+                console.print(
+                    f"[dim]Page suivante : --page {page + 1}[/dim]"
+                )
+        except Exception as e:
+            print_error(
+                console,
+                f"[bold red]Erreur lors de la recherche des clients : "
+                f"{escape(str(e))}[/bold red]"
+            )
+
+
 @clients_group.command(name="create")
 @role_required(["commercial"])
-def create_client():
+@click.option("--nom", help="Nom complet du client.")
+@click.option("--email", help="Email du client.")
+@click.option("--telephone", help="Téléphone du client.")
+@click.option("--entreprise", help="Nom de l'entreprise.")
+def create_client(nom, email, telephone, entreprise):
     """
     Créer un nouveau client en tant que commercial.
     """
-    # Charger et vérifier le token JWT
-    token = load_token()
-    if not token:
-        console.print("[bold red]Erreur : Vous devez être connecté pour cette "
-                      "commande.[/bold red]")
-        return
-
-    payload = decode_token(token)
-    if not payload:
-        console.print("[bold red]Erreur : Token invalide ou expiré. "
-                      "Veuillez vous reconnecter.[/bold red]")
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
         return
 
-    user_id = payload.get("user_id")
-    role = payload.get("role")
+    user_id = auth.user_id
+    role = auth.role
 
     # Vérifier que l'utilisateur est un commercial
     if role != "commercial":
-        console.print("[bold red]Erreur : Seuls les commerciaux peuvent créer "
-                      "un client.[/bold red]")
+        print_error(
+            console,
+            "[bold red]Erreur : Seuls les commerciaux peuvent créer "
+            "un client.[/bold red]"
+        )
         return
 
     console.print(f"[bold cyan]🔹 Token valide - Utilisateur ID {user_id} - "
                   f"Rôle : {role}[/bold cyan]")
 
     # Saisie des informations du client
-    nom = click.prompt("Nom complet", type=str).strip().lower().title()
-    email = click.prompt("Email", type=str).strip().lower()
+    nom = ask(
+        nom, "Nom complet", "--nom", type=str
+    ).strip().lower().title()
+    email = ask(email, "Email", "--email", type=str).strip().lower()
     if not re.match(r"[^@]+@[^@]+\.[^@]+", email):
-        console.print("[bold red]Erreur : Email invalide.[/bold red]")
+        print_error(console, "[bold red]Erreur : Email invalide.[/bold red]")
         return
-    telephone = click.prompt("Téléphone", type=str).strip()
+    telephone = ask(
+        telephone, "Téléphone", "--telephone", type=str
+    ).strip()
     if not re.match(r"0[1-9]\d{8}", telephone):
-        console.print("[bold red]Erreur : Numéro de "
-                      "téléphone invalide.[/bold red]")
+        print_error(console, "[bold red]Erreur : Numéro de "
+                             "téléphone invalide.[/bold red]")
         return
-    entreprise = click.prompt("Nom de l'entreprise", type=str).strip().title()
+    entreprise = ask(
+        entreprise, "Nom de l'entreprise", "--entreprise", type=str
+    ).strip().title()
 
     # Connexion à la base de données et création du client
-    with SessionLocal() as db:
+    with session_scope() as db:
         try:
             client = create_client_for_commercial(
                 db, user_id, nom, email, telephone, entreprise
@@ -136,79 +221,89 @@ def create_client():
                           "créé avec succès ![/bold green]")
         except Exception as e:
             db.rollback()
-            console.print(f"[bold red] Erreur lors de la création "
-                          f"du client : {e}[/bold red]")
+            print_error(console, f"[bold red] Erreur lors de la création "
+                                 f"du client : {e}[/bold red]")
 
 
 @clients_group.command(name="update")
 @role_required(["commercial"])
-def update_client():
+@click.option("--id", "client_id", type=int, help="ID du client.")
+@click.option("--nom", help="Nouveau nom complet.")
+@click.option("--email", help="Nouvel email.")
+@click.option("--telephone", help="Nouveau téléphone.")
+@click.option("--entreprise", help="Nouvelle entreprise.")
+def update_client(client_id, nom, email, telephone, entreprise):
     """
     Modifier un client existant en tant que commercial
     (uniquement ses propres clients).
     """
-    # Charger le token JWT sauvegardé
-    token = load_token()
-    if not token:
-        console.print("[bold red]Erreur : Vous devez être connecté "
-                      "pour cette commande.[/bold red]")
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
         return
 
-    # Décoder le token pour extraire les informations
-    payload = decode_token(token)
-    if not payload:
-        console.print("[bold red]Erreur : Token invalide ou expiré. "
-                      "Veuillez vous reconnecter.[/bold red]")
-        return
-
-    user_id = payload.get("user_id")
-    role = payload.get("role")
+    user_id = auth.user_id
+    role = auth.role
 
     # Vérifier si l'utilisateur a le bon rôle
     if role != "commercial":
-        console.print("[bold red]Erreur : Seuls les commerciaux peuvent "
-                      "modifier un client.[/bold red]")
+        print_error(
+            console,
+            "[bold red]Erreur : Seuls les commerciaux peuvent "
+            "modifier un client.[/bold red]"
+        )
         return
 
     # Demander l'ID du client à modifier
-    client_id = click.prompt("ID du client à modifier", type=int)
+    client_id = ask(
+        client_id, "ID du client à modifier", "--id", type=int
+    )
 
-    with SessionLocal() as db:
+    with session_scope() as db:
         client = get_client_id(db, client_id)
         if not client:
-            console.print("[bold red]Erreur : Client introuvable.[/bold red]")
+            print_error(
+                console,
+                "[bold red]Erreur : Client introuvable.[/bold red]"
+            )
             return
 
         if client.id_commercial != user_id:
-            console.print("[bold red]Erreur : Vous ne pouvez modifier que vos "
-                          "propres clients.[/bold red]")
+            print_error(
+                console,
+                "[bold red]Erreur : Vous ne pouvez modifier que vos "
+                "propres clients.[/bold red]"
+            )
             return
 
     # Demander les champs à modifier (avec valeurs par défaut à None)
-    nom = click.prompt(
-        "Nouveau nom (laisser vide pour ne pas changer)",
+    nom = ask(
+        nom, "Nouveau nom (laisser vide pour ne pas changer)", "--nom",
         default="",
         type=str
     ).strip().lower().title()
-    email = click.prompt(
-        "Nouvel email (laisser vide pour ne pas changer)",
+    email = ask(
+        email, "Nouvel email (laisser vide pour ne pas changer)", "--email",
         default="",
         type=str
     ).strip().lower()
     if email and not re.match(r"[^@]+@[^@]+\.[^@]+", email):
-        console.print("[bold red]Erreur : Email invalide.[/bold red]")
+        print_error(console, "[bold red]Erreur : Email invalide.[/bold red]")
         return
-    telephone = click.prompt(
-        "Nouveau téléphone (laisser vide pour ne pas changer)",
+    telephone = ask(
+        telephone, "Nouveau téléphone (laisser vide pour ne pas changer)",
+        "--telephone",
         default="",
         type=str
     ).strip()
     if telephone and not re.match(r"0[1-9]\d{8}", telephone):
-        console.print("[bold red]Erreur : Numéro de téléphone "
-                      "invalide.[/bold red]")
+        print_error(console, "[bold red]Erreur : Numéro de téléphone "
+                             "invalide.[/bold red]")
         return
-    entreprise = click.prompt(
-        "Nouvelle entreprise (laisser vide pour ne pas changer)",
+    entreprise = ask(
+        entreprise, "Nouvelle entreprise (laisser vide pour ne pas changer)",
+        "--entreprise",
         default="",
         type=str
     ).strip().title()
@@ -227,20 +322,66 @@ def update_client():
         return
 
     # Mettre à jour le client en base de données
-    with SessionLocal() as db:
+    with session_scope() as db:
         try:
             client = update_client_by_commercial(
-                db, token, client_id, **updates
+                db, auth, client_id, **updates
             )
             if client:
                 console.print(f"[bold green]Client ID {client.id} mis à jour "
                               "avec succès ![/bold green]")
         except PermissionError as e:
-            console.print(f"[bold red]Erreur d'autorisation : {e}[/bold red]")
+            print_error(
+                console,
+                f"[bold red]Erreur d'autorisation : {e}[/bold red]"
+            )
         except ValueError as e:
-            console.print(f"[bold red]Erreur : {e}[/bold red]")
+            print_error(console, f"[bold red]Erreur : {e}[/bold red]")
         except Exception as e:
-            console.print(f"[bold red]Erreur inattendue : {e}[/bold red]")
+            print_error(
+                console,
+                f"[bold red]Erreur inattendue : {e}[/bold red]"
+            )
+
+
+@clients_group.command(name="import")
+@role_required(["commercial"])
+@click.argument("fichier", type=click.File("r", encoding="utf-8"))
+@click.option(
+    "--format", "fmt", type=click.Choice(RECORD_FORMATS), default=None,
+    help="Format du fichier (déduit de l'extension par défaut)."
+)
+@click.option(
+    "--chunk-size", type=click.IntRange(min=1), default=IMPORT_CHUNK_SIZE,
+    show_default=True, help="Nombre de lignes insérées ensemble."
+)
+def import_clients_cli(fichier, fmt, chunk_size):
+    """
+    Importer des clients depuis un fichier CSV (avec en-tête) ou JSONL
+    (colonnes nom_complet, email, telephone, nom_entreprise).
+    """
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
+        return
+
+    fmt = fmt or guess_format(fichier.name)
+    with session_scope() as db:
+        report = import_clients(
+            db, auth, read_records(fichier, fmt), chunk_size=chunk_size
+        )
+    if report is None:
+        return
+
+    for lineno, message in report.errors:
+        print_error(
+            console, f"[bold red]Ligne {lineno} : {escape(message)}[/bold red]"
+        )
+    console.print(
+        f"[bold green]{report.inserted} client(s) importé(s), "
+        f"{len(report.errors)} ligne(s) en erreur.[/bold green]"
+    )
 
 
 @clients_group.command(name="show")
@@ -250,22 +391,16 @@ def show_client(client_id):
     """
     Affiche tous les détails d'un client par son ID.
     """
-    token = load_token()
-    if not token:
-        console.print("[bold red]Erreur : Vous devez être connecté pour cette "
-                      "commande.[/bold red]")
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
         return
 
-    payload = decode_token(token)
-    if not payload:
-        console.print("[bold red]Erreur : Token invalide ou expiré. "
-                      "Veuillez vous reconnecter.[/bold red]")
-        return
+    role = auth.role
+    user_id = auth.user_id
 
-    role = payload.get("role")
-    user_id = payload.get("user_id")
-
-    with SessionLocal() as db:
+    with session_scope() as db:
         try:
             client = get_client_details(db, client_id, user_id, role)
             if client:
@@ -310,8 +445,14 @@ def show_client(client_id):
                 console.print("[bold magenta]Client non trouvé ou "
                               "accès refusé.[/bold magenta]")
         except PermissionError as e:
-            console.print(f"[bold red]Erreur d'autorisation : {e}[/bold red]")
+            print_error(
+                console,
+                f"[bold red]Erreur d'autorisation : {e}[/bold red]"
+            )
         except ValueError as e:
-            console.print(f"[bold red]Erreur : {e}[/bold red]")
+            print_error(console, f"[bold red]Erreur : {e}[/bold red]")
         except Exception as e:
-            console.print(f"[bold red]Erreur inattendue : {e}[/bold red]")
+            print_error(
+                console,
+                f"[bold red]Erreur inattendue : {e}[/bold red]"
+            )
@@ -2,21 +2,26 @@ import click
 import re
 from app.utils.sentry import sentry_sdk
 from rich.console import Console
+from rich.markup import escape
 from app.services.collaborateur_service import (
     create_new_collaborateur,
     update_existing_collaborateur,
     delete_collaborateur_service,
     all_collaborateurs,
-    get_collaborateur_by_id
+    get_collaborateur_by_id,
+    import_collaborateurs,
+    IMPORT_CHUNK_SIZE
 )
-from app.db.session import SessionLocal
+from app.db.session import session_scope
 from app.auth.permissions import role_required
-from app.utils.config import CustomGroup
-from app.utils.file_utils import load_token
-from app.auth.jwt_utils import decode_token
+from app.utils.config import (
+    CustomGroup, ask, pagination_options, print_error, print_next_page_hint
+)
+from app.auth.context import get_auth_context
 from app.services.departement_service import get_all_departements
 from app.crud.clients import get_clients_by_commercial
 from app.db.models.collaborateur import Collaborateur
+from app.utils.records import RECORD_FORMATS, guess_format, read_records
 
 console = Console()
 
@@ -38,26 +43,27 @@ def collaborateurs_group(ctx):
 
 @collaborateurs_group.command(name="create")
 @role_required(["gestion"])
-def create_collaborateur():
+@click.option("--nom", help="Nom du collaborateur.")
+@click.option("--prenom", help="Prénom du collaborateur.")
+@click.option("--email", help="Email du collaborateur.")
+@click.option("--login", help="Nom d'utilisateur.")
+@click.option("--password", help="Mot de passe.")
+@click.option("--departement", "departement_id", help="ID du département.")
+def create_collaborateur(nom, prenom, email, login, password,
+                         departement_id):
     """Créer un nouveau collaborateur en tant que gestionnaire."""
-    token = load_token()
-    if not token:
-        console.print("[bold red]Erreur : Vous devez être connecté pour "
-                      "cette commande.[/bold red]")
-        return
-
-    payload = decode_token(token)
-    if not payload:
-        console.print("[bold red]Erreur : Token invalide ou expiré. "
-                      "Veuillez vous reconnecter.[/bold red]")
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
         return
 
-    user_id = payload.get("user_id")
-    role = payload.get("role")
+    user_id = auth.user_id
+    role = auth.role
 
     if role != "gestion":
-        console.print(
-            "[bold red]Erreur : Seuls les gestionnaires peuvent "
+        print_error(
+            console, "[bold red]Erreur : Seuls les gestionnaires peuvent "
             "créer un collaborateur.[/bold red]"
         )
         return
@@ -68,17 +74,23 @@ def create_collaborateur():
     )
 
     # Récupération des informations utilisateur
-    nom = click.prompt("Nom", type=str).strip().lower().capitalize()
-    prenom = click.prompt("Prénom", type=str).strip().lower().capitalize()
-    email = click.prompt("Email", type=str).strip().lower()
+    nom = ask(nom, "Nom", "--nom", type=str).strip().lower().capitalize()
+    prenom = ask(
+        prenom, "Prénom", "--prenom", type=str
+    ).strip().lower().capitalize()
+    email = ask(email, "Email", "--email", type=str).strip().lower()
     if not re.match(r"[^@]+@[^@]+\.[^@]+", email):
-        console.print("[bold red]Erreur : Email invalide.[/bold red]")
+        print_error(console, "[bold red]Erreur : Email invalide.[/bold red]")
         return
-    login = click.prompt("Nom d'utilisateur", type=str).strip().lower()
-    password = click.prompt("Mot de passe", type=str, hide_input=True).strip()
+    login = ask(
+        login, "Nom d'utilisateur", "--login", type=str
+    ).strip().lower()
+    password = ask(
+        password, "Mot de passe", "--password", type=str, hide_input=True
+    ).strip()
 
     # Récupération et affichage des départements disponibles
-    with SessionLocal() as db:
+    with session_scope() as db:
         departements = get_all_departements(db)
         departement_choices = {str(dep.id): dep.nom for dep in departements}
 
@@ -87,23 +99,30 @@ def create_collaborateur():
         console.print(f"   🔹 {dep_id} - {dep_nom}")
 
     # Demander à l'utilisateur de choisir un département
-    departement_id = click.prompt(
-        "\nSélectionnez un département par son numéro",
+    departement_id = ask(
+        departement_id, "\nSélectionnez un département par son numéro",
+        "--departement",
         type=click.Choice(departement_choices.keys(), case_sensitive=False),
         show_choices=False
     )
+    if departement_id not in departement_choices:
+        print_error(
+            console,
+            "[bold red]Erreur : Sélection invalide.[/bold red]"
+        )
+        return
 
     departement_id = int(departement_id)
 
-    with SessionLocal() as db:
+    with session_scope() as db:
         try:
             collaborateur = create_new_collaborateur(
-                db, token, nom, prenom, email, departement_id, login, password
+                db, auth, nom, prenom, email, departement_id, login, password
             )
             db.commit()
             sentry_sdk.capture_message(
                 f"Collaborateur {nom} {prenom} créé par "
-                f"{payload.get('nom') + ' ' + payload.get('prenom')}",
+                f"{auth.nom + ' ' + auth.prenom}",
                 level="info"
             )
             console.print(
@@ -113,36 +132,76 @@ def create_collaborateur():
         except Exception as e:
             db.rollback()
             sentry_sdk.capture_exception(e)
-            console.print(f"[bold red]Erreur lors de la création du "
-                          f"collaborateur : {e}[/bold red]")
+            print_error(console, f"[bold red]Erreur lors de la création du "
+                                 f"collaborateur : {e}[/bold red]")
 
 
-@collaborateurs_group.command(name="list")
+@collaborateurs_group.command(name="import")
 @role_required(["gestion"])
-def list_collaborateurs():
-    """Lister tous les collaborateurs."""
-    token = load_token()
-    if not token:
-        console.print(
-            "[bold red]Erreur : Vous devez être connecté "
-            "pour cette commande.[/bold red]"
+@click.argument("fichier", type=click.File("r", encoding="utf-8"))
+@click.option(
+    "--format", "fmt", type=click.Choice(RECORD_FORMATS), default=None,
+    help="Format du fichier (déduit de l'extension par défaut)."
+)
+@click.option(
+    "--chunk-size", type=click.IntRange(min=1), default=IMPORT_CHUNK_SIZE,
+    show_default=True, help="Nombre de lignes insérées ensemble."
+)
+@click.option(
+    "--workers", type=click.IntRange(min=0), default=None,
+    help="Processus de hachage des mots de passe (0 : un par CPU)."
+)
+def import_collaborateurs_cli(fichier, fmt, chunk_size, workers):
+    """
+    Importer des collaborateurs depuis un fichier CSV (avec en-tête) ou
+    JSONL (colonnes nom, prenom, email, login, password, departement).
+    """
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
+        return
+
+    fmt = fmt or guess_format(fichier.name)
+    with session_scope() as db:
+        report = import_collaborateurs(
+            db, auth, read_records(fichier, fmt), chunk_size=chunk_size,
+            workers=workers
         )
+    if report is None:
         return
 
-    payload = decode_token(token)
-    if not payload:
-        console.print(
-            "[bold red]Erreur : Token invalide ou expiré. "
-            "Veuillez vous reconnecter.[/bold red]"
+    for lineno, message in report.errors:
+        print_error(
+            console, f"[bold red]Ligne {lineno} : {escape(message)}[/bold red]"
         )
+    sentry_sdk.capture_message(
+        f"{report.inserted} collaborateur(s) importé(s) par {auth.prenom}",
+        level="info"
+    )
+    console.print(
+        f"[bold green]{report.inserted} collaborateur(s) importé(s), "
+        f"{len(report.errors)} ligne(s) en erreur.[/bold green]"
+    )
+
+
+@collaborateurs_group.command(name="list")
+@role_required(["gestion"])
+@pagination_options
+def list_collaborateurs(page_size, after_id, stream):
+    """Lister tous les collaborateurs."""
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
         return
 
-    user_id = payload.get("user_id")
-    role = payload.get("role")
+    user_id = auth.user_id
+    role = auth.role
 
     if role != "gestion":
-        console.print(
-            "[bold red]Erreur : Seuls les gestionnaires peuvent "
+        print_error(
+            console, "[bold red]Erreur : Seuls les gestionnaires peuvent "
             "lister les collaborateurs.[/bold red]"
         )
         return
@@ -152,20 +211,29 @@ def list_collaborateurs():
         f"Rôle : {role}[/bold cyan]"
     )
 
-    with SessionLocal() as db:
-        collaborateurs = all_collaborateurs(db)
-        if not collaborateurs:
-            console.print(
-                "[bold yellow]Aucun collaborateur trouvé.[/bold yellow]"
-            )
-            return
+    with session_scope() as db:
+        collaborateurs = all_collaborateurs(
+            db, page_size=page_size, after_id=after_id, stream=stream
+        )
 
-        console.print("\n[bold cyan]Liste des collaborateurs :[/bold cyan]")
-        for collab in collaborateurs:
+        count, last = 0, None
+        for collab in collaborateurs or []:
+            if not count:
+                console.print(
+                    "\n[bold cyan]Liste des collaborateurs :[/bold cyan]"
+                )
             console.print(
                 f"   🔹 ID {collab.id} - {collab.nom} {collab.prenom} - "
                 f"{collab.email} - {collab.departement.nom}"
             )
+            count, last = count + 1, collab
+
+        if not count:
+            console.print(
+                "[bold yellow]Aucun collaborateur trouvé.[/bold yellow]"
+            )
+            return
+        print_next_page_hint(console, count, last, page_size)
 
 
 @collaborateurs_group.command(name="show")
@@ -173,27 +241,18 @@ def list_collaborateurs():
 @click.argument("collaborateur_id", type=int)
 def show_collaborateur(collaborateur_id):
     """Afficher les détails d'un collaborateur."""
-    token = load_token()
-    if not token:
-        console.print(
-            "[bold red]Erreur : Vous devez être connecté "
-            "pour cette commande.[/bold red]"
-        )
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
         return
 
-    payload = decode_token(token)
-    if not payload:
-        console.print(
-            "[bold red]Erreur : Token invalide ou expiré. "
-            "Veuillez vous reconnecter.[/bold red]"
-        )
-        return
-
-    with SessionLocal() as db:
+    with session_scope() as db:
         try:
             collaborateur = get_collaborateur_by_id(db, collaborateur_id)
             if not collaborateur:
-                console.print(
+                print_error(
+                    console,
                     f"[bold red]Erreur : Collaborateur ID {collaborateur_id} "
                     f"non trouvé.[/bold red]"
                 )
@@ -225,64 +284,78 @@ def show_collaborateur(collaborateur_id):
                                   "de clients.[/bold magenta]")
 
         except Exception as e:
-            console.print(f"[bold red]Erreur : {e}[/bold red]")
+            print_error(console, f"[bold red]Erreur : {e}[/bold red]")
 
 
 @collaborateurs_group.command(name="update")
 @role_required(["gestion"])
-def update_collaborateur():
+@click.option("--id", "collaborateur_id", type=int,
+              help="ID du collaborateur.")
+@click.option("--nom", help="Nouveau nom.")
+@click.option("--prenom", help="Nouveau prénom.")
+@click.option("--email", help="Nouvel email.")
+@click.option("--login", help="Nouveau login.")
+@click.option("--password", help="Nouveau mot de passe.")
+@click.option("--departement", "departement_id",
+              help="ID du nouveau département.")
+def update_collaborateur(collaborateur_id, nom, prenom, email, login,
+                         password, departement_id):
     """Mettre à jour un collaborateur."""
-    token = load_token()
-    if not token:
-        console.print("[bold red]Erreur : Vous devez être connecté "
-                      "pour cette commande.[/bold red]")
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
         return
 
-    payload = decode_token(token)
-    if not payload:
-        console.print("[bold red]Erreur : Token invalide ou expiré. "
-                      "Veuillez vous reconnecter.[/bold red]")
-        return
-
-    role = payload.get("role")
+    role = auth.role
     if role != "gestion":
-        console.print("[bold red]Erreur : Seuls les gestionnaires peuvent "
-                      "mettre à jour un collaborateur.[/bold red]")
+        print_error(
+            console,
+            "[bold red]Erreur : Seuls les gestionnaires peuvent "
+            "mettre à jour un collaborateur.[/bold red]"
+        )
         return
 
-    collaborateur_id = click.prompt("ID Collaborateur", type=int)
+    collaborateur_id = ask(
+        collaborateur_id, "ID Collaborateur", "--id", type=int
+    )
 
-    nom = click.prompt(
-        "Nouveau nom (laisser vide pour ne pas changer)",
+    nom = ask(
+        nom, "Nouveau nom (laisser vide pour ne pas changer)",
+        "--nom",
         default="",
         show_default=False
     ).strip().lower().capitalize()
-    prenom = click.prompt(
-        "Nouveau prénom (laisser vide pour ne pas changer)",
+    prenom = ask(
+        prenom, "Nouveau prénom (laisser vide pour ne pas changer)",
+        "--prenom",
         default="",
         show_default=False
     ).strip().lower().capitalize()
-    email = click.prompt(
-        "Nouvel email (laisser vide pour ne pas changer)",
+    email = ask(
+        email, "Nouvel email (laisser vide pour ne pas changer)",
+        "--email",
         default="",
         show_default=False
     ).strip().lower()
     if email and not re.match(r"[^@]+@[^@]+\.[^@]+", email):
-        console.print("[bold red]Erreur : Email invalide.[/bold red]")
+        print_error(console, "[bold red]Erreur : Email invalide.[/bold red]")
         return
-    login = click.prompt(
-        "Nouveau login (laisser vide pour ne pas changer)",
+    login = ask(
+        login, "Nouveau login (laisser vide pour ne pas changer)",
+        "--login",
         default="",
         show_default=False
     ).strip().lower()
-    password = click.prompt(
-        "Nouveau mot de passe (laisser vide pour ne pas changer)",
+    password = ask(
+        password, "Nouveau mot de passe (laisser vide pour ne pas changer)",
+        "--password",
         default="",
         show_default=False,
         hide_input=True
     ).strip()
 
-    with SessionLocal() as db:
+    with session_scope() as db:
         departements = get_all_departements(db)
         departement_choices = {str(dep.id): dep.nom for dep in departements}
 
@@ -290,10 +363,10 @@ def update_collaborateur():
         for dep_id, dep_nom in departement_choices.items():
             console.print(f"   🔹 {dep_id} - {dep_nom}")
 
-        departement_choices = ["1", "2", "3"]
-        departement_id = click.prompt(
+        departement_id = ask(
+            departement_id,
             "\nSélectionnez un département par son numéro "
-            "(laisser vide pour ne pas changer)",
+            "(laisser vide pour ne pas changer)", "--departement",
             type=str,
             default="",
             show_default=False
@@ -302,8 +375,11 @@ def update_collaborateur():
         # Si l'utilisateur laisse vide, on ne change pas le département
         if not departement_id.strip():
             departement_id = None
-        elif departement_id not in ["1", "2", "3"]:
-            console.print("[bold red]Erreur : Sélection invalide.[/bold red]")
+        elif departement_id not in departement_choices:
+            print_error(
+                console,
+                "[bold red]Erreur : Sélection invalide.[/bold red]"
+            )
             return
         else:
             departement_id = int(departement_id)
@@ -324,17 +400,17 @@ def update_collaborateur():
                       "apportée.[/bold yellow]")
         return
 
-    with SessionLocal() as db:
+    with session_scope() as db:
         try:
             collaborateur = update_existing_collaborateur(
-                db, token, collaborateur_id, **updates
+                db, auth, collaborateur_id, **updates
             )
             if collaborateur:
                 modified_fields = ", ".join(updates.keys())
                 sentry_sdk.capture_message(
                     f"🔧 Collaborateur {collaborateur.nom} "
                     f"(ID {collaborateur.id}) "
-                    f"modifié par {payload.get('prenom')}: "
+                    f"modifié par {auth.prenom}: "
                     f"{modified_fields}",
                     level="info"
                 )
@@ -343,37 +419,42 @@ def update_collaborateur():
                     "mis à jour avec succès ![/bold green]"
                 )
         except PermissionError as e:
-            console.print(f"[bold red]Erreur d'autorisation : {e}[/bold red]")
+            print_error(
+                console,
+                f"[bold red]Erreur d'autorisation : {e}[/bold red]"
+            )
         except ValueError as e:
-            console.print(f"[bold red]Erreur : {e}[/bold red]")
+            print_error(console, f"[bold red]Erreur : {e}[/bold red]")
         except Exception as e:
             sentry_sdk.capture_exception(e)
-            console.print(f"[bold red]Erreur inattendue : {e}[/bold red]")
+            print_error(
+                console,
+                f"[bold red]Erreur inattendue : {e}[/bold red]"
+            )
 
 
 @collaborateurs_group.command(name="delete")
 @role_required(["gestion"])
 @click.argument("collaborateur_id", type=int)
-def delete_collaborateur(collaborateur_id):
+@click.option("--yes", "-y", "confirmed", is_flag=True, default=None,
+              help="Supprimer sans demander de confirmation.")
+def delete_collaborateur(collaborateur_id, confirmed):
     """
     Supprimer un collaborateur en tant que gestionnaire.
     """
-    token = load_token()
-    if not token:
-        console.print("[bold red]Erreur : Vous devez être connecté "
-                      "pour cette commande.[/bold red]")
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
         return
 
-    payload = decode_token(token)
-    if not payload:
-        console.print("[bold red]Erreur : Token invalide ou expiré. "
-                      "Veuillez vous reconnecter.[/bold red]")
-        return
-
-    role = payload.get("role")
+    role = auth.role
     if role != "gestion":
-        console.print("[bold red]Erreur : Seuls les gestionnaires peuvent "
-                      "supprimer un collaborateur.[/bold red]")
+        print_error(
+            console,
+            "[bold red]Erreur : Seuls les gestionnaires peuvent "
+            "supprimer un collaborateur.[/bold red]"
+        )
         return
 
     console.print(
@@ -381,23 +462,24 @@ def delete_collaborateur(collaborateur_id):
         "[/bold cyan]"
     )
 
-    confirmation = click.confirm(
-        "Êtes-vous sûr de vouloir supprimer ce collaborateur ?", default=False
+    confirmation = ask(
+        confirmed, "Êtes-vous sûr de vouloir supprimer ce collaborateur ?",
+        "--yes", confirm=True, default=False
     )
     if not confirmation:
         console.print("[bold yellow]Suppression annulée.[/bold yellow]")
         return
 
-    with SessionLocal() as db:
+    with session_scope() as db:
         try:
             collaborateur = delete_collaborateur_service(
-                db, token, collaborateur_id
+                db, auth, collaborateur_id
             )
             if collaborateur:
                 sentry_sdk.capture_message(
                     f"Collaborateur {collaborateur.nom} "
                     f"(ID {collaborateur.id}) "
-                    f"supprimé par {payload.get('prenom')}",
+                    f"supprimé par {auth.prenom}",
                     level="info"
                 )
                 console.print(
@@ -405,12 +487,19 @@ def delete_collaborateur(collaborateur_id):
                     "supprimé avec succès ![/bold green]"
                 )
             else:
-                console.print(
+                print_error(
+                    console,
                     f"[bold red]Erreur : Collaborateur ID {collaborateur_id} "
                     f"non trouvé.[/bold red]"
                 )
         except PermissionError as e:
-            console.print(f"[bold red]Erreur d'autorisation : {e}[/bold red]")
+            print_error(
+                console,
+                f"[bold red]Erreur d'autorisation : {e}[/bold red]"
+            )
         except Exception as e:
             sentry_sdk.capture_exception(e)
-            console.print(f"[bold red]Erreur inattendue : {e}[/bold red]")
+            print_error(
+                console,
+                f"[bold red]Erreur inattendue : {e}[/bold red]"
+            )
@@ -2,19 +2,19 @@ import click
 from app.utils.sentry import sentry_sdk
 from rich.console import Console
 from app.services.contrat_service import (
-    list_all_contrats,
     create_new_contrat,
     update_client_contrat,
     update_contrat_commercial_service,
-    list_contrats_by_commercial,
-
+    search_contrats,
+)
+from app.crud.contrats import CONTRAT_SORTS
+from app.db.session import session_scope
+from app.utils.config import (
+    CustomGroup, ask, pagination_options, print_error, print_next_page_hint
 )
-from app.db.session import SessionLocal
-from app.utils.config import CustomGroup
+from app.utils.rendering import print_table
 from app.auth.permissions import role_required
-from app.utils.file_utils import load_token
-from app.auth.jwt_utils import decode_token
-from rich.table import Table
+from app.auth.context import get_auth_context
 
 console = Console()
 
@@ -36,32 +36,32 @@ def contrats_group(ctx):
 
 @contrats_group.command(name="create")
 @role_required(["gestion"])
-def create_contrat_cli():
+@click.option("--client", "id_client", type=int, help="ID du client.")
+@click.option("--montant", "montant_total", type=float,
+              help="Montant total du contrat.")
+def create_contrat_cli(id_client, montant_total):
     """
     Créer un nouveau contrat (Gestion uniquement).
     """
-    token = load_token()
-    if not token:
-        console.print("[bold red]Erreur : Vous devez être connecté pour "
-                      "cette commande.[/bold red]")
-        return
-
-    payload = decode_token(token)
-    if not payload:
-        console.print("[bold red]Erreur : Token invalide ou expiré. "
-                      "Veuillez vous reconnecter.[/bold red]")
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
         return
 
-    with SessionLocal() as db:
+    with session_scope() as db:
         try:
             # Récupération du client
-            id_client = click.prompt("ID du client", type=int)
-            montant_total = click.prompt(
-                "Montant total du contrat", type=float
+            id_client = ask(
+                id_client, "ID du client", "--client", type=int
+            )
+            montant_total = ask(
+                montant_total, "Montant total du contrat", "--montant",
+                type=float
             )
 
             # Création du contrat
-            contrat = create_new_contrat(db, token, id_client, montant_total)
+            contrat = create_new_contrat(db, auth, id_client, montant_total)
 
             console.print(
                 f"[bold green]Contrat ID {contrat.id} créé avec succès pour "
@@ -69,9 +69,12 @@ def create_contrat_cli():
             )
 
         except ValueError as e:
-            console.print(f"[bold red]Erreur : {e}[/bold red]")
+            print_error(console, f"[bold red]Erreur : {e}[/bold red]")
         except Exception as e:
-            console.print(f"[bold red]Erreur inattendue : {e}[/bold red]")
+            print_error(
+                console,
+                f"[bold red]Erreur inattendue : {e}[/bold red]"
+            )
 
 
 @contrats_group.command(name="list")
@@ -79,102 +82,101 @@ def create_contrat_cli():
 @click.option("-unsigned", "-u", is_flag=True)
 @click.option("-unpaid", "-p", is_flag=True)
 @click.option("-all", "-a", is_flag=True)
-def list_contrats(unsigned, unpaid, all):
-    """Afficher tous les contrats, avec des options de filtrage
-    pour les commerciaux."""
-    token = load_token()
-    if not token:
-        console.print("[bold red]Erreur : Vous devez être connecté pour "
-                      "accéder à cette commande.[/bold red]")
-        return
-
-    payload = decode_token(token)
-    if not payload:
-        console.print("[bold red]Erreur : Token invalide ou expiré. "
-                      "Veuillez vous reconnecter.[/bold red]")
+@click.option(
+    "--sort", type=click.Choice(list(CONTRAT_SORTS)), default="client",
+    help="Ordre d'affichage des contrats (par ID avec la pagination)."
+)
+@pagination_options
+def list_contrats(unsigned, unpaid, all, sort, page_size, after_id, stream):
+    """Afficher les contrats, avec des options de filtrage."""
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
         return
 
-    user_id = payload.get("user_id")
-    role = payload.get("role")
+    user_id = auth.user_id
+    role = auth.role
 
     console.print(
         f"[bold cyan]🔹 Token valide - Utilisateur ID {user_id} - "
         f"Rôle : {role}[/bold cyan]"
     )
 
-    with SessionLocal() as db:
-        if role in ["gestion", "support"]:
-            contrats = list_all_contrats(db)
-
-        elif role == "commercial":
-            if all:
-                contrats = list_all_contrats(db)
-            else:
-                contrats = list_contrats_by_commercial(db, user_id)
-
-            if unsigned:
-                contrats = [c for c in contrats if not c.statut]
-            if unpaid:
-                contrats = [c for c in contrats if c.montant_restant > 0]
-
-        if not contrats:
-            console.print("[bold yellow]Aucun contrat trouvé avec "
-                          "ces critères.[/bold yellow]")
-            return
+    with session_scope() as db:
+        contrats = search_contrats(
+            db, auth, unsigned=unsigned, unpaid=unpaid, all_contrats=all,
+            sort=sort, page_size=page_size, after_id=after_id, stream=stream
+        )
 
-        table = Table(title="Liste des contrats")
-
-        table.add_column("ID", justify="right", style="cyan", no_wrap=True)
-        table.add_column("Client", style="magenta")
-        table.add_column("Commercial", style="green")
-        table.add_column("Montant Total (€)", justify="right", style="yellow")
-        table.add_column("Montant Restant (€)", justify="right", style="red")
-        table.add_column("Statut", style="blue")
-
-        # Trier les contrats par nom de client
-        contrats = sorted(contrats, key=lambda c: c.client.nom_complet)
-
-        for contrat in contrats:
-            table.add_row(
+        def contrat_row(contrat):
+            commercial = contrat.client.commercial
+            return (
                 str(contrat.id),
                 contrat.client.nom_complet,
-                contrat.client.commercial.nom,
+                commercial.nom if commercial else "Non attribué",
                 f"{contrat.montant_total:.2f}",
                 f"{contrat.montant_restant:.2f}",
                 "Signé" if contrat.statut else "Non signé"
             )
 
-        console.print(table)
+        count, last = print_table(
+            console,
+            "Liste des contrats",
+            [
+                ("ID", {"justify": "right", "style": "cyan",
+                        "no_wrap": True}),
+                ("Client", {"style": "magenta"}),
+                ("Commercial", {"style": "green"}),
+                ("Montant Total (€)", {"justify": "right",
+                                       "style": "yellow"}),
+                ("Montant Restant (€)", {"justify": "right",
+                                         "style": "red"}),
+                ("Statut", {"style": "blue"}),
+            ],
+            contrats or [],
+            contrat_row,
+            stream=stream
+        )
+
+        if not count:
+            console.print("[bold yellow]Aucun contrat trouvé avec "
+                          "ces critères.[/bold yellow]")
+            return
+        print_next_page_hint(console, count, last, page_size)
 
 
 @contrats_group.command(name="update")
 @role_required(["gestion"])
-def update_contrat_cli():
+@click.option("--id", "id_contrat", type=int, help="ID du contrat.")
+@click.option("--montant-restant", type=float, help="Montant restant (€).")
+@click.option("--signe/--non-signe", "statut", default=None,
+              help="Statut de signature du contrat.")
+def update_contrat_cli(id_contrat, montant_restant, statut):
     """
     Mettre à jour le contrat d'un client (Gestion uniquement).
     """
-    token = load_token()
-    if not token:
-        console.print("[bold red]Erreur : Vous devez être connecté "
-                      "pour cette commande.[/bold red]")
-        return
-
-    payload = decode_token(token)
-    if not payload:
-        console.print("[bold red]Erreur : Token invalide ou expiré. "
-                      "Veuillez vous reconnecter.[/bold red]")
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
         return
 
-    id_contrat = click.prompt("ID du contrat", type=int)
+    id_contrat = ask(id_contrat, "ID du contrat", "--id", type=int)
 
-    montant_restant = click.prompt(
+    montant_restant = ask(
+        montant_restant,
         "Montant restant (€) (laisser vide pour ne pas changer)",
+        "--montant-restant",
         default="",
         show_default=False
     )
-    statut = click.confirm("Le contrat est-il signé ?", default=None)
+    statut = ask(
+        statut, "Le contrat est-il signé ?", "--signe/--non-signe",
+        confirm=True, default=None
+    )
     montant_restant_final = (
-        float(montant_restant) if montant_restant.strip() else None
+        float(montant_restant) if str(montant_restant).strip() else None
     )
 
     updates = {k: v for k, v in {
@@ -187,9 +189,9 @@ def update_contrat_cli():
                       "apportée.[/bold yellow]")
         return
 
-    with SessionLocal() as db:
+    with session_scope() as db:
         try:
-            contrat = update_client_contrat(db, token, id_contrat, **updates)
+            contrat = update_client_contrat(db, auth, id_contrat, **updates)
 
             if updates.get("statut"):
                 sentry_sdk.capture_message(
@@ -207,44 +209,50 @@ def update_contrat_cli():
                 f"   🔹 Statut : {'Signé' if contrat.statut else 'Non signé'}"
             )
         except ValueError as e:
-            console.print(f"[bold red]Erreur : {e}[/bold red]")
+            print_error(console, f"[bold red]Erreur : {e}[/bold red]")
         except Exception as e:
             sentry_sdk.capture_exception(e)
-            console.print(f"[bold red]Erreur inattendue : {e}[/bold red]")
+            print_error(
+                console,
+                f"[bold red]Erreur inattendue : {e}[/bold red]"
+            )
 
 
 @contrats_group.command(name="update-mine")
 @role_required(["commercial"])
-def update_contrat_commercial():
+@click.option("--id", "id_contrat", type=int, help="ID du contrat.")
+@click.option("--montant-restant", type=float, help="Montant restant (€).")
+@click.option("--signe/--non-signe", "statut", default=None,
+              help="Statut de signature du contrat.")
+def update_contrat_commercial(id_contrat, montant_restant, statut):
     """
     Modifier un contrat dont le commercial est responsable.
     """
-    token = load_token()
-    if not token:
-        console.print("[bold red]Erreur : Vous devez être connecté "
-                      "pour cette commande.[/bold red]")
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
         return
 
-    payload = decode_token(token)
-    if not payload:
-        console.print("[bold red]Erreur : Token invalide ou expiré. "
-                      "Veuillez vous reconnecter.[/bold red]")
-        return
-
-    user_id = payload.get("user_id")
+    user_id = auth.user_id
 
     console.print("\n[bold cyan]Modification d'un contrat "
                   "(Commercial)[/bold cyan]")
-    id_contrat = click.prompt("ID du contrat", type=int)
+    id_contrat = ask(id_contrat, "ID du contrat", "--id", type=int)
 
-    montant_restant = click.prompt(
+    montant_restant = ask(
+        montant_restant,
         "Montant restant (€) (laisser vide pour ne pas changer)",
+        "--montant-restant",
         default="",
         show_default=False
     )
-    statut = click.confirm("Le contrat est-il signé ?", default=None)
+    statut = ask(
+        statut, "Le contrat est-il signé ?", "--signe/--non-signe",
+        confirm=True, default=None
+    )
     montant_restant_final = (
-        float(montant_restant) if montant_restant.strip() else None
+        float(montant_restant) if str(montant_restant).strip() else None
     )
 
     updates = {k: v for k, v in {
@@ -257,10 +265,10 @@ def update_contrat_commercial():
                       "apportée.[/bold yellow]")
         return
 
-    with SessionLocal() as db:
+    with session_scope() as db:
         try:
             contrat = update_contrat_commercial_service(
-                db, token, id_contrat, **updates
+                db, auth, id_contrat, **updates
             )
 
             if contrat.client.id_commercial != user_id:
@@ -285,9 +293,12 @@ def update_contrat_commercial():
                 f"   🔹 Statut : {'Signé' if contrat.statut else 'Non signé'}"
             )
         except PermissionError as e:
-            console.print(f"[bold red]Erreur : {e}[/bold red]")
+            print_error(console, f"[bold red]Erreur : {e}[/bold red]")
         except ValueError as e:
-            console.print(f"[bold red]Erreur : {e}[/bold red]")
+            print_error(console, f"[bold red]Erreur : {e}[/bold red]")
         except Exception as e:
             sentry_sdk.capture_exception(e)
-            console.print(f"[bold red]Erreur inattendue : {e}[/bold red]")
+            print_error(
+                console,
+                f"[bold red]Erreur inattendue : {e}[/bold red]"
+            )
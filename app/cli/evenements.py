@@ -1,30 +1,52 @@
 import click
+from collections import Counter
 from rich.console import Console
-from rich.table import Table
 from app.services.evenement_service import (
     list_all_evenements,
     create_event_for_client,
     assign_support,
     list_events_for_support,
     get_unassigned_evenements,
+    get_calendar_evenements,
+    auto_assign_supports,
+    CONFLICTS_LIMIT,
+    conflict_message,
+    find_conflicts,
 )
+from app.services.export_service import export_evenements_calendar
 from app.services.contrat_service import get_signed_contrats_for_commercial
-from app.crud.collaborateurs import get_support
 from app.crud.evenements import (
     get_evenements_by_support,
     get_evenement_for_support,
-    get_evenement
+    get_evenement,
+    get_overlapping_evenement
 )
 from app.services.collaborateur_service import list_supports
-from app.db.session import SessionLocal
-from app.utils.config import CustomGroup
+from app.db.session import session_scope
+from app.utils.config import (
+    CustomGroup, ask, pagination_options, print_error, print_next_page_hint
+)
+from app.utils.rendering import print_table
+from app.utils.ics import write_ics
 from app.auth.permissions import role_required
-from app.utils.file_utils import load_token
-from app.auth.jwt_utils import decode_token
-from datetime import datetime
+from app.auth.context import get_auth_context
+from rich.table import Table
+from app.utils.calendar_grid import (
+    WEEKDAYS, calendar_period, calendar_weeks, events_by_day
+)
+from datetime import date, datetime
 
 
 console = Console()
+# Messages des exports sur stderr : stdout peut recevoir le fichier
+err_console = Console(stderr=True)
+
+
+def parse_date(value):
+    """Date JJ/MM/AAAA d'une option, ou None si elle est vide."""
+    if not value:
+        return None
+    return datetime.strptime(value, "%d/%m/%Y").date()
 
 
 @click.group(
@@ -44,33 +66,33 @@ def evenements_group(ctx):
 
 @evenements_group.command(name="create")
 @role_required(["commercial"])
-def create_evenement():
+@click.option("--contrat", "id_contrat", type=int, help="ID du contrat.")
+@click.option("--debut", "date_debut", help="Date de début (JJ/MM/AAAA).")
+@click.option("--fin", "date_fin", help="Date de fin (JJ/MM/AAAA).")
+@click.option("--lieu", help="Lieu de l'événement.")
+@click.option("--participants", "nombre_participants", type=int,
+              help="Nombre de participants.")
+@click.option("--notes", help="Notes (optionnel).")
+def create_evenement(id_contrat, date_debut, date_fin, lieu,
+                     nombre_participants, notes):
     """
     Créer un nouvel événement (Commercial uniquement).
     """
-    token = load_token()
-    if not token:
-        console.print(
-            "[bold red]Erreur : Vous devez être connecté pour "
-            "cette commande.[/bold red]"
-        )
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
         return
 
-    payload = decode_token(token)
-    if not payload:
-        console.print("[bold red]Erreur : Token invalide ou expiré. "
-                      "Veuillez vous reconnecter.[/bold red]")
-        return
+    user_id = auth.user_id  # ID du commercial connecté
 
-    user_id = payload.get("user_id")  # ID du commercial connecté
-
-    with SessionLocal() as db:
+    with session_scope() as db:
         # Récupérer les contrats signés du commercial
         contrats = get_signed_contrats_for_commercial(db, user_id)
 
         if not contrats:
-            console.print("[bold red]Aucun contrat signé "
-                          "disponible pour vos clients.[/bold red]")
+            print_error(console, "[bold red]Aucun contrat signé "
+                                 "disponible pour vos clients.[/bold red]")
             return
 
         console.print("\n[bold cyan]Contrats signés disponibles :[/bold cyan]")
@@ -79,206 +101,372 @@ def create_evenement():
                 f"   🔹 ID {contrat.id} - Client : {contrat.client.nom_complet}"
             )
 
-        id_contrat = click.prompt("ID du contrat", type=int)
+        id_contrat = ask(id_contrat, "ID du contrat", "--contrat", type=int)
 
         # Demander la date de début
-        date_debut = click.prompt(
-            "Date de début (JJ/MM/AAAA)", type=str
+        date_debut = ask(
+            date_debut, "Date de début (JJ/MM/AAAA)", "--debut", type=str
+        )
+        date_fin = ask(
+            date_fin, "Date de fin (JJ/MM/AAAA)", "--fin", type=str
         )
-        date_fin = click.prompt("Date de fin (JJ/MM/AAAA)", type=str)
         try:
             date_debut = datetime.strptime(date_debut, "%d/%m/%Y").date()
             date_fin = datetime.strptime(date_fin, "%d/%m/%Y").date()
             if date_fin < date_debut:
-                console.print(
+                print_error(
+                    console,
                     "[bold red]Erreur : La date de fin doit être après "
                     "la date de début.[/bold red]"
                 )
                 return
         except ValueError:
-            console.print("[bold red]Erreur : Format de date invalide. "
-                          "Utilisez JJ/MM/AAAA.[/bold red]")
+            print_error(console, "[bold red]Erreur : Format de date invalide. "
+                                 "Utilisez JJ/MM/AAAA.[/bold red]")
             return
 
-        lieu = click.prompt("Lieu", type=str).strip().lower().capitalize()
-        nombre_participants = click.prompt(
-            "Nombre de participants", type=int
+        lieu = ask(
+            lieu, "Lieu", "--lieu", type=str
+        ).strip().lower().capitalize()
+        nombre_participants = ask(
+            nombre_participants, "Nombre de participants", "--participants",
+            type=int
         )
-        notes = click.prompt(
-            "Notes (optionnel)", type=str, default="", show_default=False
+        notes = ask(
+            notes, "Notes (optionnel)", "--notes", type=str, default="",
+            show_default=False
         ).strip().lower()
 
-        # Création de l'événement
-        with SessionLocal() as db:
-            try:
-                evenement = create_event_for_client(
-                    db, token, id_contrat, date_debut, date_fin, lieu,
-                    nombre_participants, notes
-                )
-                console.print(
-                    f"[bold green]✨ Événement ID {evenement.id} "
-                    "créé avec succès ![/bold green]"
-                )
-            except ValueError as e:
-                console.print(f"[bold red]Erreur : {str(e)}[/bold red]")
-            except Exception as e:
-                console.print(f"[bold red]Erreur : {str(e)}[/bold red]")
+        # Création de l'événement, dans la même session
+        try:
+            evenement = create_event_for_client(
+                db, auth, id_contrat, date_debut, date_fin, lieu,
+                nombre_participants, notes
+            )
+            console.print(
+                f"[bold green]✨ Événement ID {evenement.id} "
+                "créé avec succès ![/bold green]"
+            )
+        except ValueError as e:
+            print_error(console, f"[bold red]Erreur : {str(e)}[/bold red]")
+        except Exception as e:
+            print_error(console, f"[bold red]Erreur : {str(e)}[/bold red]")
 
 
-@evenements_group.command(name="assign_support")
+@evenements_group.command(name="auto-assign")
 @role_required(["gestion"])
-def assign_support_to_evenement():
+@click.option("--dry-run", is_flag=True,
+              help="Afficher la répartition sans l'enregistrer.")
+@click.option("--details", is_flag=True,
+              help="Afficher chaque événement attribué.")
+def auto_assign(dry_run, details):
     """
-    Assigner un support à un événement existant (Gestion uniquement).
+    Attribuer un support à tous les événements qui n'en ont pas, en
+    équilibrant la charge et sans chevauchement de dates (Gestion
+    uniquement).
     """
-    token = load_token()
-    if not token:
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
+        return
+
+    with session_scope() as db:
+        result = auto_assign_supports(db, auth, dry_run=dry_run)
+        if result is None:
+            return
+        assignments, unassignable, assigned = result
+        if not assignments and not unassignable:
+            console.print("[bold yellow]Tous les événements ont déjà "
+                          "un support attribué.[/bold yellow]")
+            return
+
+        supports = {sup.id: sup for sup in list_supports(db)}
+
+        def support_name(id_support):
+            support = supports[id_support]
+            return f"{support.prenom} {support.nom}"
+
+        if details:
+            print_table(
+                console,
+                "[bold green]Attributions[/bold green]",
+                [
+                    ("ID", {"style": "cyan"}),
+                    ("Lieu", {"style": "yellow"}),
+                    ("Date début", {"style": "green"}),
+                    ("Date fin", {"style": "green"}),
+                    ("Support", {"style": "magenta"}),
+                ],
+                assignments,
+                lambda item: (
+                    str(item[0].id), item[0].lieu,
+                    item[0].date_debut.strftime("%d/%m/%Y"),
+                    item[0].date_fin.strftime("%d/%m/%Y"),
+                    support_name(item[1])
+                ),
+                stream=True
+            )
+
+        counts = Counter(id_support for _, id_support in assignments)
+        print_table(
+            console,
+            "[bold green]Événements attribués par support[/bold green]",
+            [("Support", {"style": "magenta"}),
+             ("Événements", {"justify": "right"})],
+            sorted(counts.items()),
+            lambda item: (support_name(item[0]), str(item[1]))
+        )
+
+        verbe = "seraient attribués" if dry_run else "attribué(s)"
         console.print(
-            "[bold red]Erreur : Vous devez être connecté pour "
-            "cette commande.[/bold red]"
+            f"[bold green]{assigned} événement(s) {verbe}.[/bold green]"
         )
+        if assigned < len(assignments):
+            console.print(
+                f"[bold yellow]{len(assignments) - assigned} événement(s) "
+                "attribué(s) entre-temps par ailleurs, laissé(s) "
+                "inchangé(s).[/bold yellow]"
+            )
+        if unassignable:
+            console.print(
+                f"[bold yellow]{len(unassignable)} événement(s) sans "
+                "support disponible à ces dates (ID "
+                f"{', '.join(str(evt.id) for evt in unassignable[:20])}"
+                f"{'...' if len(unassignable) > 20 else ''}).[/bold yellow]"
+            )
+        if dry_run:
+            console.print("[dim]Simulation : aucune modification "
+                          "enregistrée.[/dim]")
+
+
+@evenements_group.command(name="conflicts")
+@role_required(["gestion", "support"])
+@click.option("--support", "id_support", type=int,
+              help="ID du support (Gestion uniquement).")
+@click.option("--limit", type=click.IntRange(min=1),
+              default=CONFLICTS_LIMIT, show_default=True,
+              help="Nombre maximal de couples affichés.")
+def list_conflicts(id_support, limit):
+    """
+    Lister les événements d'un même support dont les dates se
+    chevauchent (Gestion : tous les supports, Support : son planning).
+    """
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
         return
 
-    payload = decode_token(token)
-    if not payload:
-        console.print("[bold red]Erreur : Token invalide ou expiré. "
-                      "Veuillez vous reconnecter.[/bold red]")
+    if id_support is not None and auth.role != "gestion":
+        print_error(
+            console,
+            "[bold red]Erreur : Seuls les gestionnaires peuvent "
+            "utiliser l'option '--support'.[/bold red]"
+        )
         return
 
-    with SessionLocal() as db:
-        evenements = get_unassigned_evenements(db)
-
-        if not evenements:
-            console.print("[bold yellow]Tous les événements ont déjà "
-                          "un support attribué.[/bold yellow]")
+    with session_scope() as db:
+        result = find_conflicts(db, auth, id_support, limit)
+        if result is None:
+            return
+        conflicts, count = result
+        if not conflicts:
+            console.print("[bold green]Aucun chevauchement dans le "
+                          "planning des supports.[/bold green]")
             return
 
-        console.print("\n[bold cyan]Événements en attente "
-                      "de support :[/bold cyan]")
-        for evt in evenements:
-            console.print(
-                f"   🔹 ID {evt.id} - Lieu : {evt.lieu} - Date : "
-                f"{evt.date_debut.strftime('%d/%m/%Y')}"
+        supports = {sup.id: sup for sup in list_supports(db)}
+
+        def support_name(id_support):
+            support = supports.get(id_support)
+            if support is None:
+                return str(id_support)
+            return f"{support.prenom} {support.nom}"
+
+        def periode(evt):
+            return (
+                f"{evt.date_debut.strftime('%d/%m/%Y')} - "
+                f"{evt.date_fin.strftime('%d/%m/%Y')}"
             )
 
-        id_evenement = click.prompt(
-            "ID de l'événement à attribuer", type=int
+        print_table(
+            console,
+            "[bold red]Chevauchements de planning[/bold red]",
+            [
+                ("Support", {"style": "magenta"}),
+                ("Événement", {"style": "cyan"}),
+                ("Dates", {"style": "green", "no_wrap": True}),
+                ("Chevauche", {"style": "cyan"}),
+                ("Dates", {"style": "green", "no_wrap": True}),
+            ],
+            conflicts,
+            lambda item: (
+                support_name(item[0]),
+                str(item[1].id), periode(item[1]),
+                str(item[2].id), periode(item[2]),
+            )
+        )
+        message = (f"{count} événement(s) chevauchent un événement "
+                   "antérieur du même support")
+        if len(conflicts) == limit:
+            message += f" ({limit} premiers couples affichés)"
+        console.print(f"[bold yellow]{message}.[/bold yellow]")
+
+
+@evenements_group.command(name="assign_support")
+@role_required(["gestion"])
+@click.option("--evenement", "id_evenement", type=int,
+              help="ID de l'événement.")
+@click.option("--support", "id_support", type=int, help="ID du support.")
+def assign_support_to_evenement(id_evenement, id_support):
+    """
+    Assigner un support à un événement existant (Gestion uniquement).
+    """
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
+        return
+
+    with session_scope() as db:
+        # Les listes ne servent qu'à choisir : inutiles avec les options
+        if id_evenement is None:
+            evenements = get_unassigned_evenements(db)
+
+            if not evenements:
+                console.print("[bold yellow]Tous les événements ont déjà "
+                              "un support attribué.[/bold yellow]")
+                return
+
+            console.print("\n[bold cyan]Événements en attente "
+                          "de support :[/bold cyan]")
+            for evt in evenements:
+                console.print(
+                    f"   🔹 ID {evt.id} - Lieu : {evt.lieu} - Date : "
+                    f"{evt.date_debut.strftime('%d/%m/%Y')}"
+                )
+
+        id_evenement = ask(
+            id_evenement, "ID de l'événement à attribuer", "--evenement",
+            type=int
         )
 
         evenement = get_evenement(db, id_evenement)
         if not evenement:
-            console.print("[bold red]Erreur : Aucun événement trouvé "
-                          "avec cet ID.[/bold red]")
+            print_error(console, "[bold red]Erreur : Aucun événement trouvé "
+                                 "avec cet ID.[/bold red]")
             return
         if evenement.id_support:
-            console.print("[bold red]Erreur : Cet événement a déjà un "
-                          "support attribué.[/bold red]")
+            print_error(console, "[bold red]Erreur : Cet événement a déjà un "
+                                 "support attribué.[/bold red]")
             return
 
         # Lister les collaborateurs du département support
-        supports = list_supports(db)
-        if not supports:
-            console.print("[bold red]Erreur : Aucun collaborateur "
-                          "support disponible.[/bold red]")
-            return
-
-        console.print("\n[bold cyan]Liste des supports "
-                      "disponibles :[/bold cyan]")
-        for sup in supports:
-            console.print(f"   🔹 ID {sup.id} - Nom : {sup.nom} {sup.prenom}")
+        if id_support is None:
+            supports = list_supports(db)
+            if not supports:
+                print_error(console, "[bold red]Erreur : Aucun collaborateur "
+                                     "support disponible.[/bold red]")
+                return
 
-        id_support = click.prompt("ID du support à assigner", type=int)
+            console.print("\n[bold cyan]Liste des supports "
+                          "disponibles :[/bold cyan]")
+            for sup in supports:
+                console.print(
+                    f"   🔹 ID {sup.id} - Nom : {sup.nom} {sup.prenom}"
+                )
 
-        # Vérifier si le support existe
-        support = get_support(db, id_support)
-        if not support:
-            console.print("[bold red]Erreur : Aucun support trouvé "
-                          "avec cet ID.[/bold red]")
-            return
+        id_support = ask(
+            id_support, "ID du support à assigner", "--support", type=int
+        )
 
-        # Assigner le support à l'événement
-        try:
-            evenement = assign_support(db, token, id_evenement, id_support)
+        # Le service vérifie le support et son planning ; son erreur est
+        # déjà affichée quand il ne retourne rien
+        evenement = assign_support(db, auth, id_evenement, id_support)
+        if evenement:
+            support = evenement.support
             console.print(
                 f"[bold green]✨ Support {support.nom} {support.prenom} "
                 f"assigné à l'événement ID {evenement.id} ![/bold green]"
             )
-        except ValueError as e:
-            console.print(f"[bold red]Erreur : {str(e)}[/bold red]")
-        except Exception as e:
-            console.print(f"[bold red]Erreur inattendue : {str(e)}[/bold red]")
 
 
 @evenements_group.command(name="list")
 @role_required(["commercial", "support", "gestion"])
 @click.option("-mine", is_flag=True)
 @click.option("-unassigned", is_flag=True)
-def list_evenements(mine, unassigned):
+@click.option("--from", "date_from",
+              help="Date de début minimale (JJ/MM/AAAA).")
+@click.option("--to", "date_to", help="Date de début maximale (JJ/MM/AAAA).")
+@click.option("--lieu", help="Lieu contenant ce texte.")
+@click.option("--client", "client_id", type=int, help="ID du client.")
+@click.option("--min-participants", type=click.IntRange(min=0),
+              help="Nombre minimal de participants.")
+@pagination_options
+def list_evenements(mine, unassigned, date_from, date_to, lieu, client_id,
+                    min_participants, page_size, after_id, stream):
     """
     Lister les événements disponibles
     """
-    token = load_token()
-    if not token:
-        console.print("[bold red]Erreur : Vous devez être connecté "
-                      "pour accéder à cette commande.[/bold red]")
-        return
-
-    payload = decode_token(token)
-    if not payload:
-        console.print("[bold red]Erreur : Token invalide ou expiré. "
-                      "Veuillez vous reconnecter.[/bold red]")
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
         return
 
-    role = payload.get("role")
+    role = auth.role
 
     if mine and role != "support":
-        console.print("[bold red]Erreur : Seuls les supports peuvent utiliser "
-                      "l'option '--mine'.[/bold red]")
+        print_error(
+            console,
+            "[bold red]Erreur : Seuls les supports peuvent utiliser "
+            "l'option '--mine'.[/bold red]"
+        )
         return
 
     if unassigned and role != "gestion":
-        console.print("[bold red]Erreur : Seuls les gestionnaires peuvent "
-                      "utiliser l'option '--unassigned'.[/bold red]")
+        print_error(
+            console,
+            "[bold red]Erreur : Seuls les gestionnaires peuvent "
+            "utiliser l'option '--unassigned'.[/bold red]"
+        )
+        return
+
+    try:
+        date_from = parse_date(date_from)
+        date_to = parse_date(date_to)
+    except ValueError:
+        print_error(console, "[bold red]Erreur : Format de date invalide. "
+                             "Utilisez JJ/MM/AAAA.[/bold red]")
         return
 
     console.print(f"[bold cyan]Rôle actuel : {role}[/bold cyan]")
 
-    with SessionLocal() as db:
+    filters = {
+        "date_from": date_from, "date_to": date_to, "lieu": lieu,
+        "client_id": client_id, "min_participants": min_participants,
+    }
+    page = {"page_size": page_size, "after_id": after_id, "stream": stream}
+    with session_scope() as db:
         try:
             if role == "gestion":
                 evenements = (
-                    get_unassigned_evenements(db)
+                    get_unassigned_evenements(db, filters, **page)
                     if unassigned
-                    else list_all_evenements(db, token)
+                    else list_all_evenements(db, auth, filters, **page)
                 )
             elif role == "commercial":
-                evenements = list_all_evenements(db, token)
+                evenements = list_all_evenements(db, auth, filters, **page)
             elif role == "support":
                 evenements = (
-                    list_events_for_support(db, token)
+                    list_events_for_support(db, auth, filters, **page)
                     if mine
-                    else list_all_evenements(db, token)
+                    else list_all_evenements(db, auth, filters, **page)
                 )
 
-            if not evenements:
-                console.print("[bold magenta]Aucun événement trouvé "
-                              "avec ces critères.[/bold magenta]")
-                return
-
-            table = Table(
-                title="[bold green]Liste des événements[/bold green]"
-            )
-            table.add_column("ID", style="cyan")
-            table.add_column("Client", style="magenta")
-            table.add_column("Lieu", style="yellow")
-            table.add_column("Date début", style="green")
-            table.add_column("Date fin", style="green")
-            table.add_column("Participants", style="green")
-            table.add_column("Support", style="green")
-            table.add_column("Notes", style="green")
-
-            for evt in evenements:
-                table.add_row(
+            def evenement_row(evt):
+                return (
                     str(evt.id),
                     evt.contrat.client.nom_complet,
                     evt.lieu,
@@ -290,44 +478,174 @@ def list_evenements(mine, unassigned):
                     evt.notes or "Aucune"
                 )
 
-            console.print(table)
+            count, last = print_table(
+                console,
+                "[bold green]Liste des événements[/bold green]",
+                [
+                    ("ID", {"style": "cyan"}),
+                    ("Client", {"style": "magenta"}),
+                    ("Lieu", {"style": "yellow"}),
+                    ("Date début", {"style": "green"}),
+                    ("Date fin", {"style": "green"}),
+                    ("Participants", {"style": "green"}),
+                    ("Support", {"style": "green"}),
+                    ("Notes", {"style": "green"}),
+                ],
+                evenements or [],
+                evenement_row,
+                stream=stream
+            )
+
+            if not count:
+                console.print("[bold magenta]Aucun événement trouvé "
+                              "avec ces critères.[/bold magenta]")
+                return
+            print_next_page_hint(console, count, last, page_size)
         except Exception as e:
-            console.print(
+            print_error(
+                console,
                 f"[bold red]Erreur lors de la récupération des événements : "
                 f"{e}[/bold red]"
             )
 
 
+@evenements_group.command(name="calendar")
+@role_required(["commercial", "support", "gestion"])
+@click.option("--month", is_flag=True,
+              help="Afficher le mois entier au lieu de la semaine.")
+@click.option("--date", "date_str",
+              help="Jour de la période affichée (JJ/MM/AAAA, défaut : "
+                   "aujourd'hui).")
+@click.option("-mine", is_flag=True)
+@click.option("--max-per-day", type=click.IntRange(min=1), default=3,
+              show_default=True,
+              help="Nombre maximal d'événements affichés par jour.")
+def calendar(month, date_str, mine, max_per_day):
+    """
+    Afficher les événements de la semaine (ou du mois) en grille.
+    """
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
+        return
+
+    if mine and auth.role != "support":
+        print_error(
+            console,
+            "[bold red]Erreur : Seuls les supports peuvent utiliser "
+            "l'option '--mine'.[/bold red]"
+        )
+        return
+
+    try:
+        day = parse_date(date_str) or date.today()
+    except ValueError:
+        print_error(console, "[bold red]Erreur : Format de date invalide. "
+                             "Utilisez JJ/MM/AAAA.[/bold red]")
+        return
+
+    debut, fin = calendar_period(day, month=month)
+    with session_scope() as db:
+        evenements = get_calendar_evenements(db, auth, debut, fin, mine)
+        if evenements is None:
+            return
+        days = events_by_day(evenements, debut, fin)
+
+    def cell(jour):
+        style = "dim" if month and jour.month != day.month else "bold"
+        lines = [f"[{style}]{jour.strftime('%d/%m')}[/{style}]"]
+        items = days.get(jour, [])
+        for evt in items[:max_per_day]:
+            lines.append(f"[cyan]{evt.id}[/cyan] {evt.lieu}")
+        if len(items) > max_per_day:
+            lines.append(f"[yellow]+{len(items) - max_per_day}[/yellow]")
+        return "\n".join(lines)
+
+    title = (
+        f"Événements de {day.strftime('%m/%Y')}" if month
+        else f"Événements du {debut.strftime('%d/%m/%Y')} au "
+             f"{fin.strftime('%d/%m/%Y')}"
+    )
+    table = Table(title=f"[bold green]{title}[/bold green]", show_lines=True,
+                  expand=True)
+    for weekday in WEEKDAYS:
+        table.add_column(weekday, ratio=1, overflow="ellipsis")
+    for week in calendar_weeks(debut, fin):
+        table.add_row(*(cell(jour) for jour in week))
+    console.print(table)
+    console.print(f"[dim]{len(evenements)} événement(s) commençant sur la "
+                  "période.[/dim]")
+
+
+@evenements_group.command(name="export-ics")
+@role_required(["support", "gestion"])
+@click.option("--output", "-o", type=click.File("wb"), default="-",
+              help="Fichier .ics de sortie (sortie standard par défaut).")
+def export_ics(output):
+    """
+    Exporter ses événements (Support) ou tous les événements (Gestion)
+    au format iCalendar.
+    """
+    auth = get_auth_context()
+    if not auth:
+        print_error(
+            err_console,
+            "[bold red]Erreur : Token invalide ou expiré. "
+            "Veuillez vous reconnecter.[/bold red]"
+        )
+        return
+
+    name = (
+        f"Epic Events - {auth.prenom} {auth.nom}"
+        if auth.role == "support" else "Epic Events"
+    )
+    with session_scope() as db:
+        exported = export_evenements_calendar(db, auth)
+        if exported is None:
+            return
+        _, rows = exported
+        count = write_ics(output, rows, name=name)
+
+    err_console.print(f"[bold green]{count} événement(s) exporté(s)."
+                      "[/bold green]")
+
+
 @evenements_group.command(name="update")
 @role_required(["support"])
-def update_evenement():
+@click.option("--id", "id_evenement", type=int, help="ID de l'événement.")
+@click.option("--debut", "date_debut_str",
+              help="Nouvelle date de début (JJ/MM/AAAA).")
+@click.option("--fin", "date_fin_str",
+              help="Nouvelle date de fin (JJ/MM/AAAA).")
+@click.option("--lieu", help="Nouveau lieu.")
+@click.option("--participants", type=int,
+              help="Nouveau nombre de participants.")
+@click.option("--notes", help="Nouvelles notes.")
+def update_evenement(id_evenement, date_debut_str, date_fin_str, lieu,
+                     participants, notes):
     """
     Permet aux supports de modifier uniquement les événements
     qui leur sont assignés.
     """
-    token = load_token()
-    if not token:
-        console.print(
-            "[bold red]Erreur : Vous devez être connecté pour accéder "
-            "à cette commande.[/bold red]"
-        )
-        return
-
-    payload = decode_token(token)
-    if not payload:
-        console.print("[bold red]Erreur : Token invalide ou expiré. "
-                      "Veuillez vous reconnecter.[/bold red]")
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
         return
 
-    role = payload.get("role")
-    user_id = payload.get("user_id")
+    role = auth.role
+    user_id = auth.user_id
 
     if role != "support":
-        console.print("[bold red]Erreur : Seuls les supports peuvent mettre à "
-                      "jour leur propre événement.[/bold red]")
+        print_error(
+            console,
+            "[bold red]Erreur : Seuls les supports peuvent mettre à "
+            "jour leur propre événement.[/bold red]"
+        )
         return
 
-    with SessionLocal() as db:
+    with session_scope() as db:
         try:
             # Afficher les événements assignés au support connecté
             evenements = get_evenements_by_support(db, user_id)
@@ -345,61 +663,63 @@ def update_evenement():
                 )
 
             # Sélectionner l'événement à modifier
-            id_evenement = click.prompt(
-                "\nID de l'événement à modifier", type=int
+            id_evenement = ask(
+                id_evenement, "\nID de l'événement à modifier", "--id",
+                type=int
             )
 
             # Vérifier si l'événement appartient bien au support
             evenement = get_evenement_for_support(db, id_evenement, user_id)
 
             if not evenement:
-                console.print("[bold red]Erreur : Cet événement ne vous est "
-                              "pas attribué ou n'existe pas.[/bold red]")
+                print_error(
+                    console,
+                    "[bold red]Erreur : Cet événement ne vous est "
+                    "pas attribué ou n'existe pas.[/bold red]"
+                )
                 return
 
             # Demander les modifications
             console.print("\n[bold cyan]📝 Modifications de "
                           "l'événement[/bold cyan]")
 
-            date_debut_str = click.prompt(
+            date_debut_str = ask(
+                date_debut_str,
                 "Nouvelle date de début (JJ/MM/AAAA) "
-                "(laisser vide pour ne pas changer)",
+                "(laisser vide pour ne pas changer)", "--debut",
                 default="", show_default=False
             )
-            date_fin_str = click.prompt(
+            date_fin_str = ask(
+                date_fin_str,
                 "Nouvelle date de fin (JJ/MM/AAAA) (laisser vide pour "
-                "ne pas changer)",
+                "ne pas changer)", "--fin",
                 default="", show_default=False
             )
-            lieu = click.prompt(
-                "Nouveau lieu (laisser vide pour ne pas changer)",
+            lieu = ask(
+                lieu, "Nouveau lieu (laisser vide pour ne pas changer)",
+                "--lieu",
                 default="", show_default=False
             ).strip().lower().capitalize()
-            participants = click.prompt(
+            participants = ask(
+                participants,
                 "Nombre de participants (laisser vide pour ne pas changer)",
+                "--participants",
                 type=int,
                 default=None
             )
-            notes = click.prompt(
-                "Notes (laisser vide pour ne pas changer)",
+            notes = ask(
+                notes, "Notes (laisser vide pour ne pas changer)", "--notes",
                 default="",
                 show_default=False
             ).strip().lower()
             # Convertir les dates
-            date_debut = (
-                datetime.strptime(date_debut_str, "%d/%m/%Y")
-                if date_debut_str
-                else None
-            )
-            date_fin = (
-                datetime.strptime(date_fin_str, "%d/%m/%Y")
-                if date_fin_str
-                else None
-            )
+            date_debut = parse_date(date_debut_str)
+            date_fin = parse_date(date_fin_str)
 
             # Vérification date début < date fin
             if date_debut and date_fin and date_debut > date_fin:
-                console.print(
+                print_error(
+                    console,
                     "[bold red]Erreur : La date de début ne peut pas être "
                     "après la date de fin.[/bold red]"
                 )
@@ -419,6 +739,22 @@ def update_evenement():
                               "apportée.[/bold yellow]")
                 return
 
+            # Les nouvelles dates ne doivent pas chevaucher le planning
+            if date_debut or date_fin:
+                conflit = get_overlapping_evenement(
+                    db, user_id,
+                    (date_debut or evenement.date_debut),
+                    (date_fin or evenement.date_fin),
+                    exclude_id=evenement.id
+                )
+                if conflit:
+                    print_error(
+                        console,
+                        f"[bold red]Erreur : {conflict_message(conflit)}"
+                        "[/bold red]"
+                    )
+                    return
+
             # Appliquer les modifications
             for key, value in updates.items():
                 setattr(evenement, key, value)
@@ -438,6 +774,9 @@ def update_evenement():
             console.print(f"   🔹 Notes : {evenement.notes or 'Aucune'}")
 
         except ValueError as e:
-            console.print(f"[bold red]Erreur : {e}[/bold red]")
+            print_error(console, f"[bold red]Erreur : {e}[/bold red]")
         except Exception as e:
-            console.print(f"[bold red]Erreur inattendue : {e}[/bold red]")
+            print_error(
+                console,
+                f"[bold red]Erreur inattendue : {e}[/bold red]"
+            )
@@ -0,0 +1,88 @@
+import click
+from rich.console import Console
+from app.services.export_service import (
+    export_clients, export_contrats, export_evenements
+)
+from app.auth.context import get_auth_context
+from app.db.session import session_scope
+from app.auth.permissions import role_required
+from app.utils.config import CustomGroup, print_error
+from app.utils.records import EXPORT_FORMATS, write_records
+from app.utils.tracing import span
+
+# Les messages vont sur stderr : stdout peut recevoir l'export lui-même
+console = Console(stderr=True)
+
+
+@click.group(
+    name="export",
+    no_args_is_help=False,
+    invoke_without_command=True,
+    cls=CustomGroup
+)
+@click.pass_context
+def export_group(ctx):
+    """Commandes pour exporter les données."""
+    if ctx.invoked_subcommand is None:
+        console.print("[bold yellow]❗ Utilisez 'help' pour voir les commandes "
+                      "disponibles.[/bold yellow]")
+        ctx.exit(1)
+
+
+def export_options(func):
+    """Ajoute les options de format et de fichier de sortie d'un export."""
+    func = click.option(
+        "--output", "-o", type=click.File("w", encoding="utf-8"),
+        default="-", help="Fichier de sortie (sortie standard par défaut)."
+    )(func)
+    func = click.option(
+        "--format", "fmt", type=click.Choice(EXPORT_FORMATS), default="csv",
+        show_default=True, help="Format du fichier exporté."
+    )(func)
+    return func
+
+
+def run_export(export, output, fmt, **filters):
+    """Exécute un export et écrit les lignes au fil de la lecture."""
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
+        return
+
+    with session_scope() as db:
+        exported = export(db, auth, **filters)
+        if exported is None:
+            return
+        columns, rows = exported
+        with span("render", f"Export {fmt}"):
+            count = write_records(output, fmt, columns, rows)
+
+    console.print(f"[bold green]{count} ligne(s) exportée(s).[/bold green]")
+
+
+@export_group.command(name="clients")
+@role_required(["gestion", "support", "commercial"])
+@click.option("-all", "-a", is_flag=True)
+@export_options
+def export_clients_cli(all, fmt, output):
+    """Exporter les clients (ceux du commercial, ou tous avec -all)."""
+    run_export(export_clients, output, fmt, all_clients=all)
+
+
+@export_group.command(name="contrats")
+@role_required(["gestion", "support", "commercial"])
+@click.option("-all", "-a", is_flag=True)
+@export_options
+def export_contrats_cli(all, fmt, output):
+    """Exporter les contrats (ceux du commercial, ou tous avec -all)."""
+    run_export(export_contrats, output, fmt, all_contrats=all)
+
+
+@export_group.command(name="evenements")
+@role_required(["gestion", "support", "commercial"])
+@click.option("-mine", is_flag=True)
+@export_options
+def export_evenements_cli(mine, fmt, output):
+    """Exporter les événements (ceux du support avec -mine)."""
+    run_export(export_evenements, output, fmt, mine=mine)
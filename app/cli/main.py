@@ -1,40 +1,69 @@
 import click
+import importlib
 from app.utils.sentry import sentry_sdk
 from rich.console import Console
-from app.cli.auth import auth_group
-from app.cli.clients import clients_group
-from app.cli.contrats import contrats_group
-from app.cli.evenements import evenements_group
-from app.cli.collaborateurs import collaborateurs_group
-from app.auth.jwt_utils import decode_token
-from app.utils.file_utils import load_token
-from app.utils.config import get_role_commands
+from app.auth.context import auth_scope
+from app.auth.permission_index import (
+    META_KEY, check_command, get_permission_index
+)
+from app.db.profiling import command_profile
+from app.db.scope import command_session_scope
+from app.utils.tracing import command_transaction, span
 import os
 
 
 console = Console()
-ROLE_COMMANDS = get_role_commands()
 
+# Groupes importés seulement lorsqu'ils sont invoqués : une commande ne
+# charge que son propre module (et ses dépendances, SQLAlchemy compris).
+LAZY_COMMANDS = {
+    "auth": "app.cli.auth:auth_group",
+    "clients": "app.cli.clients:clients_group",
+    "contrats": "app.cli.contrats:contrats_group",
+    "evenements": "app.cli.evenements:evenements_group",
+    "collaborateurs": "app.cli.collaborateurs:collaborateurs_group",
+    "export": "app.cli.exports:export_group",
+    "reports": "app.cli.reports:reports_group",
+}
 
-def get_user_role():
-    """Récupère le rôle de l'utilisateur connecté à partir du token."""
-    token = load_token()
-    if not token:
-        return None  # Aucune connexion
 
-    payload = decode_token(token)
-    if not payload:
-        return None  # Token invalide ou expiré
-    return payload.get("role")
+class CustomCLI(click.Group):
+    def list_commands(self, ctx):
+        """Liste les commandes enregistrées et les groupes paresseux."""
+        return sorted(set(super().list_commands(ctx)) | set(LAZY_COMMANDS))
 
+    def load_command(self, ctx, cmd_name):
+        """Retourne la commande, en important son module si nécessaire."""
+        command = super().get_command(ctx, cmd_name)
+        if command is None and cmd_name in LAZY_COMMANDS:
+            module_name, attr = LAZY_COMMANDS[cmd_name].split(":")
+            with span("cli.load", module_name):
+                module = importlib.import_module(module_name)
+            command = getattr(module, attr)
+            self.add_command(command, cmd_name)
+        return command
+
+    def invoke(self, ctx):
+        """
+        Exécute la commande en résolvant l'authentification une seule fois
+        et avec une seule session de base de données. Avec `--profile`,
+        les requêtes SQL de la commande sont comptées ; une fraction des
+        commandes est tracée (Sentry, TRACES_FILE).
+        """
+        # Groupe et commande seulement : les arguments peuvent contenir
+        # des mots de passe.
+        name = " ".join([*ctx.protected_args, *ctx.args][:2])
+        # Index partagé avec les sous-groupes et role_required
+        ctx.meta[META_KEY] = get_permission_index()
+        with command_transaction(name), command_profile(name), \
+                auth_scope(), command_session_scope():
+            return super().invoke(ctx)
 
-class CustomCLI(click.Group):
     def get_command(self, ctx, cmd_name):
         """
         Filtrer les commandes disponibles en fonction du rôle.
         """
-        role = get_user_role()
-        command = super().get_command(ctx, cmd_name)
+        command = self.load_command(ctx, cmd_name)
 
         if command is None:
             error_message = f"La commande '{cmd_name}' n'existe pas."
@@ -42,20 +71,7 @@ class CustomCLI(click.Group):
             sentry_sdk.capture_message(error_message, level="warning")
             ctx.exit(1)
 
-        if role:
-            allowed_cmds = ROLE_COMMANDS.get(role, [])
-
-            if (cmd_name not in allowed_cmds and
-                    not any(cmd_name.startswith(ac) for ac in allowed_cmds)):
-                error_message = (
-                    f"Accès refusé : La commande '{cmd_name}' "
-                    "n'est pas disponible "
-                    f"pour votre rôle '{role}'. "
-                )
-                console.print(f"[bold red]{error_message}[/bold red]")
-                sentry_sdk.capture_message(error_message, level="warning")
-                ctx.exit(1)
-
+        check_command(ctx, [cmd_name])
         return command
 
 
@@ -70,11 +86,6 @@ def cli():
     """CLI principal d'EpicEvents."""
 
 
-cli.add_command(auth_group)
-cli.add_command(clients_group)
-cli.add_command(contrats_group)
-cli.add_command(evenements_group)
-cli.add_command(collaborateurs_group)
 cli.add_command(clear_console)
 
 
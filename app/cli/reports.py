@@ -0,0 +1,124 @@
+import click
+from rich.console import Console
+from rich.markup import escape
+from app.auth.context import get_auth_context
+from app.auth.permissions import role_required
+from app.core.config import settings
+from app.db.models.revenu import SANS_VALEUR
+from app.db.session import session_scope
+from app.services.report_service import revenue_report
+from app.utils.config import CustomGroup, print_error
+from app.utils.rendering import print_table
+
+console = Console()
+
+# Colonnes des agrégats, communes aux deux tableaux du rapport
+MEASURE_COLUMNS = [
+    ("Nb", {"justify": "right", "no_wrap": True}),
+    ("Signés", {"justify": "right", "no_wrap": True}),
+    ("Total €", {"justify": "right", "style": "green", "no_wrap": True}),
+    ("Signé €", {"justify": "right", "style": "green", "no_wrap": True}),
+    ("Non signé €",
+     {"justify": "right", "style": "yellow", "no_wrap": True}),
+    ("À encaisser €",
+     {"justify": "right", "style": "bold red", "no_wrap": True}),
+]
+
+
+def euros(value: float) -> str:
+    """Montant arrondi à l'euro, milliers séparés par une espace."""
+    return f"{value:,.0f}".replace(",", " ")
+
+
+@click.group(
+    name="reports",
+    no_args_is_help=False,
+    invoke_without_command=True,
+    cls=CustomGroup
+)
+@click.pass_context
+def reports_group(ctx):
+    """Commandes pour consulter les rapports."""
+    if ctx.invoked_subcommand is None:
+        console.print("[bold yellow]❗ Utilisez 'help' pour voir les commandes "
+                      "disponibles.[/bold yellow]")
+        ctx.exit(1)
+
+
+def measure_cells(row):
+    """Cellules des agrégats d'une ligne du rapport."""
+    return (
+        str(row.nb_contrats),
+        str(row.nb_signes),
+        euros(row.montant_total),
+        euros(row.montant_signe),
+        euros(row.montant_total - row.montant_signe),
+        euros(row.montant_restant),
+    )
+
+
+def commercial_row(row):
+    if row.id_commercial == SANS_VALEUR:
+        nom = "Sans commercial"
+    elif row.nom is None:
+        nom = f"ID {row.id_commercial} (supprimé)"
+    else:
+        nom = escape(f"{row.prenom} {row.nom}")
+    return (nom, *measure_cells(row))
+
+
+def month_row(row):
+    if row.annee == SANS_VALEUR:
+        return ("Sans date", *measure_cells(row))
+    return (f"{row.annee}-{row.mois:02d}", *measure_cells(row))
+
+
+@reports_group.command(name="revenue")
+@role_required(["gestion"])
+@click.option("--rebuild", is_flag=True,
+              help="Recalculer la table de synthèse (REVENUE_SUMMARY).")
+def revenue(rebuild):
+    """
+    Chiffre d'affaires, contrats signés et reste à encaisser par
+    commercial et par mois.
+    """
+    auth = get_auth_context()
+    if not auth:
+        print_error(console, "[bold red]Erreur : Token invalide ou expiré. "
+                             "Veuillez vous reconnecter.[/bold red]")
+        return
+    if rebuild and not settings.REVENUE_SUMMARY:
+        print_error(console, "[bold red]Erreur : La table de synthèse est "
+                             "désactivée (REVENUE_SUMMARY).[/bold red]")
+        return
+
+    with session_scope() as db:
+        report = revenue_report(db, auth, rebuild=rebuild)
+        if report is None:
+            return
+        by_commercial, by_month = report
+
+        if not by_month:
+            console.print("[bold magenta]Aucun contrat trouvé."
+                          "[/bold magenta]")
+            return
+
+        print_table(
+            console,
+            "[bold green]Chiffre d'affaires par commercial[/bold green]",
+            [("Commercial", {"style": "cyan", "min_width": 12}),
+             *MEASURE_COLUMNS],
+            by_commercial, commercial_row
+        )
+        print_table(
+            console,
+            "[bold green]Chiffre d'affaires par mois[/bold green]",
+            [("Mois", {"style": "cyan", "no_wrap": True}), *MEASURE_COLUMNS],
+            by_month, month_row
+        )
+        total = sum(row.montant_total for row in by_month)
+        restant = sum(row.montant_restant for row in by_month)
+        console.print(
+            f"[bold]Total : {euros(total)} € — reste à encaisser : "
+            f"{euros(restant)} €[/bold]"
+        )
@@ -0,0 +1,250 @@
+import datetime
+import importlib
+import shlex
+import threading
+import time
+import click
+from prompt_toolkit.completion import Completer, Completion
+from app.auth.context import get_auth_context, invalidate_auth_context
+from app.auth.permission_index import get_permission_index
+
+# Renouvellement du token lorsqu'il expire dans moins de REFRESH_MARGIN
+REFRESH_MARGIN = datetime.timedelta(minutes=5)
+# Durée de validité des identifiants proposés à la complétion
+ID_CACHE_TTL = 60
+# Nombre d'identifiants chargés par type
+ID_CACHE_LIMIT = 1000
+
+# Options (groupe, option) complétées par des identifiants, et type associé
+ID_OPTIONS = {
+    ("clients", "--id"): "clients",
+    ("clients", "show"): "clients",
+    ("contrats", "--id"): "contrats",
+    ("contrats", "--client"): "clients",
+    ("evenements", "--id"): "evenements",
+    ("evenements", "--contrat"): "contrats",
+    ("evenements", "--client"): "clients",
+    ("evenements", "--evenement"): "evenements",
+    ("evenements", "--support"): "supports",
+}
+# Sous-commandes qui modifient les données : le cache est alors périmé
+WRITE_COMMANDS = {
+    "create", "update", "update-mine", "delete", "import", "assign_support",
+    "auto-assign",
+}
+
+
+class IdCache:
+    """
+    Derniers identifiants (clients, contrats, événements, supports)
+    accessibles à l'utilisateur connecté et leur libellé, rechargés en
+    arrière-plan lorsqu'ils sont périmés : la complétion ne bloque jamais
+    la saisie.
+    """
+
+    def __init__(self, loader=None, ttl: float = ID_CACHE_TTL, auth=None):
+        self.loader = loader or self.load
+        self.ttl = ttl
+        self.auth = auth or get_auth_context
+        self.ids = {}
+        self.loaded_at = None
+        self._lock = threading.Lock()
+        self._loading = False
+
+    @staticmethod
+    def load(auth):
+        from app.crud.completion import get_completion_ids
+        from app.db.session import SessionLocal
+
+        with SessionLocal() as db:
+            return get_completion_ids(db, auth, ID_CACHE_LIMIT)
+
+    def is_stale(self) -> bool:
+        return (self.loaded_at is None
+                or time.monotonic() - self.loaded_at > self.ttl)
+
+    def invalidate(self):
+        self.loaded_at = None
+
+    def reserve(self) -> bool:
+        """Réserve le prochain chargement (False : un autre est en cours)."""
+        with self._lock:
+            if self._loading:
+                return False
+            self._loading = True
+            return True
+
+    def release(self):
+        """Libère une réservation sans charger."""
+        self._loading = False
+
+    def refresh(self, auth=None):
+        """Recharge les identifiants visibles pour `auth` (appel bloquant)."""
+        try:
+            self.ids = self.loader(auth)
+            self.loaded_at = time.monotonic()
+        except Exception:
+            # Base indisponible : la complétion reste sur l'ancien cache
+            pass
+        finally:
+            self.release()
+
+    def refresh_in_background(self):
+        if not self.reserve():
+            return
+        # Identité lue ici : le thread de chargement n'a pas le contexte
+        threading.Thread(
+            target=self.refresh, args=(self.auth(),), daemon=True
+        ).start()
+
+    def get(self, kind: str) -> list:
+        if self.is_stale():
+            self.refresh_in_background()
+        return self.ids.get(kind, [])
+
+
+class ShellCompleter(Completer):
+    """
+    Complète les commandes autorisées pour le rôle, leurs options et les
+    identifiants attendus par les options (--client, --evenement...).
+    """
+
+    def __init__(self, cli, ids: IdCache, role=None):
+        self.cli = cli
+        self.ids = ids
+        self.role = role or (lambda: None)
+
+    def allowed(self, path) -> bool:
+        role = self.role()
+        return not role or get_permission_index().allows(role, path)
+
+    def candidates(self, words):
+        """Propositions (texte, description) après les mots `words`."""
+        ctx = click.Context(self.cli)
+        if not words:
+            names = [name for name in self.cli.list_commands(ctx)
+                     if self.allowed([name])]
+            return [(name, None) for name in names + ["exit"]]
+
+        group = self.cli.load_command(ctx, words[0])
+        if not isinstance(group, click.Group):
+            return []
+        if len(words) == 1:
+            return [(name, None) for name in sorted(group.commands)
+                    if self.allowed([words[0], name])]
+
+        kind = ID_OPTIONS.get((words[0], words[-1]))
+        if kind:
+            return self.ids.get(kind)
+        command = group.commands.get(words[1])
+        if command is None:
+            return []
+        return [(opt, param.help) for param in command.params
+                if isinstance(param, click.Option)
+                for opt in param.opts + param.secondary_opts
+                if opt not in words]
+
+    def get_completions(self, document, complete_event):
+        text = document.text_before_cursor
+        words = text.split()
+        prefix = "" if not words or text[-1:].isspace() else words.pop()
+        for value, meta in self.candidates(words):
+            if value.startswith(prefix):
+                yield Completion(
+                    value, start_position=-len(prefix), display_meta=meta
+                )
+
+
+class InteractiveShell:
+    """
+    État du shell interactif conservé entre les commandes : identité en
+    mémoire (relue sur disque seulement après un login ou un logout et
+    renouvelée avant expiration), moteur et modules préchargés, cache
+    d'identifiants pour la complétion.
+    """
+
+    def __init__(self, cli, ids: IdCache = None):
+        self.cli = cli
+        self.ids = ids or IdCache()
+        self.completer = ShellCompleter(cli, self.ids, self.current_role)
+
+    def current_role(self):
+        auth = get_auth_context()
+        return auth.role if auth else None
+
+    def warm_up(self):
+        """
+        Importe les modules des commandes, ouvre une première connexion
+        (rendue au pool, donc réutilisée) et charge les identifiants, en
+        arrière-plan pendant que l'utilisateur tape sa première commande.
+        Le chargement est réservé d'emblée : la complétion n'en lance pas
+        un second en parallèle.
+        """
+        auth = self.ids.auth()
+        loading = self.ids.reserve()
+
+        def run():
+            from app.cli.main import LAZY_COMMANDS
+            from app.db.session import engine
+
+            try:
+                with engine.connect() as connection:
+                    connection.exec_driver_sql("SELECT 1")
+                for target in LAZY_COMMANDS.values():
+                    importlib.import_module(target.split(":")[0])
+            except Exception:
+                if loading:
+                    self.ids.release()
+                return
+            if loading:
+                self.ids.refresh(auth)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread
+
+    def refresh_identity(self, margin=REFRESH_MARGIN):
+        """
+        Renouvelle le token s'il expire bientôt, après avoir vérifié en
+        base que le collaborateur existe toujours (son rôle est relu).
+        """
+        auth = get_auth_context()
+        now = datetime.datetime.now(datetime.timezone.utc)
+        if not auth or auth.expiry - now > margin:
+            return auth
+
+        from app.auth.jwt_utils import generate_token
+        from app.crud.collaborateurs import get_collaborateur
+        from app.db.scope import session_scope
+        from app.utils.file_utils import delete_token, save_token
+
+        with session_scope() as db:
+            collaborateur = get_collaborateur(db, auth.user_id)
+            if collaborateur is None:
+                delete_token()
+            else:
+                save_token(generate_token(
+                    user_id=collaborateur.id,
+                    role=collaborateur.departement.nom,
+                    nom=collaborateur.nom,
+                    prenom=collaborateur.prenom
+                ))
+        invalidate_auth_context()
+        return get_auth_context()
+
+    def run_command(self, line: str):
+        """Exécute une ligne saisie dans le shell."""
+        args = shlex.split(line)
+        if not args:
+            return None
+        self.refresh_identity()
+        try:
+            return self.cli.main(
+                args=args, prog_name="main.py", standalone_mode=False
+            )
+        finally:
+            # Données modifiées, ou identité changée (login, logout)
+            if args[0] == "auth" or (
+                len(args) > 1 and args[1] in WRITE_COMMANDS
+            ):
+                self.ids.invalidate()
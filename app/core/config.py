@@ -1,3 +1,4 @@
+import os
 from decouple import config
 
 
@@ -6,5 +7,43 @@ class Settings:
     DEBUG = config("DEBUG", cast=bool, default=False)
     SECRET_KEY = config("SECRET_KEY", default="changeme")
 
+    # Pool de connexions SQLAlchemy
+    DB_POOL_SIZE = config("DB_POOL_SIZE", cast=int, default=5)
+    DB_MAX_OVERFLOW = config("DB_MAX_OVERFLOW", cast=int, default=10)
+    DB_POOL_TIMEOUT = config("DB_POOL_TIMEOUT", cast=int, default=30)
+    # Recyclage avant le wait_timeout MySQL (8 h par défaut)
+    DB_POOL_RECYCLE = config("DB_POOL_RECYCLE", cast=int, default=1800)
+    DB_POOL_PRE_PING = config("DB_POOL_PRE_PING", cast=bool, default=True)
+    # Requêtes journalisées par le profilage (--profile) au-delà de ce seuil
+    SLOW_QUERY_MS = config("SLOW_QUERY_MS", cast=int, default=100)
+    # Durée (s) du cache des départements et des listes de collaborateurs
+    REFERENCE_CACHE_TTL = config("REFERENCE_CACHE_TTL", cast=int, default=300)
+
+    # Table de synthèse du rapport de chiffre d'affaires (`reports revenue`),
+    # tenue à jour à chaque écriture de contrat
+    REVENUE_SUMMARY = config("REVENUE_SUMMARY", cast=bool, default=False)
+
+    # Paramètres Argon2 (valeurs par défaut d'argon2-cffi). Les
+    # environnements de test peuvent les réduire ; les hashs existants
+    # restent vérifiables et sont mis à niveau à la connexion.
+    ARGON2_TIME_COST = config("ARGON2_TIME_COST", cast=int, default=3)
+    ARGON2_MEMORY_COST = config("ARGON2_MEMORY_COST", cast=int, default=65536)
+    ARGON2_PARALLELISM = config("ARGON2_PARALLELISM", cast=int, default=4)
+    # Processus de hachage pour les créations en masse (0 : un par CPU)
+    HASH_WORKERS = config("HASH_WORKERS", cast=int, default=0)
+
+    # Limitation des tentatives de connexion (fenêtre glissante)
+    LOGIN_WINDOW_SECONDS = config(
+        "LOGIN_WINDOW_SECONDS", cast=int, default=300
+    )
+    LOGIN_MAX_ATTEMPTS = config("LOGIN_MAX_ATTEMPTS", cast=int, default=5)
+    LOGIN_MAX_ATTEMPTS_PER_CLIENT = config(
+        "LOGIN_MAX_ATTEMPTS_PER_CLIENT", cast=int, default=20
+    )
+    LOGIN_ATTEMPTS_FILE = config(
+        "LOGIN_ATTEMPTS_FILE",
+        default=os.path.expanduser("~/.epicevents_login_attempts.db")
+    )
+
 
 settings = Settings()
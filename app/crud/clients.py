@@ -1,10 +1,20 @@
+import re
+import weakref
+from sqlalchemy import column, insert, inspect, or_, select, table, text
+from sqlalchemy.dialects.mysql import match
 from sqlalchemy.orm import Session
-from app.db.models.client import Client
+from app.crud.reports import reassign_revenue
+from app.db.models.client import SEARCH_COLUMNS, Client
 from sqlalchemy.orm import load_only
 from rich.console import Console
 
 console = Console()
 
+# Table FTS5 des clients (SQLite), voir app.db.models.client
+clients_fts = table("clients_fts", column("rowid"), column("rank"))
+# Résultat de `fulltext_dialect` par moteur
+_fulltext_dialects = weakref.WeakKeyDictionary()
+
 
 def create_client(
     db: Session, nom_complet: str, email: str, telephone: str,
@@ -24,6 +34,25 @@ def create_client(
     return client
 
 
+def get_existing_emails(db: Session, emails):
+    """Retourne, en une requête, les emails déjà utilisés parmi `emails`."""
+    if not emails:
+        return set()
+    return set(
+        db.scalars(select(Client.email).where(Client.email.in_(emails)))
+    )
+
+
+def bulk_insert_clients(db: Session, rows):
+    """
+    Insère plusieurs clients en une seule instruction (executemany).
+    Les validations `@validates` du modèle ne sont pas appliquées : les
+    lignes doivent avoir été validées au préalable.
+    """
+    if rows:
+        db.execute(insert(Client), rows)
+
+
 def get_client(db, client_id):
     """Récupérer un client en s'assurant que id_commercial est bien chargé."""
     client = (
@@ -42,6 +71,80 @@ def get_clients_by_commercial(db: Session, commercial_id: int):
     return db.query(Client).filter(Client.id_commercial == commercial_id).all()
 
 
+def query_clients(db: Session, commercial_id: int = None):
+    """Construit la requête des clients, éventuellement d'un commercial."""
+    query = db.query(Client)
+    if commercial_id is not None:
+        query = query.filter(Client.id_commercial == commercial_id)
+    return query
+
+
+def search_words(term: str) -> list:
+    """Mots d'un terme de recherche, sans la syntaxe des moteurs FTS."""
+    return re.findall(r"\w+", term)
+
+
+def fulltext_dialect(db: Session):
+    """
+    Dialecte (« sqlite » ou « mysql ») dont l'index plein texte des
+    clients existe dans la base, sinon None (base non migrée).
+
+    Le schéma n'est inspecté qu'à la première recherche sur un moteur : une
+    migration appliquée ensuite est prise en compte au prochain lancement.
+    """
+    engine = db.get_bind().engine
+    if engine not in _fulltext_dialects:
+        _fulltext_dialects[engine] = inspect_fulltext_dialect(db)
+    return _fulltext_dialects[engine]
+
+
+def inspect_fulltext_dialect(db: Session):
+    """Inspecte le schéma : voir `fulltext_dialect`."""
+    inspector = inspect(db.connection())
+    dialect = inspector.dialect.name
+    if dialect == "sqlite" and inspector.has_table("clients_fts"):
+        return dialect
+    if dialect == "mysql" and "ix_clients_recherche" in {
+        index["name"] for index in inspector.get_indexes("clients")
+    }:
+        return dialect
+    return None
+
+
+def search_clients_query(db: Session, term: str):
+    """
+    Construit la recherche des clients dont chaque mot de `term` débute
+    un mot du nom, de l'email, de l'entreprise ou du téléphone, les plus
+    pertinents d'abord : table FTS5 sous SQLite, index FULLTEXT sous
+    MySQL, LIKE (sans classement) sans index plein texte.
+    """
+    words = search_words(term)
+    if not words:
+        raise ValueError("Le terme de recherche est vide.")
+
+    query = db.query(Client)
+    dialect = fulltext_dialect(db)
+    if dialect == "sqlite":
+        expression = " ".join(f'"{word}"*' for word in words)
+        return (
+            query.join(clients_fts, clients_fts.c.rowid == Client.id)
+            .filter(text("clients_fts MATCH :expression")
+                    .bindparams(expression=expression))
+            .order_by(clients_fts.c.rank, Client.id)
+        )
+    columns = [getattr(Client, name) for name in SEARCH_COLUMNS]
+    if dialect == "mysql":
+        score = match(
+            *columns, against=" ".join(f"+{word}*" for word in words)
+        ).in_boolean_mode()
+        return query.filter(score).order_by(score.desc(), Client.id)
+    for word in words:
+        query = query.filter(
+            or_(*(column.ilike(f"%{word}%") for column in columns))
+        )
+    return query.order_by(Client.id)
+
+
 def get_all_clients(
     db: Session, user_id: int, role: str, all_clients: bool = False
 ):
@@ -60,6 +163,12 @@ def update_client(db: Session, client_id: int, **updates):
     """Mettre à jour les informations d'un client."""
     client = db.query(Client).filter(Client.id == client_id).first()
     if client:
+        if "id_commercial" in updates:
+            # Ses contrats changent de commercial dans la synthèse
+            reassign_revenue(
+                db, client.id_commercial, updates["id_commercial"],
+                client_id=client.id
+            )
         for key, value in updates.items():
             setattr(client, key, value)
         db.commit()
@@ -1,4 +1,7 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, or_, select, update
+from sqlalchemy.orm import Session, joinedload
+from app.auth.hashing import hash_password, pop_pending_rehashes
+from app.crud.reports import reassign_revenue
 from app.db.models.collaborateur import Collaborateur
 from app.db.models.collaborateur import Departement
 
@@ -37,6 +40,27 @@ def create_collaborateur(
     return collaborateur
 
 
+def get_existing_logins_and_emails(db: Session, logins, emails):
+    """Retourne, en une requête, les logins et emails déjà utilisés."""
+    if not logins and not emails:
+        return set(), set()
+    rows = db.execute(
+        select(Collaborateur.login, Collaborateur.email).where(or_(
+            Collaborateur.login.in_(logins), Collaborateur.email.in_(emails)
+        ))
+    ).all()
+    return {row.login for row in rows}, {row.email for row in rows}
+
+
+def bulk_insert_collaborateurs(db: Session, rows):
+    """
+    Insère plusieurs collaborateurs (mots de passe déjà hachés) en une
+    seule instruction.
+    """
+    if rows:
+        db.execute(insert(Collaborateur), rows)
+
+
 def authentifier_collaborateur_from_crud(
     db: Session, login: str, password: str
 ):
@@ -51,6 +75,30 @@ def authentifier_collaborateur_from_crud(
     return None
 
 
+def apply_pending_rehashes(db: Session, pending=None) -> int:
+    """
+    Met à niveau les hashs `pending` (id, ancien hash, mot de passe), par
+    défaut ceux signalés lors de la connexion en cours (bloc
+    `deferred_rehashes`). Un hash modifié entre-temps (changement de mot
+    de passe) n'est pas écrasé.
+    """
+    if pending is None:
+        pending = pop_pending_rehashes()
+    upgraded = 0
+    for collaborateur_id, old_hash, password in pending:
+        result = db.execute(
+            update(Collaborateur)
+            .where(Collaborateur.id == collaborateur_id)
+            .where(Collaborateur.password_hash == old_hash)
+            .values(password_hash=hash_password(password))
+            .execution_options(synchronize_session=False)
+        )
+        upgraded += result.rowcount
+    if upgraded:
+        db.commit()
+    return upgraded
+
+
 def get_collaborateur(db: Session, collaborateur_id: int):
     """Récupérer un collaborateur par ID."""
     return db.query(Collaborateur) \
@@ -58,14 +106,25 @@ def get_collaborateur(db: Session, collaborateur_id: int):
              .first()
 
 
-def get_support(db: Session, support_id: int):
-    """Récupérer un support par ID."""
+def get_support(db: Session, support_id: int, departement_id: int):
+    """
+    Récupérer un support par ID. `departement_id` est l'ID du département
+    support (voir app.services.reference_data), ce qui évite une
+    sous-requête sur les départements.
+    """
     return db.query(Collaborateur) \
              .filter(Collaborateur.id == support_id) \
-             .filter(Collaborateur.departement.has(nom="support")) \
+             .filter(Collaborateur.departement_id == departement_id) \
              .first()
 
 
+def query_collaborateurs(db: Session):
+    """Construit la requête des collaborateurs avec leur département."""
+    return db.query(Collaborateur).options(
+        joinedload(Collaborateur.departement)
+    )
+
+
 def get_all_collaborateurs(db: Session):
     """Récupérer tous les collaborateurs."""
     return db.query(Collaborateur).all()
@@ -90,6 +149,8 @@ def delete_collaborateur(db: Session, collaborateur_id: int):
                       .filter(Collaborateur.id == collaborateur_id) \
                       .first()
     if collaborateur:
+        # Ses clients n'ont plus de commercial : la synthèse suit
+        reassign_revenue(db, collaborateur.id, None)
         db.delete(collaborateur)
         db.commit()
     return collaborateur
@@ -0,0 +1,71 @@
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.db.models import Client, Collaborateur, Contrat, Evenement
+from app.db.models.collaborateur import Departement
+
+# Identifiants proposés à la complétion du shell : les plus récents, avec
+# un libellé court, sans construire d'objets ORM.
+
+
+def completion_queries(limit: int, role: str = None, user_id: int = None):
+    """
+    Requêtes (id, libellé) par type d'enregistrement, restreintes comme
+    les commandes `list` du rôle : un commercial voit ses clients, leurs
+    contrats et événements ; un support, ses événements et leurs clients
+    et contrats ; seule la gestion voit tout, supports compris.
+    """
+    clients = select(Client.id, Client.nom_complet)
+    contrats = select(Contrat.id, Client.nom_complet).join(
+        Client, Contrat.id_client == Client.id
+    )
+    evenements = select(Evenement.id, Evenement.lieu)
+
+    if role == "commercial":
+        clients = clients.where(Client.id_commercial == user_id)
+        contrats = contrats.where(Client.id_commercial == user_id)
+        evenements = (
+            evenements.join(Contrat, Evenement.id_contrat == Contrat.id)
+            .join(Client, Contrat.id_client == Client.id)
+            .where(Client.id_commercial == user_id)
+        )
+    elif role == "support":
+        mes_contrats = select(Evenement.id_contrat).where(
+            Evenement.id_support == user_id
+        )
+        clients = clients.where(Client.id.in_(
+            select(Contrat.id_client).where(Contrat.id.in_(mes_contrats))
+        ))
+        contrats = contrats.where(Contrat.id.in_(mes_contrats))
+        evenements = evenements.where(Evenement.id_support == user_id)
+    elif role != "gestion":
+        return {}
+
+    queries = {
+        "clients": clients.order_by(Client.id.desc()).limit(limit),
+        "contrats": contrats.order_by(Contrat.id.desc()).limit(limit),
+        "evenements": evenements.order_by(Evenement.id.desc()).limit(limit),
+    }
+    if role == "gestion":
+        queries["supports"] = (
+            select(Collaborateur.id,
+                   Collaborateur.prenom + " " + Collaborateur.nom)
+            .join(Departement)
+            .where(Departement.nom == "support")
+            .order_by(Collaborateur.id).limit(limit)
+        )
+    return queries
+
+
+def get_completion_ids(db: Session, auth, limit: int = 1000) -> dict:
+    """
+    Couples (id, libellé) des derniers clients, contrats, événements
+    accessibles à `auth` (aucun sans utilisateur connecté).
+    """
+    if auth is None:
+        return {}
+    return {
+        kind: [(str(row[0]), row[1]) for row in db.execute(query)]
+        for kind, query in completion_queries(
+            limit, auth.role, auth.user_id
+        ).items()
+    }
@@ -1,5 +1,15 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, contains_eager
+from app.core.config import settings
 from app.db.models.contrat import Contrat
+from app.db.models.client import Client
+from app.crud.reports import apply_revenue_change, revenue_snapshot
+
+# Tris disponibles pour la liste des contrats
+CONTRAT_SORTS = {
+    "client": (Client.nom_complet, Contrat.id),
+    "id": (Contrat.id,),
+    "montant_restant": (Contrat.montant_restant.desc(), Contrat.id),
+}
 
 
 def create_contrat(db: Session, id_client: int, montant_total: float):
@@ -11,6 +21,10 @@ def create_contrat(db: Session, id_client: int, montant_total: float):
         statut=False
     )
     db.add(contrat)
+    if settings.REVENUE_SUMMARY:
+        # Date de création et clé du contrat connues après le flush
+        db.flush()
+        apply_revenue_change(db, None, revenue_snapshot(db, contrat))
     db.commit()
     db.refresh(contrat)
     return contrat
@@ -31,6 +45,39 @@ def get_all_contrats(db: Session):
     return db.query(Contrat).all()
 
 
+def query_contrats(
+    db: Session,
+    statut: bool = None,
+    unpaid: bool = False,
+    commercial_id: int = None,
+    sort: str = "client"
+):
+    """
+    Construit la requête des contrats filtrés et triés en base.
+
+    Le client et son commercial sont chargés par jointure dans le même
+    SELECT. Retourne la requête pour permettre de la compléter.
+    """
+    if sort not in CONTRAT_SORTS:
+        raise ValueError(f"Tri inconnu : {sort}")
+
+    query = (
+        db.query(Contrat)
+        .join(Contrat.client)
+        .outerjoin(Client.commercial)
+        .options(
+            contains_eager(Contrat.client).contains_eager(Client.commercial)
+        )
+    )
+    if statut is not None:
+        query = query.filter(Contrat.statut == statut)
+    if unpaid:
+        query = query.filter(Contrat.montant_restant > 0)
+    if commercial_id is not None:
+        query = query.filter(Client.id_commercial == commercial_id)
+    return query.order_by(*CONTRAT_SORTS[sort])
+
+
 def update_contrat(db: Session, contrat_id: int, **updates):
     """Mettre à jour un contrat sans modifier un contrat signé."""
     contrat = db.query(Contrat).filter(Contrat.id == contrat_id).first()
@@ -41,8 +88,10 @@ def update_contrat(db: Session, contrat_id: int, **updates):
                 "Impossible de modifier le montant d'un contrat signé."
             )
 
+        before = revenue_snapshot(db, contrat)
         for key, value in updates.items():
             setattr(contrat, key, value)
+        apply_revenue_change(db, before, revenue_snapshot(db, contrat))
         db.commit()
         db.refresh(contrat)
     return contrat
@@ -52,6 +101,7 @@ def delete_contrat(db: Session, contrat_id: int):
     """Supprimer un contrat."""
     contrat = db.query(Contrat).filter(Contrat.id == contrat_id).first()
     if contrat:
+        apply_revenue_change(db, revenue_snapshot(db, contrat), None)
         db.delete(contrat)
         db.commit()
     return contrat
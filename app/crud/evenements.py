@@ -1,6 +1,27 @@
-from sqlalchemy.orm import Session
+import datetime
+from sqlalchemy import bindparam, select, update
+from sqlalchemy.orm import Session, joinedload
 from app.db.models.evenement import Evenement
 from app.db.models.contrat import Contrat
+from app.db.models.client import Client
+
+# Profils de chargement nommés : relations chargées dans la même requête
+# que les événements, pour éviter un SELECT par ligne à l'affichage.
+LOADER_PROFILES = {
+    "list": (
+        joinedload(Evenement.contrat).joinedload(Contrat.client),
+        joinedload(Evenement.support),
+    ),
+}
+
+
+def apply_profile(query, profile: str = None):
+    """Applique un profil de chargement nommé à une requête d'événements."""
+    if profile is None:
+        return query
+    if profile not in LOADER_PROFILES:
+        raise ValueError(f"Profil de chargement inconnu : {profile}")
+    return query.options(*LOADER_PROFILES[profile])
 
 
 def create_evenement(
@@ -48,14 +69,85 @@ def get_evenement_for_support(db: Session, evenement_id: int, support_id: int):
             ).first()
 
 
-def get_evenements_by_support(db: Session, support_id: int):
+def query_evenements(
+    db: Session,
+    support_id: int = None,
+    unassigned: bool = False,
+    profile: str = None,
+    date_from=None,
+    date_to=None,
+    lieu: str = None,
+    client_id: int = None,
+    min_participants: int = None
+):
+    """
+    Construit la requête des événements selon le support attribué et les
+    filtres optionnels, tous appliqués en SQL :
+
+    - `date_from` / `date_to` : date de début comprise entre ces bornes
+      (incluses), via l'index ix_evenements_date_debut ;
+    - `lieu` : lieu contenant ce texte (sans tenir compte de la casse) ;
+    - `client_id` : événements des contrats de ce client ;
+    - `min_participants` : au moins ce nombre de participants.
+    """
+    query = db.query(Evenement)
+    if support_id is not None:
+        query = query.filter(Evenement.id_support == support_id)
+    if unassigned:
+        query = query.filter(Evenement.id_support.is_(None))
+    if date_from is not None:
+        query = query.filter(Evenement.date_debut >= date_from)
+    if date_to is not None:
+        query = query.filter(Evenement.date_debut <= date_to)
+    if lieu:
+        query = query.filter(Evenement.lieu.ilike(f"%{lieu}%"))
+    if client_id is not None:
+        query = query.filter(Evenement.id_contrat.in_(
+            select(Contrat.id).where(Contrat.id_client == client_id)
+        ))
+    if min_participants is not None:
+        query = query.filter(
+            Evenement.nombre_participants >= min_participants
+        )
+    return apply_profile(query, profile)
+
+
+def get_evenements_by_support(
+    db: Session, support_id: int, profile: str = None
+):
     """Filtrer les événements attribués au support."""
-    return db.query(Evenement).filter(Evenement.id_support == support_id).all()
+    return query_evenements(db, support_id=support_id, profile=profile).all()
+
+
+def get_evenements_without_support(db: Session, profile: str = None):
+    """Récupérer les événements sans support attribué."""
+    return query_evenements(db, unassigned=True, profile=profile).all()
 
 
-def get_all_evenements(db: Session):
+def get_all_evenements(db: Session, profile: str = None):
     """Récupérer tous les événements."""
-    return db.query(Evenement).all()
+    return query_evenements(db, profile=profile).all()
+
+
+def get_calendar(db: Session, date_debut, date_fin, support_id: int = None):
+    """
+    Événements (id, dates, lieu, support, client) qui commencent entre
+    `date_debut` et `date_fin`, par date de début : une seule requête sur
+    l'index de date de début, sans charger les objets.
+    """
+    query = (
+        select(Evenement.id, Evenement.date_debut, Evenement.date_fin,
+               Evenement.lieu, Evenement.id_support,
+               Client.nom_complet.label("client"))
+        .outerjoin(Contrat, Evenement.id_contrat == Contrat.id)
+        .outerjoin(Client, Contrat.id_client == Client.id)
+        .where(Evenement.date_debut >= date_debut,
+               Evenement.date_debut <= date_fin)
+        .order_by(Evenement.date_debut, Evenement.id)
+    )
+    if support_id is not None:
+        query = query.where(Evenement.id_support == support_id)
+    return db.execute(query).all()
 
 
 def update_evenement(db: Session, evenement_id: int, **updates):
@@ -69,3 +161,91 @@ def update_evenement(db: Session, evenement_id: int, **updates):
         db.commit()
         db.refresh(evenement)
     return evenement
+
+
+def get_unassigned_schedule(db: Session):
+    """Événements sans support (id, dates, lieu), par date de début."""
+    return db.execute(
+        select(Evenement.id, Evenement.date_debut, Evenement.date_fin,
+               Evenement.lieu)
+        .where(Evenement.id_support.is_(None))
+        .order_by(Evenement.date_debut, Evenement.id)
+    ).all()
+
+
+def get_support_schedule(db: Session, support_ids, date_debut, date_fin):
+    """
+    Événements (support, id, dates) des supports `support_ids` qui
+    touchent la période [date_debut, date_fin].
+    """
+    return db.execute(
+        select(Evenement.id_support, Evenement.id, Evenement.date_debut,
+               Evenement.date_fin)
+        .where(Evenement.id_support.in_(support_ids),
+               Evenement.date_debut <= date_fin,
+               Evenement.date_fin >= date_debut)
+    ).all()
+
+
+def bulk_assign_supports(db: Session, assignments) -> int:
+    """
+    Attribue les supports en une instruction (executemany), sans valider.
+    `assignments` contient des couples (id événement, id support) ; un
+    événement attribué entre-temps n'est pas modifié. Retourne le nombre
+    d'événements attribués.
+    """
+    if not assignments:
+        return 0
+    table = Evenement.__table__
+    result = db.execute(
+        update(table)
+        .where(table.c.id == bindparam("evenement_id"),
+               table.c.id_support.is_(None))
+        .values(id_support=bindparam("support_id")),
+        [{"evenement_id": evenement_id, "support_id": support_id}
+         for evenement_id, support_id in assignments]
+    )
+    return result.rowcount
+
+
+def get_overlapping_evenement(
+    db: Session, support_id: int, date_debut, date_fin, exclude_id=None
+):
+    """
+    Un événement (id, dates) du support qui chevauche [date_debut,
+    date_fin], ou None : recherche par plage sur l'index
+    ix_evenements_support_dates, arrêtée au premier trouvé (le plus
+    récent d'abord), y compris si le planning contient déjà des
+    chevauchements.
+    """
+    if isinstance(date_debut, datetime.datetime):
+        date_debut = date_debut.date()
+    if isinstance(date_fin, datetime.datetime):
+        date_fin = date_fin.date()
+    query = (
+        select(Evenement.id, Evenement.date_debut, Evenement.date_fin)
+        .where(Evenement.id_support == support_id,
+               Evenement.date_debut <= date_fin,
+               Evenement.date_fin >= date_debut)
+        .order_by(Evenement.date_debut.desc())
+        .limit(1)
+    )
+    if exclude_id is not None:
+        query = query.where(Evenement.id != exclude_id)
+    return db.execute(query).first()
+
+
+def get_assigned_schedule(db: Session, support_id: int = None):
+    """
+    Événements attribués (support, id, dates, lieu), par support puis
+    date de début, éventuellement d'un seul support.
+    """
+    query = (
+        select(Evenement.id_support, Evenement.id, Evenement.date_debut,
+               Evenement.date_fin, Evenement.lieu)
+        .where(Evenement.id_support.is_not(None))
+        .order_by(Evenement.id_support, Evenement.date_debut, Evenement.id)
+    )
+    if support_id is not None:
+        query = query.where(Evenement.id_support == support_id)
+    return db.execute(query).all()
@@ -0,0 +1,73 @@
+from sqlalchemy import select
+from sqlalchemy.orm import aliased
+from app.db.models import Client, Collaborateur, Contrat, Evenement
+
+# Requêtes d'export : une ligne plate par enregistrement, jointures
+# comprises, sans construire d'objets ORM.
+
+
+def export_clients_query(commercial_id: int = None):
+    """Clients avec le nom de leur commercial."""
+    commercial = aliased(Collaborateur)
+    query = (
+        select(
+            Client.id, Client.nom_complet, Client.email, Client.telephone,
+            Client.nom_entreprise, Client.date_creation,
+            Client.date_derniere_mise_a_jour,
+            Client.id_commercial,
+            commercial.nom.label("commercial_nom"),
+            commercial.prenom.label("commercial_prenom"),
+        )
+        .outerjoin(commercial, Client.id_commercial == commercial.id)
+        .order_by(Client.id)
+    )
+    if commercial_id is not None:
+        query = query.where(Client.id_commercial == commercial_id)
+    return query
+
+
+def export_contrats_query(commercial_id: int = None):
+    """Contrats avec leur client et le commercial du client."""
+    commercial = aliased(Collaborateur)
+    query = (
+        select(
+            Contrat.id, Contrat.id_client,
+            Client.nom_complet.label("client_nom"),
+            Client.id_commercial,
+            commercial.nom.label("commercial_nom"),
+            commercial.prenom.label("commercial_prenom"),
+            Contrat.montant_total, Contrat.montant_restant, Contrat.statut,
+            Contrat.date_creation,
+        )
+        .join(Client, Contrat.id_client == Client.id)
+        .outerjoin(commercial, Client.id_commercial == commercial.id)
+        .order_by(Contrat.id)
+    )
+    if commercial_id is not None:
+        query = query.where(Client.id_commercial == commercial_id)
+    return query
+
+
+def export_evenements_query(support_id: int = None):
+    """Événements avec leur contrat, leur client et leur support."""
+    support = aliased(Collaborateur)
+    query = (
+        select(
+            Evenement.id, Evenement.id_contrat,
+            Client.nom_complet.label("client_nom"),
+            Client.email.label("client_email"),
+            Client.telephone.label("client_telephone"),
+            Evenement.date_debut, Evenement.date_fin,
+            Evenement.id_support,
+            support.nom.label("support_nom"),
+            support.prenom.label("support_prenom"),
+            Evenement.lieu, Evenement.nombre_participants, Evenement.notes,
+        )
+        .join(Contrat, Evenement.id_contrat == Contrat.id)
+        .join(Client, Contrat.id_client == Client.id)
+        .outerjoin(support, Evenement.id_support == support.id)
+        .order_by(Evenement.id)
+    )
+    if support_id is not None:
+        query = query.where(Evenement.id_support == support_id)
+    return query
@@ -0,0 +1,28 @@
+from sqlalchemy.exc import SQLAlchemyError
+
+
+def insert_import_rows(db, bulk_insert, rows, report):
+    """
+    Insère un lot de lignes (numéro, valeurs) d'un import avec
+    `bulk_insert` en une instruction, puis valide. Si le lot est refusé
+    (par exemple un doublon inséré entre-temps), les lignes sont
+    réinsérées une à une pour n'écarter que celles en erreur.
+    """
+    try:
+        bulk_insert(db, [values for _, values in rows])
+        db.commit()
+        report.inserted += len(rows)
+        return
+    except SQLAlchemyError:
+        db.rollback()
+
+    for lineno, values in rows:
+        try:
+            with db.begin_nested():
+                bulk_insert(db, [values])
+            report.inserted += 1
+        except SQLAlchemyError as e:
+            report.errors.append(
+                (lineno, f"Insertion impossible : {getattr(e, 'orig', e)}")
+            )
+    db.commit()
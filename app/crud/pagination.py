@@ -0,0 +1,33 @@
+from sqlalchemy.orm import Query
+
+# Taille des lots lus depuis le curseur serveur en mode streaming
+STREAM_BATCH_SIZE = 1000
+
+
+def paginate(
+    query: Query,
+    key_column,
+    after_id: int = None,
+    page_size: int = None,
+    stream: bool = False
+):
+    """
+    Exécute une requête de liste avec pagination par clé (keyset).
+
+    - `after_id` : ne retourne que les lignes dont la clé est supérieure ;
+    - `page_size` : nombre maximum de lignes retournées ;
+    - `stream` : retourne un itérateur lisant les lignes par lots
+      (`yield_per`) au lieu d'une liste complète en mémoire.
+
+    Dès qu'une page est demandée, les lignes sont triées par clé pour que
+    `after_id` désigne une position stable.
+    """
+    if after_id is not None or page_size:
+        query = query.order_by(None).order_by(key_column)
+    if after_id is not None:
+        query = query.filter(key_column > after_id)
+    if page_size:
+        query = query.limit(page_size)
+    if stream:
+        return iter(query.yield_per(STREAM_BATCH_SIZE))
+    return query.all()
@@ -0,0 +1,264 @@
+from sqlalchemy import case, delete, extract, func, insert, select
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+from app.core.config import settings
+from app.db.models.client import Client
+from app.db.models.collaborateur import Collaborateur
+from app.db.models.contrat import Contrat
+from app.db.models.revenu import SANS_VALEUR, RevenuMensuel
+
+# Agrégats du rapport de chiffre d'affaires, dans l'ordre d'affichage
+MEASURES = (
+    "nb_contrats", "nb_signes", "montant_total", "montant_signe",
+    "montant_restant",
+)
+
+summary_table = RevenuMensuel.__table__
+
+
+def contrat_keys():
+    """Clé (commercial, année, mois) d'un contrat, sans valeur NULL."""
+    return {
+        "id_commercial": func.coalesce(Client.id_commercial, SANS_VALEUR),
+        "annee": func.coalesce(
+            extract("year", Contrat.date_creation), SANS_VALEUR
+        ),
+        "mois": func.coalesce(
+            extract("month", Contrat.date_creation), SANS_VALEUR
+        ),
+    }
+
+
+def contrat_measures():
+    """Agrégats calculés sur la table des contrats."""
+    signe = Contrat.statut.is_(True)
+    return {
+        "nb_contrats": func.count(Contrat.id),
+        "nb_signes": func.coalesce(func.sum(case((signe, 1), else_=0)), 0),
+        "montant_total": func.coalesce(func.sum(Contrat.montant_total), 0),
+        "montant_signe": func.coalesce(
+            func.sum(case((signe, Contrat.montant_total), else_=0)), 0
+        ),
+        "montant_restant": func.coalesce(
+            func.sum(Contrat.montant_restant), 0
+        ),
+    }
+
+
+def revenue_query(keys, summary: bool):
+    """
+    GROUP BY sur `keys` : sur la table des contrats (jointe aux clients
+    pour le commercial), ou sur la table de synthèse si `summary`.
+    """
+    if summary:
+        columns = [summary_table.c[key] for key in keys]
+        return (
+            select(*columns, *(
+                func.sum(summary_table.c[name]).label(name)
+                for name in MEASURES
+            ))
+            .group_by(*columns)
+        )
+
+    expressions = contrat_keys()
+    columns = [expressions[key] for key in keys]
+    return (
+        select(
+            *(column.label(key) for key, column in zip(keys, columns)),
+            *(measure.label(name)
+              for name, measure in contrat_measures().items())
+        )
+        .select_from(Contrat)
+        .outerjoin(Client, Contrat.id_client == Client.id)
+        .group_by(*columns)
+    )
+
+
+def revenue_by_commercial(db: Session, summary: bool = False):
+    """Totaux par commercial, le plus gros reste à encaisser d'abord."""
+    totals = revenue_query(["id_commercial"], summary).subquery()
+    return db.execute(
+        select(totals, Collaborateur.nom, Collaborateur.prenom)
+        .outerjoin(Collaborateur, Collaborateur.id == totals.c.id_commercial)
+        .order_by(totals.c.montant_restant.desc(), totals.c.id_commercial)
+    ).all()
+
+
+def revenue_by_month(db: Session, summary: bool = False):
+    """Totaux par mois de création des contrats, du plus ancien."""
+    totals = revenue_query(["annee", "mois"], summary).subquery()
+    return db.execute(
+        select(totals).order_by(totals.c.annee, totals.c.mois)
+    ).all()
+
+
+def rebuild_revenue_summary(db: Session) -> int:
+    """
+    Recalcule entièrement la table de synthèse (après son activation ou
+    des écritures faites hors de l'application).
+    Retourne le nombre de lignes de synthèse.
+    """
+    keys = ["id_commercial", "annee", "mois"]
+    db.execute(delete(summary_table))
+    result = db.execute(insert(summary_table).from_select(
+        keys + list(MEASURES), revenue_query(keys, summary=False)
+    ))
+    db.commit()
+    return result.rowcount
+
+
+def contrat_snapshot(id_commercial, date, statut, montant_total,
+                     montant_restant):
+    """Clé et montants d'un contrat pour la table de synthèse."""
+    key = (
+        id_commercial or SANS_VALEUR,
+        date.year if date else SANS_VALEUR,
+        date.month if date else SANS_VALEUR,
+    )
+    signe = bool(statut)
+    return key, {
+        "nb_contrats": 1,
+        "nb_signes": int(signe),
+        "montant_total": montant_total,
+        "montant_signe": montant_total if signe else 0.0,
+        "montant_restant": montant_restant,
+    }
+
+
+def revenue_snapshot(db: Session, contrat: Contrat):
+    """
+    Clé et montants d'un contrat pour la table de synthèse, ou None si
+    elle est désactivée (REVENUE_SUMMARY).
+    """
+    if not settings.REVENUE_SUMMARY:
+        return None
+
+    id_commercial = db.scalar(
+        select(Client.id_commercial).where(Client.id == contrat.id_client)
+    )
+    return contrat_snapshot(
+        id_commercial, contrat.date_creation, contrat.statut,
+        contrat.montant_total, contrat.montant_restant
+    )
+
+
+def revenue_deltas(changes) -> dict:
+    """
+    Cumule par clé des couples (instantané, signe) : +1 pour des montants
+    ajoutés à la synthèse, -1 pour des montants retirés.
+    """
+    deltas = {}
+    for snapshot, sign in changes:
+        if snapshot is None:
+            continue
+        key, measures = snapshot
+        delta = deltas.setdefault(key, dict.fromkeys(MEASURES, 0))
+        for name, value in measures.items():
+            delta[name] += sign * value
+    return deltas
+
+
+def upsert_summary(db: Session, values: dict):
+    """
+    Ajoute `values` (clé et écarts) à la ligne de synthèse de sa clé, ou
+    la crée, en une instruction native du dialecte : deux écritures
+    concurrentes sur une même clé ne peuvent pas créer deux lignes.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect in ("mysql", "mariadb"):
+        statement = mysql.insert(summary_table).values(values)
+        return db.execute(statement.on_duplicate_key_update({
+            name: summary_table.c[name] + statement.inserted[name]
+            for name in MEASURES
+        }))
+
+    module = postgresql if dialect == "postgresql" else sqlite
+    statement = module.insert(summary_table).values(values)
+    return db.execute(statement.on_conflict_do_update(
+        index_elements=[column.name for column in summary_table.primary_key],
+        set_={name: summary_table.c[name] + statement.excluded[name]
+              for name in MEASURES}
+    ))
+
+
+def apply_revenue_deltas(db: Session, deltas: dict):
+    """
+    Reporte des écarts par clé (voir `revenue_deltas`) dans la table de
+    synthèse, dans la transaction en cours.
+    """
+    for (id_commercial, annee, mois), delta in deltas.items():
+        if not any(delta.values()):
+            continue
+        upsert_summary(db, {
+            "id_commercial": id_commercial, "annee": annee, "mois": mois,
+            **delta
+        })
+        if delta["nb_contrats"] < 0:
+            # Plus aucun contrat pour cette clé : la ligne disparaît
+            db.execute(delete(summary_table).where(
+                summary_table.c.id_commercial == id_commercial,
+                summary_table.c.annee == annee,
+                summary_table.c.mois == mois,
+                summary_table.c.nb_contrats == 0
+            ))
+
+
+def apply_revenue_change(db: Session, before, after):
+    """
+    Reporte dans la table de synthèse le passage d'un contrat de l'état
+    `before` à l'état `after` (instantanés de `revenue_snapshot`, None
+    pour une création ou une suppression), dans la transaction en cours.
+    """
+    apply_revenue_deltas(db, revenue_deltas(((before, -1), (after, 1))))
+
+
+def add_revenue_rows(db: Session, contrats, commerciaux: dict):
+    """
+    Ajoute à la table de synthèse des contrats insérés en masse (lignes
+    de la table `contrats`) ; `commerciaux` associe l'ID d'un client à
+    celui de son commercial. Sans effet si REVENUE_SUMMARY est désactivé.
+    """
+    if not settings.REVENUE_SUMMARY:
+        return
+    apply_revenue_deltas(db, revenue_deltas(
+        (contrat_snapshot(
+            commerciaux.get(row["id_client"]), row.get("date_creation"),
+            row["statut"], row["montant_total"], row["montant_restant"]
+        ), 1)
+        for row in contrats
+    ))
+
+
+def reassign_revenue(db: Session, old_commercial, new_commercial,
+                     client_id: int = None):
+    """
+    Transfère dans la table de synthèse les contrats des clients de
+    `old_commercial` (du seul client `client_id` s'il est donné) vers
+    `new_commercial` (None : sans commercial). À appeler avant le
+    changement, dans la même transaction.
+    """
+    if not settings.REVENUE_SUMMARY or old_commercial == new_commercial:
+        return
+
+    keys = contrat_keys()
+    query = (
+        select(keys["annee"].label("annee"), keys["mois"].label("mois"),
+               *(measure.label(name)
+                 for name, measure in contrat_measures().items()))
+        .select_from(Contrat)
+        .join(Client, Contrat.id_client == Client.id)
+        .where(Client.id_commercial == old_commercial
+               if old_commercial is not None
+               else Client.id_commercial.is_(None))
+        .group_by(keys["annee"], keys["mois"])
+    )
+    if client_id is not None:
+        query = query.where(Client.id == client_id)
+
+    changes = []
+    for row in db.execute(query):
+        measures = {name: row._mapping[name] for name in MEASURES}
+        for commercial, sign in ((old_commercial, -1), (new_commercial, 1)):
+            key = (commercial or SANS_VALEUR, row.annee, row.mois)
+            changes.append(((key, measures), sign))
+    apply_revenue_deltas(db, revenue_deltas(changes))
@@ -2,3 +2,4 @@ from app.db.models.client import Client # noqa
 from app.db.models.collaborateur import Collaborateur # noqa
 from app.db.models.contrat import Contrat # noqa
 from app.db.models.evenement import Evenement # noqa
+from app.db.models.revenu import RevenuMensuel # noqa
@@ -1,12 +1,47 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime
+from sqlalchemy import (
+    DDL, Column, Integer, String, ForeignKey, DateTime, Index, event
+)
 from sqlalchemy.orm import relationship, validates
 from datetime import datetime, timezone
 from app.db.base import Base
 import re
 
+# Colonnes couvertes par la recherche plein texte (`clients search`)
+SEARCH_COLUMNS = ("nom_complet", "email", "nom_entreprise", "telephone")
+
+# SQLite : table FTS5 adossée à `clients` (contenu externe), tenue à jour
+# par des triggers. Les accents sont ignorés à l'indexation.
+CLIENTS_FTS_DDL = (
+    "CREATE VIRTUAL TABLE clients_fts USING fts5("
+    "nom_complet, email, nom_entreprise, telephone, "
+    "content='clients', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER clients_fts_insert AFTER INSERT ON clients BEGIN "
+    "INSERT INTO clients_fts(rowid, nom_complet, email, nom_entreprise, "
+    "telephone) VALUES (new.id, new.nom_complet, new.email, "
+    "new.nom_entreprise, new.telephone); END",
+    "CREATE TRIGGER clients_fts_delete AFTER DELETE ON clients BEGIN "
+    "INSERT INTO clients_fts(clients_fts, rowid, nom_complet, email, "
+    "nom_entreprise, telephone) VALUES ('delete', old.id, old.nom_complet, "
+    "old.email, old.nom_entreprise, old.telephone); END",
+    "CREATE TRIGGER clients_fts_update AFTER UPDATE ON clients BEGIN "
+    "INSERT INTO clients_fts(clients_fts, rowid, nom_complet, email, "
+    "nom_entreprise, telephone) VALUES ('delete', old.id, old.nom_complet, "
+    "old.email, old.nom_entreprise, old.telephone); "
+    "INSERT INTO clients_fts(rowid, nom_complet, email, nom_entreprise, "
+    "telephone) VALUES (new.id, new.nom_complet, new.email, "
+    "new.nom_entreprise, new.telephone); END",
+)
+
 
 class Client(Base):
     __tablename__ = 'clients'
+    __table_args__ = (
+        # Recherche plein texte MySQL ; SQLite utilise la table clients_fts
+        Index(
+            "ix_clients_recherche", *SEARCH_COLUMNS, mysql_prefix="FULLTEXT"
+        ).ddl_if(dialect="mysql"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     nom_complet = Column(String(100), nullable=False)
@@ -19,7 +54,9 @@ class Client(Base):
     date_derniere_mise_a_jour = Column(
         DateTime, default=datetime.now, onupdate=datetime.now
     )
-    id_commercial = Column(Integer, ForeignKey('collaborateurs.id'))
+    id_commercial = Column(
+        Integer, ForeignKey('collaborateurs.id'), index=True
+    )
     commercial = relationship("Collaborateur", back_populates="clients")
     contrats = relationship("Contrat", back_populates="client")
 
@@ -34,3 +71,14 @@ class Client(Base):
         if not value.strip():
             raise ValueError("Le nom complet ne peut pas être vide.")
         return value
+
+
+for statement in CLIENTS_FTS_DDL:
+    event.listen(
+        Client.__table__, "after_create",
+        DDL(statement).execute_if(dialect="sqlite")
+    )
+event.listen(
+    Client.__table__, "before_drop",
+    DDL("DROP TABLE IF EXISTS clients_fts").execute_if(dialect="sqlite")
+)
@@ -2,12 +2,11 @@ from sqlalchemy import Column, Integer, String, ForeignKey
 from sqlalchemy.orm import validates
 from sqlalchemy.orm import relationship
 from sqlalchemy.orm import Session
-from argon2 import PasswordHasher, exceptions
+from argon2 import exceptions
 import re
+from app.auth.hashing import hash_password, ph, schedule_rehash
 from app.db.base import Base
 
-ph = PasswordHasher()
-
 
 class Departement(Base):
     __tablename__ = "departements"
@@ -57,19 +56,18 @@ class Collaborateur(Base):
     @staticmethod
     def set_password(password: str) -> str:
         """Hache un mot de passe avec Argon2."""
-        return ph.hash(password)
+        return hash_password(password)
 
     def verify_password(self, password: str, db: Session = None) -> bool:
         """
-        Vérifie si un mot de passe correspond au hash et rehash si nécessaire.
+        Vérifie si un mot de passe correspond au hash. La mise à niveau d'un
+        hash aux anciens paramètres est signalée au bloc `deferred_rehashes`
+        puis appliquée hors de la commande (voir app.auth.rehash).
         """
         try:
             ph.verify(self.password_hash, password)
-            if ph.check_needs_rehash(self.password_hash):
-                self.password_hash = ph.hash(password)
-                if db:
-                    db.commit()
-                print("Password hash upgraded for better security.")
-            return True
         except exceptions.VerifyMismatchError:
             return False
+        if ph.check_needs_rehash(self.password_hash):
+            schedule_rehash(self.id, self.password_hash, password)
+        return True
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, Float, Boolean, ForeignKey, DateTime
+from sqlalchemy import (
+    Column, Integer, Float, Boolean, ForeignKey, DateTime, Index
+)
 from sqlalchemy.orm import relationship, validates
 from datetime import datetime
 from app.db.base import Base
@@ -6,6 +8,11 @@ from app.db.base import Base
 
 class Contrat(Base):
     __tablename__ = 'contrats'
+    __table_args__ = (
+        # Contrats d'un client, éventuellement filtrés par statut
+        Index("ix_contrats_id_client_statut", "id_client", "statut"),
+        Index("ix_contrats_statut", "statut"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     id_client = Column(Integer, ForeignKey('clients.id'))
@@ -1,15 +1,34 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, Date
+from sqlalchemy import (
+    Column, Integer, String, ForeignKey, Text, Date, Index, text
+)
 from sqlalchemy.orm import relationship, validates
 from app.db.base import Base
 
 
 class Evenement(Base):
     __tablename__ = 'evenements'
+    __table_args__ = (
+        # Index partiel des événements sans support (SQLite, PostgreSQL) ;
+        # MySQL ne gère pas les index partiels et utilise ix_id_support.
+        Index(
+            "ix_evenements_sans_support", "date_debut",
+            sqlite_where=text("id_support IS NULL"),
+            postgresql_where=text("id_support IS NULL")
+        ).ddl_if(dialect=("sqlite", "postgresql")),
+        # Planning des supports (chevauchements de dates) : sans les
+        # événements non attribués, partiel là où c'est possible.
+        Index(
+            "ix_evenements_support_dates", "id_support", "date_debut",
+            "date_fin",
+            sqlite_where=text("id_support IS NOT NULL"),
+            postgresql_where=text("id_support IS NOT NULL")
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
-    id_contrat = Column(Integer, ForeignKey('contrats.id'))
-    id_support = Column(Integer, ForeignKey('collaborateurs.id'))
-    date_debut = Column(Date, nullable=False)
+    id_contrat = Column(Integer, ForeignKey('contrats.id'), index=True)
+    id_support = Column(Integer, ForeignKey('collaborateurs.id'), index=True)
+    date_debut = Column(Date, nullable=False, index=True)
     date_fin = Column(Date, nullable=False)
     lieu = Column(String(255), nullable=False)
     nombre_participants = Column(Integer, nullable=False)
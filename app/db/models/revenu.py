@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Float, Integer
+from app.db.base import Base
+
+# Clé des contrats dont le client n'a pas de commercial, ou sans date
+SANS_VALEUR = 0
+
+
+class RevenuMensuel(Base):
+    """
+    Totaux des contrats par commercial et par mois de création, tenus à
+    jour à chaque écriture de contrat ou changement de commercial lorsque
+    REVENUE_SUMMARY est actif (voir app.crud.reports). La clé n'a pas de
+    valeur NULL : SANS_VALEUR remplace un commercial ou une date absents.
+    """
+    __tablename__ = "revenus_mensuels"
+
+    id_commercial = Column(Integer, primary_key=True, autoincrement=False)
+    annee = Column(Integer, primary_key=True, autoincrement=False)
+    mois = Column(Integer, primary_key=True, autoincrement=False)
+    nb_contrats = Column(Integer, nullable=False, default=0)
+    nb_signes = Column(Integer, nullable=False, default=0)
+    montant_total = Column(Float, nullable=False, default=0.0)
+    montant_signe = Column(Float, nullable=False, default=0.0)
+    montant_restant = Column(Float, nullable=False, default=0.0)
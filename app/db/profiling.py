@@ -0,0 +1,161 @@
+import logging
+import os
+import sys
+import time
+import traceback
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Ce module n'importe pas SQLAlchemy : il est chargé au démarrage de la
+# CLI, les écouteurs ne sont posés qu'à la création du moteur.
+
+logger = logging.getLogger("app.db.profiling")
+
+# Nombre de requêtes détaillées dans le résumé d'une commande
+SUMMARY_ROWS = 10
+
+_enabled = os.environ.get("EPICEVENTS_PROFILE", "").lower() in (
+    "1", "true", "yes"
+)
+_current_profile: ContextVar = ContextVar("query_profile", default=None)
+
+
+class QueryProfile:
+    """Requêtes SQL émises pendant une commande, regroupées par texte."""
+    def __init__(self, name: str):
+        self.name = name
+        # texte SQL -> [nombre, durée totale, durée maximale]
+        self.statements = {}
+
+    def record(self, statement: str, duration: float):
+        stats = self.statements.setdefault(statement, [0, 0.0, 0.0])
+        stats[0] += 1
+        stats[1] += duration
+        stats[2] = max(stats[2], duration)
+
+    @property
+    def count(self) -> int:
+        return sum(stats[0] for stats in self.statements.values())
+
+    @property
+    def total(self) -> float:
+        return sum(stats[1] for stats in self.statements.values())
+
+    def top(self, limit: int = SUMMARY_ROWS):
+        """Requêtes les plus répétées, puis les plus longues."""
+        return sorted(
+            self.statements.items(),
+            key=lambda item: (item[1][0], item[1][1]), reverse=True
+        )[:limit]
+
+
+def profiling_enabled() -> bool:
+    return _enabled
+
+
+def enable_profiling():
+    """
+    Active le comptage des requêtes (option `--profile`), y compris sur
+    un moteur déjà créé.
+    """
+    global _enabled
+    _enabled = True
+    session = sys.modules.get("app.db.session")
+    if session is not None:
+        install(session.engine)
+
+
+def slow_query_threshold() -> float:
+    """Seuil (secondes) au-delà duquel une requête est journalisée."""
+    from app.core.config import settings
+
+    return settings.SLOW_QUERY_MS / 1000
+
+
+def call_site() -> str:
+    """Premier appelant dans le code de l'application, hors couche DB."""
+    for frame in reversed(traceback.extract_stack()):
+        path = frame.filename.replace(os.sep, "/")
+        if "/app/" in path and "/app/db/" not in path:
+            return f"{path[path.rindex('/app/') + 1:]}:{frame.lineno} " \
+                   f"({frame.name})"
+    return "inconnu"
+
+
+def install(engine):
+    """Pose les écouteurs de mesure sur le moteur (une seule fois)."""
+    from sqlalchemy import event
+
+    if event.contains(engine, "before_cursor_execute", before_execute):
+        return
+    event.listen(engine, "before_cursor_execute", before_execute)
+    event.listen(engine, "after_cursor_execute", after_execute)
+
+
+def before_execute(conn, cursor, statement, parameters, context,
+                   executemany):
+    conn.info.setdefault("query_start", []).append(time.perf_counter())
+
+
+def after_execute(conn, cursor, statement, parameters, context,
+                  executemany):
+    duration = time.perf_counter() - conn.info["query_start"].pop()
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.record(statement, duration)
+    if duration >= slow_query_threshold():
+        logger.warning(
+            "Requête lente (%.1f ms) depuis %s :\n%s\nParamètres : %r",
+            duration * 1000, call_site(), statement, parameters
+        )
+
+
+@contextmanager
+def command_profile(name: str):
+    """
+    Compte les requêtes d'une commande et affiche un résumé en sortie,
+    si le profilage est actif. Les blocs imbriqués comptent dans le bloc
+    englobant.
+    """
+    if not _enabled or _current_profile.get() is not None:
+        yield None
+        return
+
+    profile = QueryProfile(name)
+    reset_token = _current_profile.set(profile)
+    try:
+        yield profile
+    finally:
+        _current_profile.reset(reset_token)
+        print_summary(profile)
+
+
+def print_summary(profile: QueryProfile):
+    """Affiche le résumé des requêtes d'une commande sur stderr."""
+    from rich.console import Console
+    from rich.markup import escape
+    from rich.table import Table
+
+    console = Console(stderr=True)
+    console.print(
+        f"[bold cyan]⏱ {escape(profile.name)} : {profile.count} requête(s) "
+        f"SQL, {profile.total * 1000:.1f} ms[/bold cyan]"
+    )
+    if not profile.count:
+        return
+
+    table = Table(show_lines=False)
+    table.add_column("Nb", justify="right", style="cyan")
+    table.add_column("Total (ms)", justify="right")
+    table.add_column("Max (ms)", justify="right")
+    # Une ligne par requête, tronquée à la largeur restante
+    table.add_column("Requête", overflow="ellipsis", no_wrap=True,
+                     max_width=max(20, console.width - 40))
+    for statement, (count, total, longest) in profile.top():
+        # Une même requête répétée signale souvent un N+1
+        style = "bold red" if count > 1 else None
+        table.add_row(
+            str(count), f"{total * 1000:.1f}", f"{longest * 1000:.1f}",
+            escape(" ".join(statement.split())), style=style
+        )
+    console.print(table)
@@ -0,0 +1,69 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Ce module n'importe pas SQLAlchemy : la session (et le moteur) ne sont
+# chargés qu'à la première commande qui accède à la base.
+
+
+class _CommandSession:
+    """Session partagée par une commande, ouverte à la première demande."""
+    def __init__(self, factory=None):
+        self.factory = factory
+        self.db = None
+
+    def open(self):
+        if self.factory is None:
+            from app.db import session
+
+            return session.SessionLocal()
+        return self.factory()
+
+
+_current_command: ContextVar = ContextVar("command_session", default=None)
+
+
+@contextmanager
+def command_session_scope(factory=None):
+    """
+    Délimite une commande : tous les `session_scope()` du bloc partagent
+    une même session, fermée (et sa connexion rendue au pool) en sortie.
+
+    `factory` remplace `SessionLocal` pour ouvrir cette session (par
+    exemple pour la lier à une transaction englobante).
+    """
+    if _current_command.get() is not None:
+        yield
+        return
+
+    command = _CommandSession(factory)
+    reset_token = _current_command.set(command)
+    try:
+        yield
+    finally:
+        _current_command.reset(reset_token)
+        if command.db is not None:
+            command.db.close()
+
+
+@contextmanager
+def session_scope():
+    """
+    Fournit la session de la commande en cours, ou une session dédiée
+    hors commande. Les modifications non validées sont annulées en cas
+    d'erreur.
+    """
+    command = _current_command.get()
+    if command is None:
+        from app.db import session
+
+        with session.SessionLocal() as db:
+            yield db
+        return
+
+    if command.db is None:
+        command.db = command.open()
+    try:
+        yield command.db
+    except Exception:
+        command.db.rollback()
+        raise
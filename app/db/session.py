@@ -1,11 +1,56 @@
 import logging
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db import profiling
+from app.utils import tracing
+from app.db.scope import command_session_scope, session_scope  # noqa: F401
 
 logging.basicConfig()
 logging.getLogger('sqlalchemy.engine').setLevel(logging.WARNING)
 
-engine = create_engine(settings.DATABASE_URL, echo=False)
+
+def engine_options(database_url: str) -> dict:
+    """Options du moteur, dont la configuration du pool de connexions."""
+    options = {
+        "echo": False,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+    # SQLite n'utilise pas de pool de taille fixe
+    if make_url(database_url).get_backend_name() != "sqlite":
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+        )
+    return options
+
+
+def enable_sqlite_savepoints(engine):
+    """
+    Laisse SQLAlchemy émettre lui-même BEGIN avec pysqlite, sans quoi les
+    savepoints (transaction englobante du mode batch `--atomic`) ne sont
+    pas fiables.
+    """
+    @event.listens_for(engine, "connect")
+    def disable_pysqlite_transactions(dbapi_connection, connection_record):
+        dbapi_connection.isolation_level = None
+
+    @event.listens_for(engine, "begin")
+    def emit_begin(connection):
+        connection.exec_driver_sql("BEGIN")
+
+
+engine = create_engine(
+    settings.DATABASE_URL, **engine_options(settings.DATABASE_URL)
+)
+if engine.dialect.name == "sqlite":
+    enable_sqlite_savepoints(engine)
+if profiling.profiling_enabled():
+    profiling.install(engine)
+if tracing.tracing_enabled():
+    tracing.install(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
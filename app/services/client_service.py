@@ -1,29 +1,42 @@
-from app.crud.clients import create_client, update_client, get_client
+import re
+from app.crud.clients import (
+    bulk_insert_clients, create_client, get_existing_emails, update_client,
+    get_client, query_clients, search_clients_query
+)
+from app.crud.imports import insert_import_rows
+from app.crud.pagination import paginate
 from app.auth.permissions import commercial_required, read_only_required
-from app.auth.jwt_utils import decode_token
+from app.utils.records import ImportReport, chunked
 from rich.console import Console
 from sqlalchemy.orm import joinedload
 from app.db.models.client import Client
 
 console = Console()
 
+# Nombre de résultats par page de `clients search`
+SEARCH_PAGE_SIZE = 20
 
-@read_only_required
-def list_all_clients(db, token, all_clients: bool = False):
-    """Récupérer les clients en fonction du rôle."""
-    payload = decode_token(token)
-    if not payload:
-        console.print(
-            "[bold red] Erreur : Token invalide ou expiré.[/bold red]"
-        )
-        return []
+# Nombre de lignes validées et insérées ensemble lors d'un import
+IMPORT_CHUNK_SIZE = 1000
 
-    user_id = payload.get("user_id")
-    role = payload.get("role")
+EMAIL_PATTERN = re.compile(r"[^@]+@[^@]+\.[^@]+")
+TELEPHONE_PATTERN = re.compile(r"0[1-9]\d{8}")
+
+
+@read_only_required
+def list_all_clients(db, auth, all_clients: bool = False, **page):
+    """
+    Récupérer les clients en fonction du rôle.
+    `page` accepte les options de `paginate` (after_id, page_size, stream).
+    """
+    user_id = auth.user_id
+    role = auth.role
 
     # Récupérer les clients selon le rôle
     if role == "commercial" and not all_clients:
-        return db.query(Client).filter(Client.id_commercial == user_id).all()
+        return paginate(
+            query_clients(db, commercial_id=user_id), Client.id, **page
+        )
 
     if role in ["gestion", "support"] and not all_clients:
         console.print(
@@ -32,7 +45,23 @@ def list_all_clients(db, token, all_clients: bool = False):
         )
         return []
 
-    return db.query(Client).all()
+    return paginate(query_clients(db), Client.id, **page)
+
+
+@read_only_required
+def search_clients(db, auth, term: str, page: int = 1,
+                   page_size: int = SEARCH_PAGE_SIZE):
+    """
+    Rechercher des clients (tous rôles), les plus pertinents d'abord.
+    Les résultats étant classés par pertinence, la pagination se fait par
+    numéro de page plutôt que par ID.
+    """
+    return (
+        search_clients_query(db, term)
+        .offset((page - 1) * page_size)
+        .limit(page_size)
+        .all()
+    )
 
 
 @read_only_required
@@ -80,12 +109,11 @@ def create_client_for_commercial(
 
 
 @commercial_required
-def update_client_by_commercial(db, token, client_id, **updates):
+def update_client_by_commercial(db, auth, client_id, **updates):
     """
     Mettre à jour un client (seulement si le commercial est propriétaire).
     """
-    payload = decode_token(token)
-    user_id = payload.get("user_id")
+    user_id = auth.user_id
 
     client = get_client(db, client_id)
     if not client:
@@ -97,3 +125,85 @@ def update_client_by_commercial(db, token, client_id, **updates):
         )
 
     return update_client(db, client_id, **updates)
+
+
+def clean_client_record(record):
+    """
+    Normalise un enregistrement d'import comme le fait `clients create`
+    et le valide. Lève ValueError si une valeur est invalide.
+    """
+    def text(key):
+        return str(record.get(key) or "").strip()
+
+    nom = text("nom_complet").lower().title()
+    email = text("email").lower()
+    telephone = text("telephone")
+    entreprise = text("nom_entreprise").title()
+
+    if not nom:
+        raise ValueError("Le nom complet ne peut pas être vide.")
+    if not EMAIL_PATTERN.match(email):
+        raise ValueError(f"Email invalide : {email}")
+    if telephone and not TELEPHONE_PATTERN.match(telephone):
+        raise ValueError(f"Numéro de téléphone invalide : {telephone}")
+    if max(len(nom), len(email), len(entreprise)) > 100:
+        raise ValueError("Valeur trop longue (100 caractères maximum).")
+
+    return {
+        "nom_complet": nom,
+        "email": email,
+        "telephone": telephone or None,
+        "nom_entreprise": entreprise or None,
+    }
+
+
+@commercial_required
+def import_clients(db, auth, records, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Importe des clients pour le commercial connecté.
+
+    `records` produit des couples (numéro de ligne, enregistrement), lus
+    au fil de l'eau. Chaque lot est validé, dédoublonné contre la base en
+    une requête puis inséré en une instruction ; une ligne invalide est
+    signalée dans le bilan sans interrompre l'import.
+    """
+    report = ImportReport()
+    seen = set()
+
+    for chunk in chunked(records, chunk_size):
+        rows = []
+        for lineno, record in chunk:
+            if isinstance(record, Exception):
+                report.errors.append((lineno, str(record)))
+                continue
+            try:
+                values = clean_client_record(record)
+            except ValueError as e:
+                report.errors.append((lineno, str(e)))
+                continue
+            if values["email"] in seen:
+                report.errors.append(
+                    (lineno, f"Email en double dans le fichier : "
+                             f"{values['email']}")
+                )
+                continue
+            seen.add(values["email"])
+            values["id_commercial"] = auth.user_id
+            rows.append((lineno, values))
+
+        existing = get_existing_emails(
+            db, [values["email"] for _, values in rows]
+        )
+        new_rows = []
+        for lineno, values in rows:
+            if values["email"] in existing:
+                report.errors.append(
+                    (lineno, f"Email déjà utilisé : {values['email']}")
+                )
+            else:
+                new_rows.append((lineno, values))
+
+        if new_rows:
+            insert_import_rows(db, bulk_insert_clients, new_rows, report)
+
+    return report
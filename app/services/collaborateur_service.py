@@ -1,42 +1,52 @@
+import re
 from app.crud.collaborateurs import (
+    bulk_insert_collaborateurs,
     create_collaborateur,
     update_collaborateur,
     delete_collaborateur,
-    get_all_collaborateurs,
-    get_collaborateur
+    get_collaborateur,
+    get_existing_logins_and_emails,
+    query_collaborateurs
 )
+from app.crud.imports import insert_import_rows
+from app.crud.pagination import paginate
 from app.db.models.collaborateur import Collaborateur
+from app.auth.hashing import hashing_pool
 from app.auth.permissions import gestion_required
-from app.db.models.collaborateur import Departement
+from app.services.reference_data import (
+    get_departements, invalidate_reference_data, list_staff
+)
+from app.utils.records import ImportReport, chunked
+
+# Nombre de collaborateurs hachés et insérés ensemble lors d'un import
+IMPORT_CHUNK_SIZE = 500
+
+EMAIL_PATTERN = re.compile(r"[^@]+@[^@]+\.[^@]+")
 
 
 @gestion_required
 def create_new_collaborateur(
-    db, token, nom, prenom, email, departement_id, login, password
+    db, auth, nom, prenom, email, departement_id, login, password
 ):
     """Créer un nouveau collaborateur (équipe gestion)."""
 
     # Vérifier si le département existe bien
-    departement = (
-        db.query(Departement)
-        .filter(Departement.id == departement_id)
-        .first()
-    )
-
-    if not departement:
+    if departement_id not in {dep.id for dep in get_departements(db)}:
         raise ValueError(
             f"❌ Erreur : Aucun département avec l'ID {departement_id}."
         )
 
-    return create_collaborateur(
-        db, nom, prenom, email, departement.id, login, password
+    collaborateur = create_collaborateur(
+        db, nom, prenom, email, departement_id, login, password
     )
+    invalidate_reference_data()
+    return collaborateur
 
 
 @gestion_required
-def all_collaborateurs(db):
-    """Récupérer tous les collaborateurs."""
-    return get_all_collaborateurs(db)
+def all_collaborateurs(db, **page):
+    """Récupérer tous les collaborateurs avec leur département."""
+    return paginate(query_collaborateurs(db), Collaborateur.id, **page)
 
 
 def get_collaborateur_by_id(db, collaborateur_id):
@@ -45,21 +55,132 @@ def get_collaborateur_by_id(db, collaborateur_id):
 
 
 def list_supports(db):
-    """Récupérer tous les supports."""
-    return (
-        db.query(Collaborateur)
-        .filter(Collaborateur.departement.has(nom="support"))
-        .all()
-    )
+    """Récupérer tous les supports (id, nom, prénom), depuis le cache."""
+    return list_staff(db, "support")
 
 
 @gestion_required
-def update_existing_collaborateur(db, token, collaborateur_id, **updates):
+def update_existing_collaborateur(db, auth, collaborateur_id, **updates):
     """Mettre à jour un collaborateur (équipe gestion)."""
-    return update_collaborateur(db, collaborateur_id, **updates)
+    collaborateur = update_collaborateur(db, collaborateur_id, **updates)
+    invalidate_reference_data()
+    return collaborateur
 
 
 @gestion_required
-def delete_collaborateur_service(db, token, collaborateur_id):
+def delete_collaborateur_service(db, auth, collaborateur_id):
     """Supprimer un collaborateur (équipe gestion)."""
-    return delete_collaborateur(db, collaborateur_id)
+    collaborateur = delete_collaborateur(db, collaborateur_id)
+    invalidate_reference_data()
+    return collaborateur
+
+
+def clean_collaborateur_record(record, departements):
+    """
+    Normalise un enregistrement d'import comme `collaborateurs create` et
+    le valide. `departements` associe nom et ID (en texte) d'un
+    département à son ID. Lève ValueError si une valeur est invalide.
+    """
+    def text(key):
+        return str(record.get(key) or "").strip()
+
+    nom = text("nom").lower().capitalize()
+    prenom = text("prenom").lower().capitalize()
+    email = text("email").lower()
+    login = text("login").lower()
+    password = text("password")
+    departement = text("departement").lower()
+
+    if not nom or not prenom:
+        raise ValueError("Le nom et le prénom sont obligatoires.")
+    if not EMAIL_PATTERN.match(email):
+        raise ValueError(f"Email invalide : {email}")
+    if " " in login or len(login) < 3:
+        raise ValueError(f"Login invalide : {login}")
+    if not password:
+        raise ValueError("Le mot de passe est obligatoire.")
+    if departement not in departements:
+        raise ValueError(f"Département inconnu : {departement}")
+    if max(len(nom), len(prenom), len(login)) > 50 or len(email) > 100:
+        raise ValueError("Valeur trop longue.")
+
+    return {
+        "nom": nom,
+        "prenom": prenom,
+        "email": email,
+        "login": login,
+        "password": password,
+        "departement_id": departements[departement],
+    }
+
+
+@gestion_required
+def import_collaborateurs(
+    db, auth, records, chunk_size=IMPORT_CHUNK_SIZE, workers=None
+):
+    """
+    Importe des collaborateurs (équipe gestion).
+
+    Chaque lot est validé, dédoublonné (logins et emails) contre la base en
+    une requête, puis ses mots de passe sont hachés en parallèle dans un
+    pool de processus partagé par tous les lots avant une insertion en une
+    instruction. Une ligne invalide est signalée sans interrompre l'import.
+    """
+    departements = {}
+    for departement in get_departements(db):
+        departements[departement.nom.lower()] = departement.id
+        departements[str(departement.id)] = departement.id
+
+    report = ImportReport()
+    seen_logins, seen_emails = set(), set()
+
+    with hashing_pool(workers) as hash_many:
+        for chunk in chunked(records, chunk_size):
+            rows = []
+            for lineno, record in chunk:
+                if isinstance(record, Exception):
+                    report.errors.append((lineno, str(record)))
+                    continue
+                try:
+                    values = clean_collaborateur_record(record, departements)
+                except ValueError as e:
+                    report.errors.append((lineno, str(e)))
+                    continue
+                if (values["login"] in seen_logins
+                        or values["email"] in seen_emails):
+                    report.errors.append(
+                        (lineno, "Login ou email en double dans le fichier.")
+                    )
+                    continue
+                seen_logins.add(values["login"])
+                seen_emails.add(values["email"])
+                rows.append((lineno, values))
+
+            logins, emails = get_existing_logins_and_emails(
+                db,
+                [values["login"] for _, values in rows],
+                [values["email"] for _, values in rows]
+            )
+            new_rows = []
+            for lineno, values in rows:
+                if values["login"] in logins or values["email"] in emails:
+                    report.errors.append(
+                        (lineno, "Login ou email déjà utilisé.")
+                    )
+                else:
+                    new_rows.append((lineno, values))
+            if not new_rows:
+                continue
+
+            hashes = hash_many(
+                [values.pop("password") for _, values in new_rows]
+            )
+            for (_, values), password_hash in zip(new_rows, hashes):
+                values["password_hash"] = password_hash
+            insert_import_rows(
+                db, bulk_insert_collaborateurs, new_rows, report
+            )
+
+    if report.inserted:
+        invalidate_reference_data()
+    return report
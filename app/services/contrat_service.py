@@ -1,5 +1,5 @@
 from app.crud.contrats import (
-    create_contrat, update_contrat, get_all_contrats
+    create_contrat, update_contrat, get_all_contrats, query_contrats
 )
 from app.auth.permissions import (
     gestion_required,
@@ -7,7 +7,8 @@ from app.auth.permissions import (
     read_only_required
 )
 from app.crud.clients import get_client
-from app.db.models import Contrat, Client
+from app.crud.pagination import paginate
+from app.db.models.contrat import Contrat
 
 
 @read_only_required
@@ -16,8 +17,32 @@ def list_all_contrats(db):
     return get_all_contrats(db)
 
 
+@read_only_required
+def search_contrats(
+    db, auth, unsigned=False, unpaid=False, all_contrats=False,
+    sort="client", **page
+):
+    """
+    Lister les contrats filtrés pour l'utilisateur connecté.
+    Un commercial ne voit que ses contrats, sauf avec `all_contrats`.
+    `page` accepte les options de `paginate` (after_id, page_size, stream).
+    """
+    commercial_id = None
+    if auth.role == "commercial" and not all_contrats:
+        commercial_id = auth.user_id
+
+    query = query_contrats(
+        db,
+        statut=False if unsigned else None,
+        unpaid=unpaid,
+        commercial_id=commercial_id,
+        sort=sort
+    )
+    return paginate(query, Contrat.id, **page)
+
+
 @gestion_required
-def create_new_contrat(db, token, id_client, montant_total):
+def create_new_contrat(db, auth, id_client, montant_total):
     """Créer un contrat en s'assurant que le client et son
     commercial existent."""
 
@@ -43,22 +68,17 @@ def create_new_contrat(db, token, id_client, montant_total):
 @commercial_required
 def list_contrats_by_commercial(db, user_id):
     """Lister les contrats des clients dont le commercial est responsable."""
-    return db.query(Contrat).join(Client).filter(
-        Client.id_commercial == user_id
-    )
+    return query_contrats(db, commercial_id=user_id)
 
 
 @commercial_required
 def get_signed_contrats_for_commercial(db, user_id):
     """Récupérer les contrats signés pour un commercial."""
-    return db.query(Contrat).join(Client).filter(
-        Client.id_commercial == user_id,
-        Contrat.statut
-    ).all()
+    return query_contrats(db, statut=True, commercial_id=user_id).all()
 
 
 @gestion_required
-def update_client_contrat(db, token, contrat_id, **updates):
+def update_client_contrat(db, auth, contrat_id, **updates):
     """
     Met à jour un contrat (Gestion uniquement).
     """
@@ -66,7 +86,7 @@ def update_client_contrat(db, token, contrat_id, **updates):
 
 
 @commercial_required
-def update_contrat_commercial_service(db, token, contrat_id, **updates):
+def update_contrat_commercial_service(db, auth, contrat_id, **updates):
     """
     Permet à un commercial de modifier UNIQUEMENT ses propres contrats.
     """
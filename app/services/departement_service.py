@@ -1,12 +1,11 @@
-
-
-from app.db.models.collaborateur import Departement
 from sqlalchemy.orm import Session
 from typing import List
+from app.services.reference_data import DepartementRef, get_departements
 
 
-def get_all_departements(db: Session) -> List[Departement]:
+def get_all_departements(db: Session) -> List[DepartementRef]:
     """
-    Récupère tous les départements de la base de données.
+    Récupère tous les départements (id, nom), depuis le cache des données
+    de référence.
     """
-    return db.query(Departement).all()
+    return get_departements(db)
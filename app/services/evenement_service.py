@@ -1,35 +1,51 @@
 from app.crud.evenements import (
+    bulk_assign_supports,
     create_evenement,
     update_evenement,
-    get_all_evenements,
     get_evenement,
-    get_evenements_by_support
+    get_assigned_schedule,
+    get_calendar,
+    get_overlapping_evenement,
+    get_support_schedule,
+    get_unassigned_schedule,
+    query_evenements
 )
+from app.crud.pagination import paginate
 from app.crud.collaborateurs import get_support
-from app.auth.jwt_utils import decode_token
+from app.services.reference_data import get_departement_id, list_staff
 from app.auth.permissions import (
     gestion_required,
     commercial_required,
     support_required,
-    read_only_required
+    read_only_required,
+    role_required
 )
 from app.db.models.contrat import Contrat
 from app.db.models.evenement import Evenement
+from app.utils.intervals import IntervalTree
+
+# Couples d'événements en conflit affichés au plus par défaut
+CONFLICTS_LIMIT = 50
 
 
 @read_only_required
-def list_all_evenements(db, token):
-    """Récupérer tous les événements (lecture seule pour tous)."""
-    return get_all_evenements(db)
+def list_all_evenements(db, auth, filters: dict = None, **page):
+    """
+    Récupérer tous les événements (lecture seule pour tous), filtrés
+    par `filters` (voir `query_evenements`).
+    """
+    return paginate(
+        query_evenements(db, profile="list", **(filters or {})),
+        Evenement.id, **page
+    )
 
 
 @commercial_required
 def create_event_for_client(
-    db, token, id_contrat, date_debut, date_fin, lieu, participants, notes
+    db, auth, id_contrat, date_debut, date_fin, lieu, participants, notes
 ):
     """Créer un événement pour un client (commercial uniquement)."""
-    payload = decode_token(token)
-    user_id = payload.get("user_id")
+    user_id = auth.user_id
 
     contrat = db.query(Contrat).filter(Contrat.id == id_contrat).first()
     if not contrat or not contrat.statut:
@@ -47,10 +63,12 @@ def create_event_for_client(
 
 
 @gestion_required
-def assign_support(db, token, evenement_id: int, support_id: int):
+def assign_support(db, auth, evenement_id: int, support_id: int):
     """Assigner un support à un événement (Gestion uniquement)."""
     evenement = get_evenement(db, evenement_id)
-    support = get_support(db, support_id)
+    support = get_support(
+        db, support_id, get_departement_id(db, "support")
+    )
 
     if not evenement:
         raise ValueError("Aucun événement trouvé avec cet ID.")
@@ -61,6 +79,11 @@ def assign_support(db, token, evenement_id: int, support_id: int):
             "Le support sélectionné n'existe pas ou n'est pas dans le bon "
             "département."
         )
+    conflit = get_overlapping_evenement(
+        db, support_id, evenement.date_debut, evenement.date_fin
+    )
+    if conflit:
+        raise ValueError(conflict_message(conflit))
 
     evenement.id_support = support_id
     db.commit()
@@ -68,33 +91,164 @@ def assign_support(db, token, evenement_id: int, support_id: int):
     return evenement
 
 
+def conflict_message(conflit) -> str:
+    """Message d'erreur pour un événement qui chevauche le planning."""
+    return (
+        f"Le support est déjà pris par l'événement ID {conflit.id} du "
+        f"{conflit.date_debut.strftime('%d/%m/%Y')} au "
+        f"{conflit.date_fin.strftime('%d/%m/%Y')}."
+    )
+
+
 @support_required
-def list_events_for_support(db, token):
+def list_events_for_support(db, auth, filters: dict = None, **page):
     """Filtrer les événements attribués au support connecté."""
-    payload = decode_token(token)
-    id_support = payload.get("user_id")
+    id_support = auth.user_id
 
     if not id_support:
         raise ValueError(
-            "Erreur : Impossible de récupérer l'ID du support depuis le token."
+            "Erreur : Impossible de récupérer l'ID du support connecté."
         )
 
-    return get_evenements_by_support(db, id_support)
+    return paginate(
+        query_evenements(
+            db, support_id=id_support, profile="list", **(filters or {})
+        ),
+        Evenement.id, **page
+    )
 
 
 @gestion_required
-def get_unassigned_evenements(db):
+def get_unassigned_evenements(db, filters: dict = None, **page):
     """Retourne la liste des événements sans support attribué."""
-    return db.query(Evenement).filter(Evenement.id_support.is_(None)).all()
+    return paginate(
+        query_evenements(
+            db, unassigned=True, profile="list", **(filters or {})
+        ),
+        Evenement.id, **page
+    )
+
+
+@role_required(["commercial", "support", "gestion"])
+def get_calendar_evenements(db, auth, date_debut, date_fin,
+                            mine: bool = False):
+    """
+    Événements qui commencent sur la période du calendrier ; avec `mine`,
+    seulement ceux du support connecté.
+    """
+    support_id = auth.user_id if mine else None
+    return get_calendar(db, date_debut, date_fin, support_id)
 
 
 @support_required
-def update_event_by_support(db, token, event_id, **updates):
+def update_event_by_support(db, auth, event_id, **updates):
     """Mettre à jour les événements attribués au support."""
     return update_evenement(db, event_id, **updates)
 
 
+def plan_assignments(evenements, supports, schedule):
+    """
+    Répartit `evenements` (id, date_debut, date_fin...) entre `supports`
+    (id...), en tenant compte de leur planning `schedule` (id_support, id,
+    date_debut, date_fin).
+
+    Les événements sont pris par date de début ; chacun va au support le
+    moins chargé sur la période dont aucun événement ne chevauche ses
+    dates (à ID égal, le plus petit). Retourne les couples (événement,
+    support) et les événements qu'aucun support ne peut prendre.
+    """
+    plannings = {support.id: IntervalTree() for support in supports}
+    for id_support, evenement_id, date_debut, date_fin in schedule:
+        plannings[id_support].add(date_debut, date_fin, evenement_id)
+
+    assignments, unassignable = [], []
+    for evenement in sorted(evenements, key=lambda e: (e.date_debut, e.id)):
+        available = [
+            (len(planning), id_support)
+            for id_support, planning in plannings.items()
+            if planning.find_overlap(
+                evenement.date_debut, evenement.date_fin
+            ) is None
+        ]
+        if not available:
+            unassignable.append(evenement)
+            continue
+        _, id_support = min(available)
+        plannings[id_support].add(
+            evenement.date_debut, evenement.date_fin, evenement.id
+        )
+        assignments.append((evenement, id_support))
+    return assignments, unassignable
+
+
 @gestion_required
-def assign_support_to_event(db, token, event_id, id_support):
-    """Associer un support à un événement (équipe gestion uniquement)."""
-    return update_evenement(db, event_id, id_support=id_support)
+def auto_assign_supports(db, auth, dry_run: bool = False):
+    """
+    Attribue un support à tous les événements qui n'en ont pas (équipe
+    gestion), en une transaction : trois requêtes de lecture et une mise
+    à jour groupée. Avec `dry_run`, rien n'est enregistré.
+    Retourne les couples (événement, id support) prévus, les événements
+    restés sans support et le nombre d'événements réellement attribués :
+    un événement attribué entre-temps (autre processus) n'est pas modifié.
+    """
+    evenements = get_unassigned_schedule(db)
+    supports = list_staff(db, "support")
+    if not evenements or not supports:
+        return [], list(evenements), 0
+
+    schedule = get_support_schedule(
+        db, [support.id for support in supports],
+        min(evenement.date_debut for evenement in evenements),
+        max(evenement.date_fin for evenement in evenements)
+    )
+    assignments, unassignable = plan_assignments(
+        evenements, supports, schedule
+    )
+    if dry_run:
+        return assignments, unassignable, len(assignments)
+    assigned = bulk_assign_supports(db, [
+        (evenement.id, id_support) for evenement, id_support in assignments
+    ])
+    db.commit()
+    return assignments, unassignable, assigned
+
+
+def detect_conflicts(schedule, limit: int = None):
+    """
+    Chevauchements de dates entre événements d'un même support, dans
+    `schedule` (id_support, id, date_debut, date_fin...). Chaque événement
+    est comparé, via l'arbre d'intervalles de son support, aux événements
+    déjà vus.
+
+    Retourne au plus `limit` couples (id support, événement, événement) et
+    le nombre d'événements qui chevauchent un événement antérieur : au-delà
+    de `limit`, seul ce compte est tenu, sans énumérer les couples.
+    """
+    plannings, conflicts, count = {}, [], 0
+    for evenement in schedule:
+        planning = plannings.setdefault(evenement.id_support, IntervalTree())
+        if limit is None or len(conflicts) < limit:
+            autres = planning.overlapping(
+                evenement.date_debut, evenement.date_fin
+            )
+            conflicts.extend(
+                (evenement.id_support, autre, evenement)
+                for _, _, autre in autres
+            )
+            count += bool(autres)
+        elif planning.find_overlap(evenement.date_debut, evenement.date_fin):
+            count += 1
+        planning.add(evenement.date_debut, evenement.date_fin, evenement)
+    return conflicts[:limit], count
+
+
+@role_required(["gestion", "support"])
+def find_conflicts(db, auth, support_id: int = None,
+                   limit: int = CONFLICTS_LIMIT):
+    """
+    Chevauchements de dates dans le planning des supports (équipe
+    gestion), ou dans celui du support connecté : voir `detect_conflicts`.
+    """
+    if auth.role == "support":
+        support_id = auth.user_id
+    return detect_conflicts(get_assigned_schedule(db, support_id), limit)
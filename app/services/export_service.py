@@ -0,0 +1,56 @@
+from app.auth.permissions import read_only_required, role_required
+from app.crud.exports import (
+    export_clients_query, export_contrats_query, export_evenements_query
+)
+
+# Taille des lots lus depuis le curseur serveur
+EXPORT_BATCH_SIZE = 1000
+
+
+def stream_rows(db, query):
+    """
+    Exécute une requête d'export sur un curseur serveur et retourne les
+    noms de colonnes et un itérateur de lignes lues par lots.
+    """
+    result = db.execute(query.execution_options(
+        stream_results=True, yield_per=EXPORT_BATCH_SIZE
+    ))
+    return list(result.keys()), iter(result)
+
+
+@read_only_required
+def export_clients(db, auth, all_clients: bool = False):
+    """Clients exportables : ceux du commercial, ou tous."""
+    if auth.role == "commercial" and not all_clients:
+        return stream_rows(db, export_clients_query(auth.user_id))
+    return stream_rows(db, export_clients_query())
+
+
+@read_only_required
+def export_contrats(db, auth, all_contrats: bool = False):
+    """Contrats exportables : ceux des clients du commercial, ou tous."""
+    if auth.role == "commercial" and not all_contrats:
+        return stream_rows(db, export_contrats_query(auth.user_id))
+    return stream_rows(db, export_contrats_query())
+
+
+@read_only_required
+def export_evenements(db, auth, mine: bool = False):
+    """Événements exportables : tous, ou ceux du support connecté."""
+    if mine:
+        if auth.role != "support":
+            raise PermissionError(
+                "Seuls les supports peuvent exporter leurs événements."
+            )
+        return stream_rows(db, export_evenements_query(auth.user_id))
+    return stream_rows(db, export_evenements_query())
+
+
+@role_required(["gestion", "support"])
+def export_evenements_calendar(db, auth):
+    """
+    Événements du calendrier iCalendar : ceux du support connecté, ou
+    tous pour l'équipe gestion.
+    """
+    support_id = auth.user_id if auth.role == "support" else None
+    return stream_rows(db, export_evenements_query(support_id))
@@ -0,0 +1,81 @@
+import time
+from collections import namedtuple
+from sqlalchemy import select
+from app.core.config import settings
+from app.db.models.collaborateur import Collaborateur, Departement
+
+DepartementRef = namedtuple("DepartementRef", "id nom")
+StaffMember = namedtuple("StaffMember", "id nom prenom")
+
+
+class ReferenceCache:
+    """
+    Données de référence (départements, collaborateurs d'un département)
+    lues une fois puis conservées REFERENCE_CACHE_TTL secondes.
+
+    Chaque entrée porte la version du cache au moment de sa lecture :
+    une modification de collaborateur incrémente la version et périme
+    toutes les entrées. Le TTL couvre les modifications faites par un
+    autre processus.
+    """
+
+    def __init__(self, ttl: float = None, clock=time.monotonic):
+        self.ttl = settings.REFERENCE_CACHE_TTL if ttl is None else ttl
+        self.clock = clock
+        self.version = 0
+        self._entries = {}
+
+    def get(self, key, loader):
+        """Valeur en cache pour `key`, relue avec `loader()` si périmée."""
+        entry = self._entries.get(key)
+        now = self.clock()
+        if (entry is not None and entry[0] == self.version
+                and now - entry[1] < self.ttl):
+            return entry[2]
+
+        version = self.version
+        value = loader()
+        self._entries[key] = (version, now, value)
+        return value
+
+    def invalidate(self):
+        self.version += 1
+
+
+reference_cache = ReferenceCache()
+
+
+def invalidate_reference_data():
+    """À appeler après toute création, modification ou suppression."""
+    reference_cache.invalidate()
+
+
+def get_departements(db) -> list:
+    """Départements (id, nom), triés par ID."""
+    return reference_cache.get("departements", lambda: [
+        DepartementRef(*row) for row in db.execute(
+            select(Departement.id, Departement.nom).order_by(Departement.id)
+        )
+    ])
+
+
+def get_departement_id(db, nom: str):
+    """ID du département `nom`, ou None s'il n'existe pas."""
+    for departement in get_departements(db):
+        if departement.nom == nom:
+            return departement.id
+    return None
+
+
+def list_staff(db, departement: str) -> list:
+    """Collaborateurs (id, nom, prénom) d'un département, triés par ID."""
+    departement_id = get_departement_id(db, departement)
+    if departement_id is None:
+        return []
+    return reference_cache.get(("staff", departement), lambda: [
+        StaffMember(*row) for row in db.execute(
+            select(Collaborateur.id, Collaborateur.nom, Collaborateur.prenom)
+            .where(Collaborateur.departement_id == departement_id)
+            .order_by(Collaborateur.id)
+        )
+    ])
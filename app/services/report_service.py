@@ -0,0 +1,22 @@
+from app.auth.permissions import gestion_required
+from app.core.config import settings
+from app.crud.reports import (
+    rebuild_revenue_summary, revenue_by_commercial, revenue_by_month
+)
+
+
+@gestion_required
+def revenue_report(db, auth, rebuild: bool = False):
+    """
+    Chiffre d'affaires et reste à encaisser par commercial et par mois
+    (équipe gestion). Avec REVENUE_SUMMARY, les totaux sont lus dans la
+    table de synthèse (reconstruite d'abord si `rebuild`) plutôt que
+    recalculés sur tous les contrats.
+    """
+    summary = settings.REVENUE_SUMMARY
+    if rebuild and summary:
+        rebuild_revenue_summary(db)
+    return (
+        revenue_by_commercial(db, summary=summary),
+        revenue_by_month(db, summary=summary),
+    )
@@ -0,0 +1,123 @@
+import os
+import datetime
+import pytest
+
+# Les modules de configuration exigent une URL de base de données.
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+# Paramètres Argon2 réduits : les tests hachent sans coût mémoire.
+os.environ.setdefault("ARGON2_TIME_COST", "1")
+os.environ.setdefault("ARGON2_MEMORY_COST", "1024")
+os.environ.setdefault("ARGON2_PARALLELISM", "1")
+
+from sqlalchemy import create_engine, event  # noqa: E402
+from sqlalchemy.orm import sessionmaker  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+from app.db.base import Base  # noqa: E402
+from app.db.models import (  # noqa: E402
+    Client, Collaborateur, Contrat, Evenement
+)
+from app.db.models.collaborateur import Departement  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def reference_cache():
+    """Cache des données de référence vidé : chaque test a sa base."""
+    from app.services.reference_data import invalidate_reference_data
+
+    invalidate_reference_data()
+    yield
+    invalidate_reference_data()
+
+
+@pytest.fixture
+def engine():
+    """Base SQLite en mémoire créée à partir des modèles."""
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def db(engine):
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+
+
+@pytest.fixture
+def query_counter(engine):
+    """Compte les requêtes SQL émises sur le moteur de test."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    yield statements
+    event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def seed_crm(db, clients=3, contrats_per_client=1, evenements_per_contrat=1):
+    """
+    Insère un jeu de données minimal : départements, deux commerciaux, deux
+    supports, puis des clients, contrats et événements.
+    """
+    departements = {
+        nom: Departement(nom=nom)
+        for nom in ("gestion", "support", "commercial")
+    }
+    db.add_all(departements.values())
+    db.flush()
+
+    def collaborateur(login, departement):
+        return Collaborateur(
+            nom=login.capitalize(), prenom="Test",
+            email=f"{login}@example.com", login=login,
+            password_hash="x", departement_id=departements[departement].id
+        )
+
+    gestion = collaborateur("gestion1", "gestion")
+    commerciaux = [collaborateur(f"commercial{i}", "commercial")
+                   for i in (1, 2)]
+    supports = [collaborateur(f"support{i}", "support") for i in (1, 2)]
+    db.add_all([gestion, *commerciaux, *supports])
+    db.flush()
+
+    debut = datetime.date(2025, 1, 1)
+    for i in range(clients):
+        client = Client(
+            nom_complet=f"Client {i:05d}", email=f"client{i}@example.com",
+            telephone="0600000000", nom_entreprise=f"Entreprise {i}",
+            id_commercial=commerciaux[i % 2].id
+        )
+        db.add(client)
+        db.flush()
+        for j in range(contrats_per_client):
+            contrat = Contrat(
+                id_client=client.id, montant_total=1000.0,
+                montant_restant=500.0 if j % 2 else 0.0, statut=bool(i % 2)
+            )
+            db.add(contrat)
+            db.flush()
+            for k in range(evenements_per_contrat):
+                jour = debut + datetime.timedelta(days=3 * (i + j + k))
+                db.add(Evenement(
+                    id_contrat=contrat.id,
+                    id_support=supports[i % 2].id if i % 3 else None,
+                    date_debut=jour,
+                    date_fin=jour + datetime.timedelta(days=1),
+                    lieu=f"Lieu {i}", nombre_participants=10 + i
+                ))
+    ids = {
+        "gestion": gestion.id,
+        "commerciaux": [c.id for c in commerciaux],
+        "supports": [s.id for s in supports],
+    }
+    db.commit()
+    db.expunge_all()
+    return ids
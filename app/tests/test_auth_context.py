@@ -0,0 +1,69 @@
+import pytest
+from unittest.mock import patch
+from click.testing import CliRunner
+
+from app.auth import context
+from app.auth.context import (
+    auth_scope, auth_stats, get_auth_context, reset_auth_stats
+)
+from app.auth.jwt_utils import generate_token
+from app.utils import file_utils
+
+
+@pytest.fixture
+def logged_in(tmp_path, monkeypatch):
+    """Sauvegarde un token de gestionnaire dans un répertoire temporaire."""
+    monkeypatch.setattr(file_utils, "TOKEN_FILE", str(tmp_path / "token"))
+    monkeypatch.setattr(file_utils, "KEY_FILE", str(tmp_path / "key"))
+    file_utils.save_token(generate_token(7, "gestion", "Jean", "Patrick"))
+    reset_auth_stats()
+    yield
+    reset_auth_stats()
+
+
+def test_get_auth_context_payload(logged_in):
+    auth = get_auth_context()
+    assert auth.user_id == 7
+    assert auth.role == "gestion"
+    assert auth.nom == "Jean"
+    assert auth.prenom == "Patrick"
+    assert not auth.is_expired
+
+
+def test_get_auth_context_not_logged_in(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_utils, "TOKEN_FILE", str(tmp_path / "absent"))
+    assert get_auth_context() is None
+
+
+def test_auth_scope_resolves_once(logged_in):
+    with auth_scope():
+        first = get_auth_context()
+        with auth_scope():
+            assert get_auth_context() is first
+    assert auth_stats() == {"key_reads": 1, "decrypts": 1, "jwt_verifies": 1}
+
+
+def test_auth_scope_invalidate(logged_in):
+    with auth_scope():
+        get_auth_context()
+        context.invalidate_auth_context()
+        get_auth_context()
+    assert auth_stats()["jwt_verifies"] == 2
+
+
+def test_command_decodes_token_once(logged_in, monkeypatch):
+    from app.auth import permission_index
+    from app.cli import main
+
+    monkeypatch.setattr(
+        permission_index, "_index",
+        permission_index.PermissionIndex({"gestion": ["evenements"]})
+    )
+    with patch(
+        "app.services.evenement_service.paginate", return_value=[]
+    ):
+        result = CliRunner().invoke(main.cli, ["evenements", "list"])
+
+    assert result.exit_code == 0, result.output
+    assert "Aucun événement" in result.output
+    assert auth_stats() == {"key_reads": 1, "decrypts": 1, "jwt_verifies": 1}
@@ -0,0 +1,102 @@
+import datetime
+from sqlalchemy import update
+from app.auth import permissions
+from app.auth.context import AuthContext
+from app.db.models import Evenement
+from app.services import evenement_service
+from app.services.evenement_service import auto_assign_supports
+from app.tests.conftest import seed_crm
+
+
+def gestion(db, monkeypatch, ids):
+    auth = AuthContext(
+        user_id=ids["gestion"], role="gestion", nom="Gestion1",
+        prenom="Test", expiry=datetime.datetime.max.replace(
+            tzinfo=datetime.timezone.utc
+        )
+    )
+    monkeypatch.setattr(permissions, "get_auth_context", lambda: auth)
+    return auth
+
+
+def add_evenement(db, debut, jours, id_support=None):
+    evenement = Evenement(
+        id_contrat=1, id_support=id_support, date_debut=debut,
+        date_fin=debut + datetime.timedelta(days=jours), lieu="Paris",
+        nombre_participants=10
+    )
+    db.add(evenement)
+    db.commit()
+    return evenement.id
+
+
+def plannings(db):
+    return {
+        evenement.id: evenement.id_support
+        for evenement in db.query(Evenement).order_by(Evenement.id)
+    }
+
+
+def test_auto_assign_balances_and_avoids_overlaps(db, monkeypatch,
+                                                  query_counter):
+    ids = seed_crm(db, clients=0)
+    first, second = ids["supports"]
+    auth = gestion(db, monkeypatch, ids)
+    debut = datetime.date(2025, 6, 1)
+    busy = add_evenement(db, debut, 2, id_support=first)
+    chevauche = add_evenement(db, debut + datetime.timedelta(days=1), 1)
+    bloque = add_evenement(db, debut + datetime.timedelta(days=2), 1)
+    plus_tard = add_evenement(db, debut + datetime.timedelta(days=5), 1)
+    query_counter.clear()
+
+    assignments, unassignable, assigned = auto_assign_supports(db, auth)
+    statements = len(query_counter)
+
+    assert plannings(db) == {
+        busy: first, chevauche: second, plus_tard: first, bloque: None,
+    }
+    assert [evenement.id for evenement in unassignable] == [bloque]
+    assert len(assignments) == assigned == 2
+    # Lectures et mise à jour groupée, sans requête par événement
+    assert statements <= 5
+
+
+def test_auto_assign_dry_run(db, monkeypatch):
+    ids = seed_crm(db, clients=0)
+    auth = gestion(db, monkeypatch, ids)
+    evenement_id = add_evenement(db, datetime.date(2025, 6, 1), 1)
+
+    assignments, _, _ = auto_assign_supports(db, auth, dry_run=True)
+
+    assert [evt.id for evt, _ in assignments] == [evenement_id]
+    assert plannings(db) == {evenement_id: None}
+
+
+def test_auto_assign_counts_rows_actually_assigned(db, monkeypatch):
+    ids = seed_crm(db, clients=0)
+    first, second = ids["supports"]
+    auth = gestion(db, monkeypatch, ids)
+    debut = datetime.date(2025, 6, 1)
+    pris = add_evenement(db, debut, 1)
+    libre = add_evenement(db, debut + datetime.timedelta(days=5), 1)
+    plan = evenement_service.plan_assignments
+
+    def plan_then_concurrent_assign(*args):
+        planned = plan(*args)
+        # Attribution faite par un autre processus après le calcul
+        db.execute(
+            update(Evenement).where(Evenement.id == pris)
+            .values(id_support=second)
+        )
+        return planned
+
+    monkeypatch.setattr(evenement_service, "plan_assignments",
+                        plan_then_concurrent_assign)
+
+    assignments, _, assigned = auto_assign_supports(db, auth)
+
+    assert len(assignments) == 2
+    assert assigned == 1
+    db.expire_all()
+    assert plannings(db)[pris] == second
+    assert plannings(db)[libre] is not None
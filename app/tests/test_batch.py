@@ -0,0 +1,151 @@
+import datetime
+import click
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+import main
+from app.auth import permission_index
+from app.auth.context import AuthContext, auth_scope
+from app.auth.permission_index import PermissionIndex
+from app.cli.batch import BatchRunner, read_commands
+from app.db import session as db_session
+from app.db.base import Base
+from app.db.models import Contrat
+from app.db.models.collaborateur import Departement
+from app.db.session import enable_sqlite_savepoints, session_scope
+from app.tests.conftest import seed_crm
+from app.utils.config import ask, non_interactive
+
+sessions = []
+
+
+@click.group()
+def cli():
+    """CLI de test."""
+
+
+@cli.command(name="add")
+@click.argument("nom")
+def add_departement(nom):
+    with session_scope() as db:
+        sessions.append(db)
+        db.add(Departement(nom=nom))
+        db.commit()
+
+
+@cli.command(name="fail")
+def fail():
+    with session_scope() as db:
+        db.add(Departement(nom="echec"))
+        db.flush()
+        db.rollback()
+
+
+@cli.command(name="need")
+@click.option("--valeur")
+def need(valeur):
+    try:
+        ask(valeur, "Valeur", "--valeur")
+    except Exception:
+        pass
+
+
+@pytest.fixture
+def batch_engine(monkeypatch):
+    """Base SQLite en mémoire, configurée comme le moteur de l'application."""
+    engine = create_engine(
+        "sqlite://", connect_args={"check_same_thread": False},
+        poolclass=StaticPool
+    )
+    enable_sqlite_savepoints(engine)
+    Base.metadata.create_all(bind=engine)
+    monkeypatch.setattr(db_session, "engine", engine)
+    monkeypatch.setattr(
+        db_session, "SessionLocal", sessionmaker(bind=engine, autoflush=False)
+    )
+    sessions.clear()
+    yield engine
+    engine.dispose()
+
+
+def departements(engine):
+    with sessionmaker(bind=engine)() as db:
+        return sorted(d.nom for d in db.query(Departement))
+
+
+def test_read_commands_skips_comments_and_blank_lines():
+    lines = ["# entête\n", "\n", "add 'support client'  # commentaire\n",
+             "fail\n"]
+
+    assert list(read_commands(lines)) == [
+        (3, ["add", "support client"]), (4, ["fail"])
+    ]
+
+
+def test_ask_without_prompt_in_batch():
+    with non_interactive() as errors:
+        assert ask(None, "Nom", "--nom", default="") == ""
+        with pytest.raises(click.UsageError):
+            ask(None, "ID", "--id", type=int)
+
+    assert errors == ["L'option --id est obligatoire en mode batch."]
+
+
+def test_batch_shares_session_and_continues(batch_engine):
+    runner = BatchRunner(cli)
+
+    failures = runner.run(["add gestion", "fail", "need", "add support"])
+
+    assert failures == 2
+    assert runner.executed == 4
+    assert sessions[0] is sessions[1]
+    assert departements(batch_engine) == ["gestion", "support"]
+
+
+def test_atomic_batch_rolls_back_everything(batch_engine):
+    failures = BatchRunner(cli, atomic=True).run(
+        ["add gestion", "add support", "fail", "add commercial"]
+    )
+
+    assert failures == 1
+    assert departements(batch_engine) == []
+
+
+def test_atomic_batch_commits_on_success(batch_engine):
+    failures = BatchRunner(cli, atomic=True).run(
+        ["add gestion", "add support"]
+    )
+
+    assert failures == 0
+    assert departements(batch_engine) == ["gestion", "support"]
+
+
+def test_atomic_batch_fails_on_printed_error(
+    batch_engine, tmp_path, monkeypatch
+):
+    with sessionmaker(bind=batch_engine)() as db:
+        ids = seed_crm(db, clients=1)
+    monkeypatch.setattr(permission_index, "_index", PermissionIndex({
+        "gestion": ["contrats", "evenements"]
+    }))
+    auth = AuthContext(
+        user_id=ids["gestion"], role="gestion", nom="Gestion1",
+        prenom="Test", expiry=datetime.datetime.max.replace(
+            tzinfo=datetime.timezone.utc
+        )
+    )
+    batch = tmp_path / "commandes.txt"
+    # La seconde commande ne fait qu'afficher son erreur
+    batch.write_text(
+        "contrats create --client 1 --montant 222\n"
+        "evenements assign_support --evenement 999 --support 6\n",
+        encoding="utf-8"
+    )
+
+    with auth_scope(auth):
+        code = main.run_batch(["main.py", "--batch", str(batch), "--atomic"])
+
+    assert code == 1
+    with sessionmaker(bind=batch_engine)() as db:
+        assert db.query(Contrat).count() == 1
@@ -0,0 +1,171 @@
+"""
+Mesures des chemins critiques (CRUD, services, rendu) sur une vraie base
+SQLite, à plusieurs tailles de jeu de données.
+
+Sans option, chaque mesure s'exécute une seule fois comme un test
+ordinaire (`--benchmark-disable` dans la configuration pytest). Pour
+mesurer et enregistrer une référence, puis comparer :
+
+    pytest app/tests/test_benchmarks.py --benchmark-enable \\
+        --benchmark-save=reference
+    pytest app/tests/test_benchmarks.py --benchmark-enable \\
+        --benchmark-compare --benchmark-compare-fail=median:25%
+
+Les tailles (nombre de clients) se règlent avec EPICEVENTS_BENCH_SCALES.
+"""
+import datetime
+import os
+import pytest
+from click.testing import CliRunner
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+import seed_data
+from app.auth import hashing, login as login_module, permissions
+from app.auth.context import AuthContext
+from app.auth.rate_limit import LoginRateLimiter
+from app.cli import evenements as evenements_cli
+from app.crud.clients import get_all_clients
+from app.db import session as db_session
+from app.db.base import Base
+from app.db.models import Collaborateur, Evenement
+from app.db.models.collaborateur import Departement
+from app.services.contrat_service import list_contrats_by_commercial
+from app.services.evenement_service import (
+    assign_support, get_unassigned_evenements
+)
+
+SCALES = [
+    int(scale) for scale in
+    os.environ.get("EPICEVENTS_BENCH_SCALES", "100,1000").split(",")
+]
+
+
+@pytest.fixture(scope="module", params=SCALES, ids=lambda n: f"{n}clients")
+def bench_engine(request, tmp_path_factory):
+    """Base SQLite sur fichier, générée une fois par taille."""
+    path = tmp_path_factory.mktemp("bench") / "crm.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add_all(Departement(nom=nom)
+                   for nom in ("gestion", "support", "commercial"))
+        db.commit()
+        seed_data.generate_data(
+            db, request.param, commerciaux=10, supports=5, seed=1
+        )
+        db.execute(
+            Collaborateur.__table__.update()
+            .values(password_hash=hashing.hash_password("secret"))
+        )
+        db.commit()
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def bench_db(bench_engine):
+    session = sessionmaker(bind=bench_engine, autoflush=False)()
+    yield session
+    session.close()
+
+
+def staff(db, departement):
+    return db.scalars(
+        select(Collaborateur).join(Departement)
+        .where(Departement.nom == departement).order_by(Collaborateur.id)
+    ).first()
+
+
+def login_as(monkeypatch, collaborateur, role):
+    auth = AuthContext(
+        user_id=collaborateur.id, role=role, nom=collaborateur.nom,
+        prenom=collaborateur.prenom,
+        expiry=datetime.datetime.max.replace(tzinfo=datetime.timezone.utc)
+    )
+    monkeypatch.setattr(permissions, "get_auth_context", lambda: auth)
+    monkeypatch.setattr(evenements_cli, "get_auth_context", lambda: auth)
+    return auth
+
+
+def test_bench_get_all_clients(benchmark, bench_db):
+    gestion = staff(bench_db, "gestion")
+
+    clients = benchmark(
+        get_all_clients, bench_db, gestion.id, "gestion", all_clients=True
+    )
+
+    assert clients
+
+
+def test_bench_list_contrats_by_commercial(benchmark, bench_db,
+                                           monkeypatch):
+    commercial = staff(bench_db, "commercial")
+    login_as(monkeypatch, commercial, "commercial")
+
+    contrats = benchmark(
+        lambda: list_contrats_by_commercial(bench_db, commercial.id).all()
+    )
+
+    assert contrats
+
+
+def test_bench_get_unassigned_evenements(benchmark, bench_db, monkeypatch):
+    login_as(monkeypatch, staff(bench_db, "gestion"), "gestion")
+
+    evenements = benchmark(
+        lambda: list(get_unassigned_evenements(bench_db, page_size=50))
+    )
+
+    assert evenements
+
+
+def test_bench_assign_support(benchmark, bench_db, monkeypatch):
+    auth = login_as(monkeypatch, staff(bench_db, "gestion"), "gestion")
+    support = staff(bench_db, "support")
+    unassigned = list(bench_db.scalars(
+        select(Evenement.id).where(Evenement.id_support.is_(None))
+        .order_by(Evenement.id).limit(20)
+    ))
+
+    def next_evenement():
+        return (bench_db, auth, unassigned.pop(), support.id), {}
+
+    # Chaque tour assigne un événement différent : la base est modifiée
+    evenement = benchmark.pedantic(
+        assign_support, setup=next_evenement,
+        rounds=min(10, len(unassigned))
+    )
+
+    assert evenement.id_support == support.id
+
+
+def test_bench_login(benchmark, bench_db, monkeypatch, tmp_path):
+    monkeypatch.setattr(login_module, "save_token", lambda token: None)
+    gestion = staff(bench_db, "gestion")
+    limiter = LoginRateLimiter(path=str(tmp_path / "attempts.db"))
+
+    token = benchmark(
+        login_module.login, bench_db, gestion.login, "secret",
+        limiter=limiter
+    )
+
+    assert token
+
+
+def test_bench_list_evenements_rendering(benchmark, bench_engine,
+                                         monkeypatch):
+    monkeypatch.setattr(
+        db_session, "SessionLocal",
+        sessionmaker(bind=bench_engine, autoflush=False)
+    )
+    with db_session.SessionLocal() as db:
+        login_as(monkeypatch, staff(db, "gestion"), "gestion")
+    runner = CliRunner()
+
+    result = benchmark(
+        runner.invoke, evenements_cli.evenements_group,
+        ["list", "--page-size", "200"]
+    )
+
+    assert result.exit_code == 0
+    assert "Liste des événements" in result.output
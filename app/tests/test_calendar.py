@@ -0,0 +1,37 @@
+import datetime
+from collections import namedtuple
+from app.utils.calendar_grid import (
+    calendar_period, calendar_weeks, events_by_day
+)
+
+Evt = namedtuple("Evt", "id date_debut date_fin")
+
+
+def test_calendar_period_covers_full_weeks():
+    day = datetime.date(2025, 3, 12)
+
+    assert calendar_period(day) == (
+        datetime.date(2025, 3, 10), datetime.date(2025, 3, 16)
+    )
+    debut, fin = calendar_period(day, month=True)
+    assert (debut, fin) == (
+        datetime.date(2025, 2, 24), datetime.date(2025, 4, 6)
+    )
+    weeks = calendar_weeks(debut, fin)
+    assert len(weeks) == 6
+    assert all(len(week) == 7 and week[0].weekday() == 0 for week in weeks)
+
+
+def test_events_spread_over_their_days_within_grid():
+    debut, fin = calendar_period(datetime.date(2025, 3, 12))
+    long = Evt(1, datetime.date(2025, 3, 15), datetime.date(2025, 3, 20))
+    court = Evt(2, datetime.date(2025, 3, 10), datetime.date(2025, 3, 11))
+
+    days = events_by_day([court, long], debut, fin)
+
+    assert days[datetime.date(2025, 3, 10)] == [court]
+    assert days[datetime.date(2025, 3, 16)] == [long]
+    assert sorted(days) == [
+        datetime.date(2025, 3, 10), datetime.date(2025, 3, 11),
+        datetime.date(2025, 3, 15), datetime.date(2025, 3, 16),
+    ]
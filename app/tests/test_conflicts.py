@@ -0,0 +1,152 @@
+import datetime
+from click.testing import CliRunner
+from sqlalchemy.orm import sessionmaker
+from app.auth import permissions
+from app.auth.context import AuthContext
+from app.cli import evenements as evenements_cli
+from app.db import session as db_session
+from app.db.models import Evenement
+from app.services.evenement_service import assign_support, find_conflicts
+from app.tests.conftest import seed_crm
+from app.tests.test_auto_assign import add_evenement, gestion
+
+
+def test_find_conflicts_per_support(db, monkeypatch):
+    ids = seed_crm(db, clients=0)
+    first, second = ids["supports"]
+    auth = gestion(db, monkeypatch, ids)
+    debut = datetime.date(2025, 6, 1)
+    long = add_evenement(db, debut, 10, id_support=first)
+    inclus = add_evenement(db, debut + datetime.timedelta(days=2), 1,
+                           id_support=first)
+    borne = add_evenement(db, debut + datetime.timedelta(days=10), 2,
+                          id_support=first)
+    add_evenement(db, debut + datetime.timedelta(days=20), 1,
+                  id_support=first)
+    add_evenement(db, debut, 1, id_support=second)
+
+    conflicts, count = find_conflicts(db, auth)
+    pairs = [(support, a.id, b.id) for support, a, b in conflicts]
+
+    # Une borne commune suffit à chevaucher ; pas de conflit entre supports
+    assert pairs == [(first, long, inclus), (first, long, borne)]
+    assert count == 2
+    assert find_conflicts(db, auth, second) == ([], 0)
+    # Au-delà de la limite, les événements en conflit restent comptés
+    assert find_conflicts(db, auth, limit=1)[1] == 2
+
+
+def test_assign_support_refuses_overlap(db, monkeypatch):
+    ids = seed_crm(db, clients=0)
+    first, second = ids["supports"]
+    auth = gestion(db, monkeypatch, ids)
+    debut = datetime.date(2025, 6, 1)
+    add_evenement(db, debut, 3, id_support=first)
+    add_evenement(db, debut + datetime.timedelta(days=8), 1,
+                  id_support=first)
+    chevauche = add_evenement(db, debut + datetime.timedelta(days=2), 2)
+    libre = add_evenement(db, debut + datetime.timedelta(days=5), 1)
+
+    assign_support(db, auth, chevauche, first)
+    assign_support(db, auth, libre, first)
+    assign_support(db, auth, chevauche, second)
+
+    assert db.get(Evenement, libre).id_support == first
+    assert db.get(Evenement, chevauche).id_support == second
+
+
+def test_overlap_found_despite_existing_conflicts(db, monkeypatch):
+    ids = seed_crm(db, clients=0)
+    first, _ = ids["supports"]
+    auth = gestion(db, monkeypatch, ids)
+    debut = datetime.date(2025, 6, 1)
+    # Planning déjà en conflit : le dernier événement commencé ne chevauche
+    # pas le nouveau, mais le premier, plus long, oui
+    add_evenement(db, debut, 10, id_support=first)
+    add_evenement(db, debut + datetime.timedelta(days=1), 1,
+                  id_support=first)
+    nouveau = add_evenement(db, debut + datetime.timedelta(days=8), 1)
+
+    assign_support(db, auth, nouveau, first)
+
+    assert db.get(Evenement, nouveau).id_support is None
+
+
+def test_support_update_refuses_overlapping_dates(db, engine, monkeypatch):
+    ids = seed_crm(db, clients=0)
+    support_id = ids["supports"][0]
+    add_evenement(db, datetime.date(2025, 6, 1), 2, id_support=support_id)
+    evenement_id = add_evenement(db, datetime.date(2025, 6, 10), 1,
+                                 id_support=support_id)
+    auth = AuthContext(
+        user_id=support_id, role="support", nom="Support1", prenom="Test",
+        expiry=datetime.datetime.max.replace(tzinfo=datetime.timezone.utc)
+    )
+    monkeypatch.setattr(permissions, "get_auth_context", lambda: auth)
+    monkeypatch.setattr(evenements_cli, "get_auth_context", lambda: auth)
+    monkeypatch.setattr(
+        db_session, "SessionLocal", sessionmaker(bind=engine, autoflush=False)
+    )
+
+    def update(debut, fin):
+        return CliRunner().invoke(evenements_cli.evenements_group, [
+            "update", "--id", str(evenement_id), "--debut", debut,
+            "--fin", fin, "--lieu", "Lyon", "--participants", "20",
+            "--notes", "note",
+        ]).output
+
+    def dates():
+        db.expire_all()
+        evenement = db.get(Evenement, evenement_id)
+        return evenement.date_debut, evenement.date_fin
+
+    refused = update("02/06/2025", "04/06/2025")
+    assert "déjà pris par l'événement" in refused
+    assert dates() == (datetime.date(2025, 6, 10), datetime.date(2025, 6, 11))
+
+    accepted = update("20/06/2025", "22/06/2025")
+    assert "mis à jour avec succès" in accepted
+    assert dates() == (datetime.date(2025, 6, 20), datetime.date(2025, 6, 22))
+
+
+def test_assign_command_checks_overlap_once(db, engine, monkeypatch,
+                                            query_counter):
+    ids = seed_crm(db, clients=0)
+    first, _ = ids["supports"]
+    auth = gestion(db, monkeypatch, ids)
+    monkeypatch.setattr(evenements_cli, "get_auth_context", lambda: auth)
+    monkeypatch.setattr(
+        db_session, "SessionLocal", sessionmaker(bind=engine, autoflush=False)
+    )
+    debut = datetime.date(2025, 6, 1)
+    pris = add_evenement(db, debut, 3, id_support=first)
+    chevauche = add_evenement(db, debut + datetime.timedelta(days=2), 1)
+    libre = add_evenement(db, debut + datetime.timedelta(days=5), 1)
+
+    def assign(evenement_id):
+        return CliRunner().invoke(evenements_cli.evenements_group, [
+            "assign_support", "--evenement", str(evenement_id),
+            "--support", str(first),
+        ]).output
+
+    def overlap_queries():
+        count = sum(
+            "evenements.date_fin >=" in statement
+            for statement in query_counter
+        )
+        query_counter.clear()
+        return count
+
+    query_counter.clear()
+    refused = assign(chevauche)
+    # L'erreur du service est affichée telle quelle
+    assert f"déjà pris par l'événement ID {pris}" in refused
+    assert "authentification" not in refused
+    assert overlap_queries() == 1
+
+    # Une seule recherche de chevauchement, faite par le service
+    assert "assigné à l'événement" in assign(libre)
+    assert overlap_queries() == 1
+    db.expire_all()
+    assert db.get(Evenement, chevauche).id_support is None
+    assert db.get(Evenement, libre).id_support == first
@@ -0,0 +1,138 @@
+import collections
+import csv
+import datetime
+import io
+import json
+import pytest
+from app.auth import permissions
+from app.auth.context import AuthContext
+from app.services.export_service import (
+    export_clients, export_contrats, export_evenements,
+    export_evenements_calendar
+)
+from app.tests.conftest import seed_crm
+from app.utils import records
+from app.utils.ics import write_ics
+from app.utils.records import read_columnar, write_records
+
+
+def login_as(monkeypatch, user_id, role):
+    auth = AuthContext(
+        user_id=user_id, role=role, nom="Test", prenom="Test",
+        expiry=datetime.datetime.max.replace(tzinfo=datetime.timezone.utc)
+    )
+    monkeypatch.setattr(permissions, "get_auth_context", lambda: auth)
+    return auth
+
+
+@pytest.fixture
+def ids(db):
+    return seed_crm(db, clients=12, contrats_per_client=2)
+
+
+def test_export_clients_scoped_to_commercial(db, ids, monkeypatch):
+    auth = login_as(monkeypatch, ids["commerciaux"][0], "commercial")
+
+    columns, rows = export_clients(db, auth)
+    rows = [dict(zip(columns, row)) for row in rows]
+
+    assert len(rows) == 6
+    assert {row["commercial_nom"] for row in rows} == {"Commercial1"}
+
+    columns, rows = export_clients(db, auth, all_clients=True)
+    assert len(list(rows)) == 12
+
+
+def test_export_contrats_single_streamed_query(db, ids, monkeypatch,
+                                               query_counter):
+    auth = login_as(monkeypatch, ids["gestion"], "gestion")
+    query_counter.clear()
+
+    columns, rows = export_contrats(db, auth)
+    stream = io.StringIO()
+    count = write_records(stream, "csv", columns, rows)
+
+    assert count == 24
+    assert len(query_counter) == 1
+    lines = list(csv.DictReader(io.StringIO(stream.getvalue())))
+    assert lines[0]["client_nom"] == "Client 00000"
+
+
+def test_export_evenements_mine_requires_support(db, ids, monkeypatch):
+    auth = login_as(monkeypatch, ids["supports"][1], "support")
+    columns, rows = export_evenements(db, auth, mine=True)
+    assert {row.support_nom for row in rows} == {"Support2"}
+
+    auth = login_as(monkeypatch, ids["gestion"], "gestion")
+    assert export_evenements(db, auth, mine=True) is None
+
+
+def test_write_jsonl_and_columnar_round_trip(monkeypatch):
+    monkeypatch.setattr(records, "COLUMNAR_ROW_GROUP", 2)
+    columns = ["id", "date", "lieu"]
+    rows = [(i, datetime.date(2025, 1, i), f"Lieu {i}") for i in (1, 2, 3)]
+
+    jsonl = io.StringIO()
+    write_records(jsonl, "jsonl", columns, rows)
+    columnar = io.StringIO()
+    write_records(columnar, "columnar", columns, iter(rows))
+
+    expected = [json.loads(line) for line in jsonl.getvalue().splitlines()]
+    assert expected[0] == {"id": 1, "date": "2025-01-01", "lieu": "Lieu 1"}
+    assert len(columnar.getvalue().splitlines()) == 3
+    columnar.seek(0)
+    assert list(read_columnar(columnar)) == expected
+
+
+def export_ics(db, auth):
+    _, rows = export_evenements_calendar(db, auth)
+    stream = io.BytesIO()
+    count = write_ics(stream, rows, now=datetime.datetime(
+        2025, 3, 1, 9, 0, tzinfo=datetime.timezone.utc
+    ))
+    return count, stream.getvalue()
+
+
+def test_export_ics_support_events_with_stable_uids(db, ids, monkeypatch,
+                                                    query_counter):
+    auth = login_as(monkeypatch, ids["supports"][1], "support")
+    query_counter.clear()
+
+    count, data = export_ics(db, auth)
+
+    assert len(query_counter) == 1
+    lines = data.decode("utf-8").split("\r\n")
+    uids = [line for line in lines if line.startswith("UID:")]
+    assert count == len(uids) > 0
+    assert all(len(line.encode("utf-8")) <= 75 for line in lines)
+    assert lines[0] == "BEGIN:VCALENDAR" and lines[-2] == "END:VCALENDAR"
+    # Même UID à chaque export : le calendrier met à jour ses événements
+    assert export_ics(db, auth)[1] == data
+    assert "UID:evenement-3@epicevents" in uids
+    assert "DTSTART;VALUE=DATE:20250104" in lines
+    assert "DTEND;VALUE=DATE:20250106" in lines
+
+    auth = login_as(monkeypatch, ids["gestion"], "gestion")
+    assert export_ics(db, auth)[0] == 24
+
+
+def test_ics_escapes_and_folds_text():
+    row = collections.namedtuple("Row", [
+        "id", "client_nom", "client_email", "client_telephone",
+        "date_debut", "date_fin", "id_support", "support_nom",
+        "support_prenom", "lieu", "nombre_participants", "notes",
+    ])(
+        7, "Dupont, Martin", "d@example.com", "0600000000",
+        datetime.date(2025, 1, 1), datetime.date(2025, 1, 1), None, None,
+        None, "Salle A; étage 2", 10, "é" * 80
+    )
+    stream = io.BytesIO()
+
+    write_ics(stream, [row])
+
+    text = stream.getvalue().decode("utf-8")
+    assert "SUMMARY:Événement 7 - Dupont\\, Martin\r\n" in text
+    assert "LOCATION:Salle A\\; étage 2\r\n" in text
+    assert "\r\n " in text
+    unfolded = text.replace("\r\n ", "")
+    assert "Notes : " + "é" * 80 + "\r\n" in unfolded
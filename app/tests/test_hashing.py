@@ -0,0 +1,72 @@
+import datetime
+import io
+from argon2 import PasswordHasher
+from app.auth import hashing, permissions
+from app.auth.context import AuthContext
+from app.db.models import Collaborateur
+from app.services.collaborateur_service import import_collaborateurs
+from app.tests.conftest import seed_crm
+from app.utils.records import read_records
+
+
+def test_hasher_uses_settings_parameters():
+    assert hashing.argon2_parameters() == {
+        "time_cost": 1, "memory_cost": 1024, "parallelism": 1
+    }
+    assert "m=1024,t=1,p=1" in hashing.hash_password("secret")
+
+
+def test_hash_passwords_in_process_pool():
+    passwords = [f"motdepasse{i}" for i in range(6)]
+
+    hashes = hashing.hash_passwords(passwords, workers=2)
+
+    verifier = PasswordHasher()
+    assert len(set(hashes)) == 6
+    for password, password_hash in zip(passwords, hashes):
+        assert verifier.verify(password_hash, password)
+        assert "m=1024,t=1,p=1" in password_hash
+
+
+def test_strong_hash_rehash_deferred_on_login():
+    strong_hash = PasswordHasher().hash("secret")
+    collaborateur = Collaborateur(id=7, password_hash=strong_hash)
+
+    with hashing.deferred_rehashes():
+        assert collaborateur.verify_password("secret")
+        assert collaborateur.password_hash == strong_hash
+        assert hashing.pop_pending_rehashes() == [
+            (7, strong_hash, "secret")
+        ]
+    # Hors d'un bloc de connexion, aucun mot de passe n'est conservé
+    assert collaborateur.verify_password("secret")
+    assert hashing.pop_pending_rehashes() == []
+
+
+def test_import_collaborateurs(db, monkeypatch):
+    ids = seed_crm(db, clients=1)
+    auth = AuthContext(
+        user_id=ids["gestion"], role="gestion", nom="Gestion1",
+        prenom="Test", expiry=datetime.datetime.max.replace(
+            tzinfo=datetime.timezone.utc
+        )
+    )
+    monkeypatch.setattr(permissions, "get_auth_context", lambda: auth)
+    stream = io.StringIO(
+        "nom,prenom,email,login,password,departement\n"
+        "durand,alice,alice@example.com,alice,secret1,support\n"
+        "martin,bob,bob@example.com,bob,secret2,3\n"
+        "doublon,x,x@example.com,support1,secret3,support\n"
+        "inconnu,y,y@example.com,yves,secret4,marketing\n"
+    )
+
+    report = import_collaborateurs(
+        db, auth, read_records(stream, "csv"), chunk_size=2, workers=2
+    )
+
+    assert report.inserted == 2
+    assert sorted(lineno for lineno, _ in report.errors) == [4, 5]
+    alice = db.query(Collaborateur).filter_by(login="alice").one()
+    assert alice.nom == "Durand"
+    assert alice.departement.nom == "support"
+    assert alice.verify_password("secret1")
@@ -0,0 +1,93 @@
+import datetime
+import io
+import pytest
+from app.auth import permissions
+from app.auth.context import AuthContext
+from app.db.models import Client
+from app.services.client_service import import_clients
+from app.tests.conftest import seed_crm
+from app.utils.records import read_records
+
+CSV_HEADER = "nom_complet,email,telephone,nom_entreprise\n"
+
+
+@pytest.fixture
+def commercial(db, monkeypatch):
+    ids = seed_crm(db, clients=2)
+    auth = AuthContext(
+        user_id=ids["commerciaux"][0], role="commercial", nom="Commercial1",
+        prenom="Test", expiry=datetime.datetime.max.replace(
+            tzinfo=datetime.timezone.utc
+        )
+    )
+    monkeypatch.setattr(permissions, "get_auth_context", lambda: auth)
+    return auth
+
+
+def csv_records(*lines):
+    return read_records(io.StringIO(CSV_HEADER + "".join(lines)), "csv")
+
+
+def test_import_reports_row_errors_without_aborting(db, commercial):
+    records = csv_records(
+        "jean dupont,Jean@Example.com,0601020304,acme\n",
+        "sans email,pas-un-email,,\n",
+        "doublon,jean@example.com,,\n",
+        "existant,client0@example.com,,\n",
+        "marie curie,marie@example.com,,\n",
+    )
+
+    report = import_clients(db, commercial, records, chunk_size=2)
+
+    assert report.inserted == 2
+    assert [lineno for lineno, _ in report.errors] == [3, 4, 5]
+    client = db.query(Client).filter_by(email="jean@example.com").one()
+    assert client.nom_complet == "Jean Dupont"
+    assert client.id_commercial == commercial.user_id
+    assert client.date_creation is not None
+
+
+def test_import_jsonl(db, commercial):
+    stream = io.StringIO(
+        '{"nom_complet": "a b", "email": "ab@example.com"}\n'
+        "\n"
+        "{pas du json}\n"
+    )
+
+    report = import_clients(db, commercial, read_records(stream, "jsonl"))
+
+    assert report.inserted == 1
+    assert report.errors[0][0] == 3
+
+
+def test_import_two_queries_per_chunk(db, commercial, query_counter):
+    records = csv_records(*(
+        f"client {i},import{i}@example.com,,\n" for i in range(250)
+    ))
+    query_counter.clear()
+
+    report = import_clients(db, commercial, records, chunk_size=100)
+
+    assert report.inserted == 250
+    selects = [q for q in query_counter if q.startswith("SELECT")]
+    inserts = [q for q in query_counter if q.startswith("INSERT")]
+    assert len(selects) == 3
+    assert len(inserts) == 3
+
+
+def test_import_rejected_chunk_falls_back_to_rows(db, commercial, monkeypatch):
+    # Email inséré entre la vérification et l'insertion du lot
+    monkeypatch.setattr(
+        "app.services.client_service.get_existing_emails",
+        lambda db, emails: set()
+    )
+    records = csv_records(
+        "nouveau,nouveau@example.com,,\n",
+        "concurrent,client1@example.com,,\n",
+    )
+
+    report = import_clients(db, commercial, records)
+
+    assert report.inserted == 1
+    assert report.errors[0][0] == 3
+    assert db.query(Client).filter_by(email="nouveau@example.com").count()
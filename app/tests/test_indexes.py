@@ -0,0 +1,99 @@
+import datetime
+import pathlib
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import create_engine, inspect, select
+
+from app.crud.clients import query_clients
+from app.crud.contrats import query_contrats
+from app.crud.evenements import query_evenements
+from app.db.models import Contrat, Evenement
+from app.tests.conftest import seed_crm
+
+ROOT = pathlib.Path(__file__).resolve().parents[2]
+
+
+def explain(db, query):
+    """Retourne le plan d'exécution SQLite d'une requête (ORM ou select)."""
+    statement = getattr(query, "statement", query).compile(
+        db.get_bind(), compile_kwargs={"literal_binds": True}
+    )
+    rows = db.connection().exec_driver_sql(
+        f"EXPLAIN QUERY PLAN {statement}"
+    ).fetchall()
+    return " | ".join(row[-1] for row in rows)
+
+
+def index_names(connection):
+    inspector = inspect(connection)
+    return {
+        table: {index["name"] for index in inspector.get_indexes(table)}
+        for table in inspector.get_table_names()
+        if table != "alembic_version"
+    }
+
+
+def test_migrations_match_models(engine):
+    migrated = create_engine("sqlite://")
+    config = Config(str(ROOT / "alembic.ini"))
+    config.set_main_option("script_location", str(ROOT / "migrations"))
+
+    with migrated.begin() as connection:
+        config.attributes["connection"] = connection
+        command.upgrade(config, "head")
+        migrated_indexes = index_names(connection)
+
+    with engine.connect() as connection:
+        assert migrated_indexes == index_names(connection)
+
+
+def test_clients_by_commercial_uses_index(db):
+    seed_crm(db, clients=20)
+    plan = explain(db, query_clients(db, commercial_id=2))
+    assert "ix_clients_id_commercial" in plan
+
+
+def test_evenements_by_support_uses_index(db):
+    seed_crm(db, clients=20)
+    plan = explain(db, query_evenements(db, support_id=4))
+    assert "ix_evenements_id_support" in plan
+
+
+def test_unassigned_evenements_use_partial_index(db):
+    seed_crm(db, clients=20)
+    # Sans statistiques, SQLite préfère l'index sur id_support
+    db.connection().exec_driver_sql("ANALYZE")
+    query = query_evenements(db, unassigned=True).order_by(
+        Evenement.date_debut
+    )
+    assert "ix_evenements_sans_support" in explain(db, query)
+
+
+def test_contrats_by_client_and_status_use_composite_index(db):
+    seed_crm(db, clients=20)
+    query = query_contrats(db, statut=True).filter(Contrat.id_client == 3)
+    assert "ix_contrats_id_client_statut" in explain(db, query)
+
+
+def test_support_conflict_check_uses_index(db):
+    seed_crm(db, clients=20)
+    debut, fin = datetime.date(2025, 6, 1), datetime.date(2025, 6, 3)
+    plan = explain(db, (
+        select(Evenement.id, Evenement.date_debut, Evenement.date_fin)
+        .where(Evenement.id_support == 4, Evenement.date_debut <= fin,
+               Evenement.date_fin >= debut)
+        .order_by(Evenement.date_debut.desc())
+        .limit(1)
+    ))
+    assert "ix_evenements_support_dates" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+def test_evenements_by_period_use_date_index(db):
+    seed_crm(db, clients=20)
+    db.connection().exec_driver_sql("ANALYZE")
+    query = query_evenements(
+        db, date_from=datetime.date(2025, 1, 10),
+        date_to=datetime.date(2025, 1, 16)
+    )
+    assert "ix_evenements_date_debut" in explain(db, query)
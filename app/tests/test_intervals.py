@@ -0,0 +1,51 @@
+import random
+import pytest
+from app.utils.intervals import IntervalTree
+
+
+def test_find_overlap_matches_brute_force():
+    rng = random.Random(3)
+    intervals = []
+    for i in range(500):
+        start = rng.randrange(10000)
+        intervals.append((start, start + rng.randrange(30), i))
+    tree = IntervalTree(intervals, seed=1)
+
+    for _ in range(2000):
+        start = rng.randrange(10000)
+        end = start + rng.randrange(10)
+        expected = {value for a, b, value in intervals
+                    if a <= end and start <= b}
+        found = tree.find_overlap(start, end)
+        if expected:
+            assert found is not None and found[2] in expected
+        else:
+            assert found is None
+    assert len(tree) == 500
+
+
+def test_shared_bound_overlaps():
+    tree = IntervalTree([(1, 3, "a")])
+
+    assert tree.find_overlap(3, 5) == (1, 3, "a")
+    assert tree.find_overlap(4, 5) is None
+    with pytest.raises(ValueError):
+        tree.add(5, 4)
+
+
+def test_overlapping_matches_brute_force():
+    rng = random.Random(5)
+    intervals = []
+    for i in range(300):
+        start = rng.randrange(3000)
+        intervals.append((start, start + rng.randrange(40), i))
+    tree = IntervalTree(intervals, seed=2)
+
+    for _ in range(500):
+        start = rng.randrange(3000)
+        end = start + rng.randrange(20)
+        expected = sorted(
+            (a, b, value) for a, b, value in intervals
+            if a <= end and start <= b
+        )
+        assert sorted(tree.overlapping(start, end)) == expected
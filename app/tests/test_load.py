@@ -0,0 +1,122 @@
+import random
+import pytest
+from sqlalchemy import create_engine, func, select
+from sqlalchemy.orm import sessionmaker
+import load_test
+import seed_data
+from app.auth import permission_index
+from app.auth.permission_index import PermissionIndex
+from app.cli import main as cli_main
+from app.db import session as db_session
+from app.db.base import Base
+from app.db.session import enable_sqlite_savepoints
+from app.db.models import Client, Contrat, Evenement
+from app.db.models.collaborateur import Departement
+from app.utils.latency import percentile, summarize
+
+
+@pytest.fixture
+def departements(db):
+    db.add_all(Departement(nom=nom)
+               for nom in ("gestion", "support", "commercial"))
+    db.commit()
+
+
+def test_generate_data_reproducible(db, departements):
+    counts = seed_data.generate_data(
+        db, 300, contrats_per_client=2, commerciaux=5, supports=3, seed=7,
+        chunk_size=100
+    )
+
+    assert counts["clients"] == db.scalar(select(func.count(Client.id)))
+    assert counts["contrats"] == db.scalar(select(func.count(Contrat.id)))
+    assert 400 < counts["contrats"] < 800
+    # Événements uniquement pour des contrats signés
+    assert db.scalar(
+        select(func.count(Evenement.id)).join(Contrat)
+        .where(Contrat.statut.is_(False))
+    ) == 0
+    # Répartition inégale des clients entre commerciaux
+    per_commercial = sorted(db.scalars(
+        select(func.count(Client.id)).group_by(Client.id_commercial)
+    ))
+    assert per_commercial[-1] > 2 * per_commercial[0]
+
+    names = list(db.scalars(select(Client.nom_complet).order_by(Client.id)))
+    db.execute(Evenement.__table__.delete())
+    db.execute(Contrat.__table__.delete())
+    db.execute(Client.__table__.delete())
+    db.commit()
+    seed_data.generate_data(db, 300, commerciaux=5, supports=3, seed=7)
+    assert list(db.scalars(
+        select(Client.nom_complet).order_by(Client.id)
+    )) == names
+
+
+def test_load_harness_reports_each_command(db, engine, departements,
+                                           monkeypatch):
+    seed_data.generate_data(db, 50, commerciaux=2, supports=2, seed=1)
+    monkeypatch.setattr(
+        db_session, "SessionLocal", sessionmaker(bind=engine, autoflush=False)
+    )
+    monkeypatch.setattr(permission_index, "_index", PermissionIndex({
+        "gestion": ["clients", "contrats", "evenements"]
+    }))
+    auth = load_test.gestion_context(db)
+    harness = load_test.LoadHarness(
+        cli_main.cli, db, auth, random.Random(3), page_size=10
+    )
+    unassigned = len(harness.unassigned)
+
+    samples, failures = harness.run(
+        30, load_test.parse_mix("clients=1,contrats=1,assign=1")
+    )
+
+    assert set(samples) == set(load_test.OPERATIONS.values())
+    assert sum(len(durations) for durations in samples.values()) <= 30
+    assert failures == dict.fromkeys(samples, 0)
+    assigned = len(samples["evenements assign_support"])
+    assert len(harness.unassigned) + harness.skipped == \
+        unassigned - assigned
+    db.expire_all()
+    assert db.scalar(
+        select(func.count(Evenement.id)).where(Evenement.id_support.is_(None))
+    ) == unassigned - assigned
+
+
+def test_load_harness_assigns_on_file_database(tmp_path, monkeypatch):
+    # Base fichier : le verrou SQLite s'applique entre les connexions
+    engine = create_engine(f"sqlite:///{tmp_path / 'crm.db'}")
+    enable_sqlite_savepoints(engine)
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(bind=engine, autoflush=False)
+    monkeypatch.setattr(db_session, "SessionLocal", factory)
+    monkeypatch.setattr(permission_index, "_index", PermissionIndex({
+        "gestion": ["evenements"]
+    }))
+    with factory() as db:
+        db.add_all(Departement(nom=nom)
+                   for nom in ("gestion", "support", "commercial"))
+        db.commit()
+        seed_data.generate_data(db, 20, commerciaux=2, supports=2, seed=1)
+        harness = load_test.LoadHarness(
+            cli_main.cli, db, load_test.gestion_context(db),
+            random.Random(3)
+        )
+        samples, failures = harness.run(
+            1, load_test.parse_mix("assign=1")
+        )
+
+    assert len(samples["evenements assign_support"]) == 1
+    assert failures == {"evenements assign_support": 0}
+    assert harness.errors == {}
+    engine.dispose()
+
+
+def test_percentiles():
+    samples = [float(i) for i in range(1, 101)]
+    assert percentile(samples, 50) == 50
+    assert percentile(samples, 99) == 99
+    assert summarize([]) == {
+        "count": 0, "p50": 0.0, "p95": 0.0, "p99": 0.0, "max": 0.0
+    }
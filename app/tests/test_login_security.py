@@ -0,0 +1,185 @@
+import io
+import pytest
+from argon2 import PasswordHasher
+from click.testing import CliRunner
+from sqlalchemy.orm import sessionmaker
+from app.auth import hashing
+from app.auth import login as login_module
+from app.auth import rehash
+from app.auth.login import authentifier_collaborateur, login
+from app.cli.auth import auth_group
+from app.auth.rate_limit import LoginRateLimiter
+from app.crud.collaborateurs import apply_pending_rehashes
+from app.db import session as db_session
+from app.db.models import Collaborateur
+from app.tests.conftest import seed_crm
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def make_limiter(tmp_path, clock, **limits):
+    limits.setdefault("window", 60)
+    limits.setdefault("max_attempts", 3)
+    limits.setdefault("max_per_client", 10)
+    return LoginRateLimiter(
+        path=str(tmp_path / "attempts.db"), clock=clock, **limits
+    )
+
+
+def test_limiter_sliding_window_and_reset(tmp_path, monkeypatch):
+    monkeypatch.delenv("SSH_CLIENT", raising=False)
+    clock = Clock()
+    limiter = make_limiter(tmp_path, clock)
+
+    for _ in range(3):
+        assert limiter.retry_after("alice") == 0
+        limiter.record_failure("alice")
+        clock.now += 10
+    assert limiter.retry_after("alice") == 31
+    assert limiter.retry_after("bob") == 0
+
+    clock.now += 31
+    assert limiter.retry_after("alice") == 0
+
+    limiter.record_failure("alice")
+    limiter.reset("alice")
+    assert limiter.retry_after("alice") == 0
+
+
+def test_limiter_per_client(tmp_path, monkeypatch):
+    monkeypatch.setenv("SSH_CLIENT", "10.0.0.5 50000 22")
+    limiter = make_limiter(tmp_path, Clock(), max_per_client=4)
+
+    for i in range(4):
+        limiter.record_failure(f"login{i}")
+
+    assert limiter.retry_after("autre") > 0
+    monkeypatch.setenv("SSH_CLIENT", "10.0.0.6 50000 22")
+    assert limiter.retry_after("autre") == 0
+
+
+def test_login_blocked_without_verifying(db, tmp_path, monkeypatch,
+                                         capsys):
+    monkeypatch.delenv("SSH_CLIENT", raising=False)
+    seed_crm(db, clients=0)
+    db.query(Collaborateur).filter_by(login="gestion1").update(
+        {"password_hash": hashing.hash_password("secret")}
+    )
+    db.commit()
+    limiter = make_limiter(tmp_path, Clock(), max_attempts=2)
+    for _ in range(2):
+        assert login(db, "gestion1", "mauvais", limiter=limiter) is None
+
+    def verify_password(self, password, db=None):
+        raise AssertionError("Argon2 ne doit pas être appelé")
+
+    monkeypatch.setattr(Collaborateur, "verify_password", verify_password)
+    assert login(db, "gestion1", "secret", limiter=limiter) is None
+    assert "Trop de tentatives" in capsys.readouterr().out
+
+
+def test_apply_pending_rehashes_skips_changed_hash(db):
+    seed_crm(db, clients=0)
+    strong_hash = PasswordHasher().hash("secret")
+    db.query(Collaborateur).update({"password_hash": strong_hash})
+    db.commit()
+    gestion = db.query(Collaborateur).filter_by(login="gestion1").one()
+    support = db.query(Collaborateur).filter_by(login="support1").one()
+    with hashing.deferred_rehashes():
+        assert gestion.verify_password("secret")
+        assert support.verify_password("secret")
+        # Mot de passe changé entre la connexion et la mise à niveau
+        support.password_hash = hashing.hash_password("nouveau")
+        db.commit()
+
+        assert apply_pending_rehashes(db) == 1
+
+    db.expire_all()
+    assert "m=1024,t=1,p=1" in gestion.password_hash
+    assert gestion.verify_password("secret")
+    assert support.verify_password("nouveau")
+    assert hashing.pop_pending_rehashes() == []
+
+
+@pytest.mark.parametrize("failure", ["invalid", "exception"])
+def test_login_command_leaves_no_plaintext(monkeypatch, failure):
+    seen = []
+
+    def failing_login(db, username, password):
+        # Hash à mettre à niveau signalé, puis connexion en échec
+        hashing.schedule_rehash(1, "ancien hash", password)
+        seen.append(hashing._pending_rehashes.get())
+        if failure == "exception":
+            raise RuntimeError("base indisponible")
+        return None
+
+    monkeypatch.setattr(login_module, "login", failing_login)
+
+    CliRunner().invoke(auth_group, [
+        "login", "--username", "gestion1", "--password", "secret"
+    ])
+
+    assert seen == [[]]
+    assert hashing._pending_rehashes.get() is None
+    assert hashing.pop_pending_rehashes() == []
+
+
+class FakeProcess:
+    """Processus de mise à niveau simulé : l'entrée est conservée."""
+    launched = []
+
+    def __init__(self, args, **kwargs):
+        self.args = args
+        self.stdin = self
+        self.payload = b""
+        FakeProcess.launched.append(self)
+
+    def write(self, data):
+        self.payload += data
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def test_login_command_returns_before_rehash(db, engine, monkeypatch):
+    seed_crm(db, clients=0)
+    strong_hash = PasswordHasher().hash("secret")
+    db.query(Collaborateur).update({"password_hash": strong_hash})
+    db.commit()
+    factory = sessionmaker(bind=engine, autoflush=False)
+    monkeypatch.setattr(db_session, "SessionLocal", factory)
+    monkeypatch.setattr(
+        login_module, "login",
+        lambda db, username, password: (
+            "jeton" if authentifier_collaborateur(db, username, password)
+            else None
+        )
+    )
+    FakeProcess.launched.clear()
+    monkeypatch.setattr(rehash.subprocess, "Popen", FakeProcess)
+
+    result = CliRunner().invoke(auth_group, [
+        "login", "--username", "gestion1", "--password", "secret"
+    ])
+
+    assert "Connexion réussie" in result.output
+    # La commande a rendu la main sans hacher : le hash est inchangé
+    db.expire_all()
+    gestion = db.query(Collaborateur).filter_by(login="gestion1").one()
+    assert gestion.password_hash == strong_hash
+    [process] = FakeProcess.launched
+    assert process.args[1:] == ["-m", "app.auth.rehash"]
+
+    assert rehash.main(io.BytesIO(process.payload), factory) == 1
+    db.expire_all()
+    assert "m=1024,t=1,p=1" in gestion.password_hash
+    assert gestion.verify_password("secret")
@@ -0,0 +1,97 @@
+import datetime
+import click
+import pytest
+from click.testing import CliRunner
+from app.auth import permission_index, permissions
+from app.auth.context import AuthContext
+from app.auth.permission_index import PermissionIndex
+from app.utils.config import CustomGroup
+
+
+def test_index_groups_and_subcommands():
+    index = PermissionIndex({
+        "gestion": ["auth", "clients"],
+        "support": ["auth", "clients list", "clients show"],
+    })
+
+    assert index.allows("gestion", ["clients", "create"])
+    assert index.allows("support", ["clients"])
+    assert index.allows("support", ["clients", "list"])
+    assert not index.allows("support", ["clients", "create"])
+    # Pas de correspondance sur un simple préfixe de nom
+    assert not index.allows("gestion", ["authx"])
+    assert not index.allows("inconnu", ["auth"])
+    assert index.commands("support") == ["auth", "clients list",
+                                         "clients show"]
+
+
+@pytest.fixture
+def support_cli(monkeypatch):
+    """CLI minimale enregistrant l'index comme CustomCLI."""
+    auth = AuthContext(
+        user_id=1, role="support", nom="Test", prenom="Test",
+        expiry=datetime.datetime.max.replace(tzinfo=datetime.timezone.utc)
+    )
+    monkeypatch.setattr(permission_index, "get_auth_context", lambda: auth)
+    monkeypatch.setattr(permissions, "get_auth_context", lambda: auth)
+    index = PermissionIndex({"support": ["clients list", "clients show"]})
+
+    @click.group()
+    @click.pass_context
+    def cli(ctx):
+        ctx.meta[permission_index.META_KEY] = index
+
+    @cli.group(name="clients", cls=CustomGroup)
+    def clients():
+        pass
+
+    @clients.command(name="list")
+    def list_clients():
+        click.echo("liste")
+
+    @clients.command(name="create")
+    def create_client():
+        click.echo("créé")
+
+    @clients.command(name="show")
+    @permissions.role_required(["support"])
+    def show_client():
+        click.echo("détail")
+
+    return cli, index
+
+
+def test_subcommands_checked_at_dispatch(support_cli):
+    cli, _ = support_cli
+    runner = CliRunner()
+
+    assert runner.invoke(cli, ["clients", "list"]).output == "liste\n"
+
+    result = runner.invoke(cli, ["clients", "create"])
+    assert result.exit_code == 1
+    assert "Accès refusé" in result.output
+    assert "créé" not in result.output
+
+    help_output = runner.invoke(cli, ["clients", "--help"]).output
+    assert "list" in help_output and "create" not in help_output
+
+
+def test_role_required_uses_shared_index(support_cli, capsys):
+    cli, index = support_cli
+    clients = cli.commands["clients"]
+    show = clients.commands["show"]
+
+    def run_show(index):
+        root = click.Context(cli, info_name="main.py")
+        root.meta[permission_index.META_KEY] = index
+        group = click.Context(clients, info_name="clients", parent=root)
+        with click.Context(show, info_name="show", parent=group):
+            show.callback()
+
+    run_show(index)
+    assert capsys.readouterr().out == "détail\n"
+
+    # Appel direct de la commande, sans passer par la résolution du groupe
+    run_show(PermissionIndex({"support": ["clients list"]}))
+    out = capsys.readouterr().out
+    assert "Accès refusé" in out and "détail" not in out
@@ -0,0 +1,63 @@
+import logging
+import pytest
+from sqlalchemy import event, text
+from app.core.config import settings
+from app.db import profiling
+from app.db.models import Client
+from app.tests.conftest import seed_crm
+
+
+@pytest.fixture
+def profiled_engine(engine, monkeypatch):
+    monkeypatch.setattr(profiling, "_enabled", True)
+    profiling.install(engine)
+    profiling.install(engine)
+    yield engine
+    event.remove(engine, "before_cursor_execute", profiling.before_execute)
+    event.remove(engine, "after_cursor_execute", profiling.after_execute)
+
+
+def list_client_commerciaux(db):
+    # N+1 volontaire : une requête par client pour son commercial
+    return [client.commercial.nom for client in db.query(Client).all()]
+
+
+def test_command_profile_counts_repeated_queries(db, profiled_engine,
+                                                 capsys):
+    seed_crm(db, clients=4)
+
+    with profiling.command_profile("clients list") as profile:
+        with profiling.command_profile("imbriquée") as nested:
+            assert nested is None
+            list_client_commerciaux(db)
+
+    assert profile.count == 3
+    (statement, (count, total, longest)), *_ = profile.top()
+    assert "FROM collaborateurs" in statement and count == 2
+    err = capsys.readouterr().err
+    assert "clients list : 3 requête(s) SQL" in err
+
+
+def test_disabled_profile_records_nothing(db, profiled_engine, monkeypatch,
+                                          capsys):
+    monkeypatch.setattr(profiling, "_enabled", False)
+    with profiling.command_profile("clients list") as profile:
+        db.execute(text("SELECT 1"))
+
+    assert profile is None
+    assert capsys.readouterr().err == ""
+
+
+def test_slow_query_logged_with_call_site(db, profiled_engine, monkeypatch,
+                                          caplog):
+    monkeypatch.setattr(settings, "SLOW_QUERY_MS", 0)
+    seed_crm(db, clients=1)
+    caplog.clear()
+
+    with caplog.at_level(logging.WARNING, logger="app.db.profiling"):
+        db.query(Client).filter(Client.email == "client0@example.com").all()
+
+    message = caplog.records[-1].getMessage()
+    assert "Requête lente" in message
+    assert "app/tests/test_profiling.py" in message
+    assert "client0@example.com" in message
@@ -0,0 +1,128 @@
+import datetime
+from app.crud.evenements import (
+    get_all_evenements, get_evenements_by_support,
+    get_evenements_without_support, query_evenements
+)
+from app.crud.contrats import query_contrats
+from app.crud.pagination import paginate
+from app.db.models import Evenement
+from app.tests.conftest import seed_crm
+
+
+def render(evenements):
+    """Accède aux mêmes relations que `evenements list`."""
+    return [
+        (evt.contrat.client.nom_complet,
+         f"{evt.support.nom} {evt.support.prenom}"
+         if evt.support else "Non attribué")
+        for evt in evenements
+    ]
+
+
+def test_list_profile_all_evenements_single_query(db, query_counter):
+    seed_crm(db, clients=30)
+    query_counter.clear()
+
+    rows = render(get_all_evenements(db, profile="list"))
+
+    assert len(rows) == 30
+    assert len(query_counter) == 1
+
+
+def test_list_profile_by_support_single_query(db, query_counter):
+    ids = seed_crm(db, clients=30)
+    query_counter.clear()
+
+    rows = render(get_evenements_by_support(
+        db, ids["supports"][1], profile="list"
+    ))
+
+    assert rows
+    assert len(query_counter) == 1
+
+
+def test_list_profile_unassigned_single_query(db, query_counter):
+    seed_crm(db, clients=30)
+    query_counter.clear()
+
+    rows = render(get_evenements_without_support(db, profile="list"))
+
+    assert rows
+    assert all(support == "Non attribué" for _, support in rows)
+    assert len(query_counter) == 1
+
+
+def test_without_profile_lazy_loads(db, query_counter):
+    seed_crm(db, clients=10)
+    query_counter.clear()
+
+    render(get_all_evenements(db))
+
+    assert len(query_counter) > 1
+
+
+def test_query_contrats_single_joined_select(db, query_counter):
+    seed_crm(db, clients=20, contrats_per_client=2)
+    query_counter.clear()
+
+    contrats = query_contrats(db).all()
+    rows = [(c.client.nom_complet, c.client.commercial.nom) for c in contrats]
+
+    assert len(rows) == 40
+    assert [nom for nom, _ in rows] == sorted(nom for nom, _ in rows)
+    assert len(query_counter) == 1
+
+
+def test_query_contrats_filters(db):
+    ids = seed_crm(db, clients=20, contrats_per_client=2)
+    commercial_id = ids["commerciaux"][0]
+
+    contrats = query_contrats(
+        db, statut=False, unpaid=True, commercial_id=commercial_id
+    ).all()
+
+    assert contrats
+    for contrat in contrats:
+        assert contrat.statut is False
+        assert contrat.montant_restant > 0
+        assert contrat.client.id_commercial == commercial_id
+
+
+def test_query_evenements_filters(db):
+    seed_crm(db, clients=10)
+    # Événement du client i : le 01/01/2025 + 3 i jours, 10 + i participants
+
+    def lieux(**filters):
+        return [evt.lieu for evt in
+                query_evenements(db, **filters).order_by(Evenement.id)]
+
+    periode = {"date_from": datetime.date(2025, 1, 7),
+               "date_to": datetime.date(2025, 1, 19)}
+    assert lieux(**periode) == [f"Lieu {i}" for i in range(2, 7)]
+    assert lieux(**periode, min_participants=14) == [
+        "Lieu 4", "Lieu 5", "Lieu 6"
+    ]
+    assert lieux(**periode, lieu="lieu 5") == ["Lieu 5"]
+    assert lieux(client_id=8) == ["Lieu 7"]
+
+
+def test_paginate_keyset(db):
+    seed_crm(db, clients=12)
+    query = query_evenements(db, profile="list")
+
+    first = paginate(query, Evenement.id, page_size=5)
+    second = paginate(query, Evenement.id, after_id=first[-1].id,
+                      page_size=5)
+
+    assert [e.id for e in first] == sorted(e.id for e in first)
+    assert len(first) == len(second) == 5
+    assert second[0].id > first[-1].id
+
+
+def test_paginate_stream_is_lazy(db):
+    seed_crm(db, clients=12)
+
+    rows = paginate(query_evenements(db), Evenement.id, stream=True)
+
+    assert not isinstance(rows, list)
+    assert len(list(rows)) == 12
@@ -0,0 +1,53 @@
+import datetime
+from app.auth import permissions
+from app.auth.context import AuthContext
+from app.services.collaborateur_service import (
+    create_new_collaborateur, list_supports
+)
+from app.services.reference_data import ReferenceCache, get_departement_id
+from app.tests.conftest import seed_crm
+
+
+def test_reference_cache_ttl_and_version():
+    now = [0.0]
+    cache = ReferenceCache(ttl=10, clock=lambda: now[0])
+    loads = []
+
+    def loader():
+        loads.append(now[0])
+        return len(loads)
+
+    assert cache.get("key", loader) == 1
+    now[0] = 5
+    assert cache.get("key", loader) == 1
+    cache.invalidate()
+    assert cache.get("key", loader) == 2
+    now[0] = 20
+    assert cache.get("key", loader) == 3
+
+
+def test_supports_cached_until_collaborateur_created(
+    db, query_counter, monkeypatch
+):
+    ids = seed_crm(db, clients=0)
+    auth = AuthContext(
+        user_id=ids["gestion"], role="gestion", nom="Gestion1",
+        prenom="Test", expiry=datetime.datetime.max.replace(
+            tzinfo=datetime.timezone.utc
+        )
+    )
+    monkeypatch.setattr(permissions, "get_auth_context", lambda: auth)
+
+    assert [s.id for s in list_supports(db)] == ids["supports"]
+    query_counter.clear()
+    assert [s.id for s in list_supports(db)] == ids["supports"]
+    assert query_counter == []
+
+    support = create_new_collaborateur(
+        db, auth, "Neuf", "Support", "neuf@example.com",
+        get_departement_id(db, "support"), "neuf", "secret"
+    )
+
+    assert [s.id for s in list_supports(db)] == [
+        *ids["supports"], support.id
+    ]
@@ -0,0 +1,128 @@
+import datetime
+import pytest
+import seed_data
+from app.auth import permissions
+from app.auth.context import AuthContext
+from app.core.config import settings
+from app.crud.clients import update_client
+from app.crud.collaborateurs import delete_collaborateur
+from app.crud.contrats import create_contrat, delete_contrat, update_contrat
+from app.crud.reports import (
+    rebuild_revenue_summary, revenue_by_commercial, revenue_by_month
+)
+from app.db.models.collaborateur import Departement
+from app.db.models.revenu import SANS_VALEUR
+from app.services.report_service import revenue_report
+from app.tests.conftest import seed_crm
+
+
+def totals(rows, *keys):
+    return {
+        tuple(getattr(row, key) for key in keys): (
+            row.nb_contrats, row.nb_signes, row.montant_total,
+            row.montant_signe, row.montant_restant
+        )
+        for row in rows
+    }
+
+
+@pytest.fixture
+def summary(monkeypatch):
+    monkeypatch.setattr(settings, "REVENUE_SUMMARY", True)
+
+
+def test_revenue_by_commercial_and_month(db):
+    ids = seed_crm(db, clients=3, contrats_per_client=2)
+    month = datetime.date.today()
+
+    by_commercial = totals(revenue_by_commercial(db), "id_commercial")
+    by_month = totals(revenue_by_month(db), "annee", "mois")
+
+    first, second = ids["commerciaux"]
+    # Clients 0 et 2 au premier commercial (non signés), 1 au second
+    assert by_commercial == {
+        (first,): (4, 0, 4000.0, 0.0, 1000.0),
+        (second,): (2, 2, 2000.0, 2000.0, 500.0),
+    }
+    assert by_month == {
+        (month.year, month.month): (6, 2, 6000.0, 2000.0, 1500.0)
+    }
+
+
+def test_summary_follows_contract_writes(db, summary):
+    ids = seed_crm(db, clients=2)
+    rebuild_revenue_summary(db)
+
+    contrat = create_contrat(db, 1, 800.0)
+    update_contrat(db, contrat.id, statut=True, montant_restant=300.0)
+    delete_contrat(db, 2)
+
+    live = totals(revenue_by_commercial(db), "id_commercial")
+    assert totals(revenue_by_commercial(db, summary=True),
+                  "id_commercial") == live
+    assert live[(ids["commerciaux"][0],)] == (2, 1, 1800.0, 800.0, 300.0)
+    assert totals(revenue_by_month(db, summary=True), "annee", "mois") == \
+        totals(revenue_by_month(db), "annee", "mois")
+
+
+def test_summary_follows_commercial_changes(db, summary,
+                                            query_counter):
+    ids = seed_crm(db, clients=4, contrats_per_client=2)
+    rebuild_revenue_summary(db)
+    first, second = ids["commerciaux"]
+
+    def in_sync():
+        return totals(revenue_by_commercial(db, summary=True),
+                      "id_commercial") == \
+            totals(revenue_by_commercial(db), "id_commercial")
+
+    query_counter.clear()
+    update_client(db, 1, id_commercial=second)
+    assert in_sync()
+    # Écart ajouté par un upsert natif, sans UPDATE puis INSERT
+    assert any("ON CONFLICT" in statement for statement in query_counter)
+
+    delete_collaborateur(db, first)
+    assert in_sync()
+    assert (SANS_VALEUR,) in totals(
+        revenue_by_commercial(db, summary=True), "id_commercial"
+    )
+
+
+def test_summary_follows_generated_data(db, summary):
+    db.add_all(Departement(nom=nom)
+               for nom in ("gestion", "support", "commercial"))
+    db.commit()
+
+    seed_data.generate_data(db, 60, commerciaux=3, supports=1, seed=2,
+                            chunk_size=25)
+
+    def rounded(rows):
+        return {
+            key: tuple(round(value, 2) for value in values)
+            for key, values in totals(rows, "annee", "mois").items()
+        }
+
+    # Sommes cumulées par lot : l'ordre des additions diffère
+    assert rounded(revenue_by_month(db, summary=True)) == \
+        rounded(revenue_by_month(db))
+
+
+def test_revenue_report_reads_summary(db, summary, monkeypatch,
+                                      query_counter):
+    ids = seed_crm(db, clients=2)
+    auth = AuthContext(
+        user_id=ids["gestion"], role="gestion", nom="Gestion1",
+        prenom="Test", expiry=datetime.datetime.max.replace(
+            tzinfo=datetime.timezone.utc
+        )
+    )
+    monkeypatch.setattr(permissions, "get_auth_context", lambda: auth)
+
+    by_commercial, _ = revenue_report(db, auth, rebuild=True)
+    query_counter.clear()
+    revenue_report(db, auth)
+
+    assert len(by_commercial) == 2
+    assert not any("FROM contrats" in statement
+                   for statement in query_counter)
@@ -0,0 +1,59 @@
+from sqlalchemy import text
+from app.crud.clients import search_clients_query, update_client
+from app.db.models import Client
+from app.tests.conftest import seed_crm
+
+
+def add_client(db, nom, entreprise, email):
+    client = Client(
+        nom_complet=nom, email=email, telephone="0612345678",
+        nom_entreprise=entreprise
+    )
+    db.add(client)
+    db.commit()
+    return client.id
+
+
+def names(db, term):
+    return [client.nom_complet for client in search_clients_query(db, term)]
+
+
+def test_search_prefix_and_ranking(db):
+    seed_crm(db, clients=3)
+    add_client(db, "Zoé Morel", "Durand Conseil", "zoe@example.com")
+    add_client(db, "Hugo Morel", "Morel Industries", "hugo@example.com")
+
+    # Les deux mots correspondent : le client le plus pertinent d'abord
+    assert names(db, "morel indus") == ["Hugo Morel"]
+    assert names(db, "mor") == ["Hugo Morel", "Zoé Morel"]
+    # Accents ignorés, syntaxe FTS5 neutralisée
+    assert names(db, 'zoe "OR') == []
+    assert names(db, "zoe") == ["Zoé Morel"]
+    assert names(db, "0612") == ["Zoé Morel", "Hugo Morel"]
+
+
+def test_search_index_follows_updates(db):
+    client_id = add_client(db, "Jean Dupont", "Acme", "jean@example.com")
+
+    update_client(db, client_id, nom_entreprise="Globex")
+
+    assert names(db, "acme") == []
+    assert names(db, "globex") == ["Jean Dupont"]
+
+
+def test_search_without_fulltext_index(db):
+    add_client(db, "Jean Dupont", "Acme", "jean@example.com")
+    db.execute(text("DROP TABLE clients_fts"))
+
+    assert names(db, "dupo acm") == ["Jean Dupont"]
+
+
+def test_fulltext_index_inspected_once_per_engine(db, query_counter):
+    add_client(db, "Jean Dupont", "Acme", "jean@example.com")
+    assert names(db, "dupont") == ["Jean Dupont"]
+
+    query_counter.clear()
+    assert names(db, "acme") == ["Jean Dupont"]
+    # Une seule requête : la recherche, sans inspection du schéma
+    assert len(query_counter) == 1
+    assert "clients_fts MATCH" in query_counter[0]
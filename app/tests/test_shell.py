@@ -0,0 +1,150 @@
+import datetime
+import pytest
+from prompt_toolkit.completion import CompleteEvent
+from prompt_toolkit.document import Document
+from sqlalchemy.orm import sessionmaker
+
+from app.auth import permission_index
+from app.auth.context import AuthContext, auth_scope, get_auth_context
+from app.auth.jwt_utils import generate_token
+from app.cli.main import cli
+from app.cli.shell import (
+    REFRESH_MARGIN, IdCache, InteractiveShell, ShellCompleter
+)
+from app.crud.completion import get_completion_ids
+from app.db import session as db_session
+from app.utils import file_utils
+from app.tests.conftest import seed_crm
+
+
+@pytest.fixture
+def index(monkeypatch):
+    monkeypatch.setattr(
+        permission_index, "_index",
+        permission_index.PermissionIndex({
+            "commercial": ["clients", "evenements list"],
+        })
+    )
+
+
+@pytest.fixture
+def token_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(file_utils, "TOKEN_FILE", str(tmp_path / "token"))
+    monkeypatch.setattr(file_utils, "KEY_FILE", str(tmp_path / "key"))
+
+
+def completions(completer, text):
+    return [
+        completion.text for completion in completer.get_completions(
+            Document(text), CompleteEvent(completion_requested=True)
+        )
+    ]
+
+
+def as_user(user_id, role):
+    return AuthContext(
+        user_id, role, "Nom", "Prenom",
+        datetime.datetime.max.replace(tzinfo=datetime.timezone.utc)
+    )
+
+
+def test_completion_ids(db):
+    ids = seed_crm(db, clients=3)
+
+    loaded = get_completion_ids(db, as_user(ids["gestion"], "gestion"), 2)
+
+    assert [label for _, label in loaded["clients"]] == [
+        "Client 00002", "Client 00001"
+    ]
+    assert loaded["contrats"][0][1] == "Client 00002"
+    assert {int(id_) for id_, _ in loaded["supports"]} == set(ids["supports"])
+
+
+def test_completion_ids_scoped_by_role(db):
+    ids = seed_crm(db, clients=4)
+    commercial = ids["commerciaux"][0]
+    support = ids["supports"][0]
+
+    def loaded(auth):
+        return {
+            kind: sorted(int(id_) for id_, _ in values)
+            for kind, values in get_completion_ids(db, auth).items()
+        }
+
+    # Comme les listes du rôle : ses clients, ou ses événements
+    assert loaded(as_user(commercial, "commercial")) == {
+        "clients": [1, 3], "contrats": [1, 3], "evenements": [1, 3]
+    }
+    assert loaded(as_user(support, "support")) == {
+        "clients": [3], "contrats": [3], "evenements": [3]
+    }
+    assert loaded(None) == {}
+
+
+def test_warm_up_reserves_loading(monkeypatch):
+    started = []
+    monkeypatch.setattr(
+        "threading.Thread.start", lambda thread: started.append(thread)
+    )
+    ids = IdCache(loader=lambda auth: {}, auth=lambda: None)
+
+    InteractiveShell(cli, ids).warm_up()
+    # Chargement initial en cours : la complétion n'en lance pas un autre
+    assert ids.get("clients") == []
+    assert len(started) == 1
+
+
+def test_completer_filters_commands_and_suggests_ids(index):
+    ids = IdCache(loader=lambda auth: {"clients": [("12", "Client A")]})
+    ids.refresh()
+    completer = ShellCompleter(cli, ids, role=lambda: "commercial")
+
+    assert completions(completer, "") == ["clients", "evenements", "exit"]
+    assert completions(completer, "evenements ") == ["list"]
+    assert "--id" in completions(completer, "clients update --")
+    assert completions(completer, "clients update --id ") == ["12"]
+
+
+def test_expired_context_is_resolved_again(token_dir):
+    expired = AuthContext(
+        user_id=7, role="gestion", nom="Jean", prenom="Patrick",
+        expiry=datetime.datetime(2000, 1, 1, tzinfo=datetime.timezone.utc)
+    )
+    file_utils.save_token(generate_token(7, "support", "Jean", "Patrick"))
+
+    with auth_scope(expired):
+        assert get_auth_context().role == "support"
+
+
+def test_refresh_identity_near_expiry(db, engine, token_dir, monkeypatch):
+    ids = seed_crm(db)
+    monkeypatch.setattr(
+        db_session, "SessionLocal", sessionmaker(bind=engine)
+    )
+    shell = InteractiveShell(cli, IdCache(loader=lambda auth: {}))
+    soon = datetime.datetime.now(datetime.timezone.utc) + \
+        datetime.timedelta(minutes=1)
+
+    with auth_scope(AuthContext(
+        ids["gestion"], "gestion", "Gestion1", "Test", soon
+    )):
+        auth = shell.refresh_identity()
+
+    assert auth.user_id == ids["gestion"]
+    assert auth.expiry > soon + REFRESH_MARGIN
+
+
+def test_refresh_identity_deleted_collaborateur(engine, token_dir,
+                                                monkeypatch):
+    monkeypatch.setattr(
+        db_session, "SessionLocal", sessionmaker(bind=engine)
+    )
+    file_utils.save_token(generate_token(999, "gestion", "X", "Y"))
+    shell = InteractiveShell(cli, IdCache(loader=lambda auth: {}))
+    soon = datetime.datetime.now(datetime.timezone.utc) + \
+        datetime.timedelta(minutes=1)
+
+    with auth_scope(AuthContext(999, "gestion", "X", "Y", soon)):
+        assert shell.refresh_identity() is None
+
+    assert file_utils.load_token() is None
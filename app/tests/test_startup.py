@@ -0,0 +1,61 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Modules lourds qu'une commande sans accès à la base ne doit pas charger
+HEAVY_MODULES = ("sqlalchemy", "sentry_sdk", "argon2", "prompt_toolkit")
+
+# Budget d'import (ms) de la CLI, ajustable selon la machine
+STARTUP_BUDGET_MS = int(os.getenv("EPICEVENTS_STARTUP_BUDGET_MS", "1500"))
+
+
+def import_times(tmp_path, *args):
+    """
+    Lance `main.py` avec `-X importtime` et retourne, pour chaque module
+    importé, sa durée d'import cumulée en millisecondes.
+    """
+    env = dict(
+        os.environ, HOME=str(tmp_path), DATABASE_URL="sqlite://",
+        SENTRY_DSN=""
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "main.py", *args],
+        cwd=ROOT, env=env, capture_output=True, text=True, timeout=60
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+@pytest.fixture(scope="module")
+def auth_status_imports(tmp_path_factory):
+    return import_times(tmp_path_factory.mktemp("home"), "auth", "status")
+
+
+def test_auth_status_skips_heavy_modules(auth_status_imports):
+    loaded = {
+        name for name in auth_status_imports
+        if name.split(".")[0] in HEAVY_MODULES
+    }
+    assert not loaded
+
+
+def test_auth_status_within_budget(auth_status_imports):
+    assert auth_status_imports["app.cli.main"] < STARTUP_BUDGET_MS
+
+
+def test_db_command_loads_only_its_group(tmp_path):
+    times = import_times(tmp_path, "clients", "--help")
+
+    # importlib n'est pas tracé par -X importtime, ses dépendances le sont
+    assert "app.services.client_service" in times
+    assert "app.services.evenement_service" not in times
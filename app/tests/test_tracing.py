@@ -0,0 +1,99 @@
+import io
+import json
+from contextlib import contextmanager
+import pytest
+from rich.console import Console
+from sqlalchemy import event, text
+from app.utils import sentry, tracing
+from app.utils.rendering import print_table
+
+
+class FakeSentry:
+    """Enregistre les transactions et spans au lieu de les envoyer."""
+    def __init__(self):
+        self.calls = []
+
+    def start_transaction(self, **kwargs):
+        return self.record("transaction", kwargs)
+
+    def start_span(self, **kwargs):
+        return self.record("span", kwargs)
+
+    @contextmanager
+    def record(self, kind, kwargs):
+        self.calls.append((kind, kwargs))
+        yield
+
+
+@pytest.fixture
+def traces_file(tmp_path, monkeypatch):
+    path = tmp_path / "traces.jsonl"
+    monkeypatch.setattr(sentry, "TRACES_FILE", str(path))
+    monkeypatch.setattr(sentry, "TRACES_SAMPLE_RATE", 1.0)
+    return path
+
+
+def read_traces(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_local_exporter_writes_spans(db, engine, traces_file):
+    tracing.install(engine)
+    console = Console(file=io.StringIO())
+    try:
+        with tracing.command_transaction("clients list"):
+            with tracing.command_transaction("imbriquée") as nested:
+                assert nested is None
+                db.execute(text("SELECT 1"))
+            with tracing.span("auth", "token"):
+                pass
+            print_table(console, "Titre", [("ID", {})], [1, 2],
+                        lambda item: (str(item),))
+        with pytest.raises(ValueError):
+            with tracing.command_transaction("clients create"):
+                raise ValueError("échec")
+    finally:
+        event.remove(engine, "before_cursor_execute", tracing.before_execute)
+        event.remove(engine, "after_cursor_execute", tracing.after_execute)
+
+    listed, failed = read_traces(traces_file)
+    assert listed["transaction"] == "clients list"
+    assert listed["status"] == "ok"
+    assert [(s["op"], s["description"]) for s in listed["spans"]] == [
+        ("db", "SELECT 1"), ("auth", "token"),
+        ("render", "Tableau de 2 ligne(s)")
+    ]
+    assert failed["status"] == "internal_error"
+
+
+def test_sampling_and_sentry_transaction(traces_file, monkeypatch):
+    fake = FakeSentry()
+    monkeypatch.setattr(sentry, "sentry_sdk", fake)
+    monkeypatch.setattr(sentry, "SENTRY_DSN", "https://cle@exemple/1")
+
+    monkeypatch.setattr(sentry, "TRACES_SAMPLE_RATE", 0.0)
+    with tracing.command_transaction("clients list") as trace:
+        with tracing.span("render"):
+            pass
+    assert trace is None and fake.calls == []
+
+    monkeypatch.setattr(sentry, "TRACES_SAMPLE_RATE", 1.0)
+    with tracing.command_transaction("clients list"):
+        with tracing.span("render", "tableau"):
+            pass
+
+    assert fake.calls == [
+        ("transaction",
+         {"op": "cli.command", "name": "clients list", "sampled": True}),
+        ("span", {"op": "render", "name": "tableau"}),
+    ]
+    (trace,) = read_traces(traces_file)
+    assert trace["status"] == "ok"
+
+
+def test_tracing_disabled_without_dsn_or_file(monkeypatch):
+    monkeypatch.setattr(sentry, "SENTRY_DSN", None)
+    monkeypatch.setattr(sentry, "TRACES_FILE", None)
+    monkeypatch.setattr(sentry, "TRACES_SAMPLE_RATE", 1.0)
+    with tracing.command_transaction("clients list") as trace:
+        assert trace is None
@@ -0,0 +1,44 @@
+import datetime
+
+# Jours affichés en colonnes, du lundi au dimanche
+WEEKDAYS = ("Lun", "Mar", "Mer", "Jeu", "Ven", "Sam", "Dim")
+
+
+def calendar_period(day: datetime.date, month: bool = False):
+    """
+    Première et dernière date de la grille contenant `day` : sa semaine,
+    ou les semaines complètes (lundi à dimanche) qui couvrent son mois.
+    """
+    if month:
+        first = day.replace(day=1)
+        following = (first + datetime.timedelta(days=31)).replace(day=1)
+        last = following - datetime.timedelta(days=1)
+    else:
+        first = last = day
+    debut = first - datetime.timedelta(days=first.weekday())
+    fin = last + datetime.timedelta(days=6 - last.weekday())
+    return debut, fin
+
+
+def calendar_weeks(debut: datetime.date, fin: datetime.date):
+    """Semaines (listes de sept dates) de la grille [debut, fin]."""
+    weeks, day = [], debut
+    while day <= fin:
+        weeks.append([day + datetime.timedelta(days=i) for i in range(7)])
+        day += datetime.timedelta(days=7)
+    return weeks
+
+
+def events_by_day(evenements, debut: datetime.date, fin: datetime.date):
+    """
+    Répartit `evenements` (date_debut, date_fin...) sur chaque jour de la
+    grille [debut, fin] qu'ils occupent, dans l'ordre reçu.
+    """
+    days = {}
+    for evenement in evenements:
+        day = max(evenement.date_debut, debut)
+        last = min(evenement.date_fin, fin)
+        while day <= last:
+            days.setdefault(day, []).append(evenement)
+            day += datetime.timedelta(days=1)
+    return days
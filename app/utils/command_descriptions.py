@@ -17,20 +17,29 @@ COMMAND_DESCRIPTIONS = {
         "clients show": (
             "Afficher les détails d'un client par ID : ajouter l'ID du client."
         ),
+        "clients search": (
+            "Rechercher des clients par nom, email, entreprise ou téléphone "
+            "(début de mot), classés par pertinence : ajouter '--page' pour "
+            "les pages suivantes."
+        ),
         "clients create": (
             "Créer un nouveau client (Commercial uniquement)."
         ),
         "clients update": (
             "Modifier un client existant (Commercial uniquement)."
         ),
+        "clients import": (
+            "Importer des clients depuis un fichier CSV ou JSONL "
+            "(Commercial uniquement)."
+        ),
         "contrats": "Commandes pour gérer les contrats.",
         "contrats create": (
             "Créer un nouveau contrat (Gestion uniquement)."
         ),
         "contrats list": (
             "Afficher la liste des contrats. Ajouter '-unsigned' pour les "
-            "contrats non signés, '-unpaid' pour les contrats impayés., "
-            "'-all' "
+            "contrats non signés, '-unpaid' pour les contrats impayés, "
+            "'--sort' pour changer l'ordre, '-all' "
             "pour tous les contrats (commercial uniquement)."
         ),
         "contrats update": (
@@ -46,10 +55,29 @@ COMMAND_DESCRIPTIONS = {
         "evenements assign_support": (
             "Assigner un support à un événement (Gestion uniquement)."
         ),
+        "evenements auto-assign": (
+            "Attribuer un support à tous les événements sans support, en "
+            "équilibrant la charge et sans chevauchement de dates (Gestion "
+            "uniquement). Ajouter '--dry-run' pour simuler."
+        ),
+        "evenements conflicts": (
+            "Lister les événements d'un même support dont les dates se "
+            "chevauchent (Gestion, ou Support pour son planning)."
+        ),
         "evenements list": (
             "Lister les événements, ajouter '-mine' pour les événements "
             "attribués au support et '-unassigned' pour les événements sans "
-            "support. (Gestion uniquement)."
+            "support. (Gestion uniquement). Filtres : '--from', '--to', "
+            "'--lieu', '--client' et '--min-participants'."
+        ),
+        "evenements export-ics": (
+            "Exporter ses événements (Support) ou tous les événements "
+            "(Gestion) au format iCalendar, '--output' pour le fichier."
+        ),
+        "evenements calendar": (
+            "Afficher les événements de la semaine en grille ('--month' pour "
+            "le mois, '--date' pour une autre période, '-mine' pour ceux "
+            "du support)."
         ),
         "evenements update": (
             "Mettre à jour un événement (Support uniquement)."
@@ -68,6 +96,32 @@ COMMAND_DESCRIPTIONS = {
         "collaborateurs delete": (
             "Supprimer un collaborateur (Gestion uniquement)."
         ),
+        "collaborateurs import": (
+            "Importer des collaborateurs depuis un fichier CSV ou JSONL "
+            "(Gestion uniquement)."
+        ),
+        "reports": "Commandes pour consulter les rapports.",
+        "reports revenue": (
+            "Chiffre d'affaires et reste à encaisser par commercial et par "
+            "mois (Gestion uniquement). Ajouter '--rebuild' pour recalculer "
+            "la table de synthèse."
+        ),
+        "export": (
+            "Exporter les clients, contrats ou événements (CSV, JSONL, "
+            "colonnes)."
+        ),
+        "export clients": (
+            "Exporter les clients : '-all' pour tous les clients "
+            "(commercial), '--format' et '--output' pour le fichier."
+        ),
+        "export contrats": (
+            "Exporter les contrats : '-all' pour tous les contrats "
+            "(commercial), '--format' et '--output' pour le fichier."
+        ),
+        "export evenements": (
+            "Exporter les événements : '-mine' pour ceux du support, "
+            "'--format' et '--output' pour le fichier."
+        ),
         "clear": "Nettoyer l'affichage du terminal.",
         "exit": "Quitter l'application."
     }
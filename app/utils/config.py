@@ -1,8 +1,14 @@
 import os
 import json
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dotenv import load_dotenv
 from rich.console import Console
+from rich.text import Text
 import click
+from app.auth.permission_index import (
+    META_KEY, check_command, command_path, current_role
+)
 
 console = Console()
 
@@ -20,7 +26,28 @@ def get_role_commands():
 
 
 class CustomGroup(click.Group):
-    """Gère les erreurs pour les sous-commandes."""
+    """
+    Gère les erreurs pour les sous-commandes et applique l'index des
+    permissions lorsque la commande passe par la CLI principale.
+    """
+    def list_commands(self, ctx):
+        """Sous-commandes, limitées à celles autorisées pour le rôle."""
+        names = super().list_commands(ctx)
+        index = ctx.meta.get(META_KEY)
+        role = current_role() if index else None
+        if not role:
+            return names
+        return [name for name in names
+                if index.allows(role, command_path(ctx, name))]
+
+    def resolve_command(self, ctx, args):
+        """Vérifie l'accès du rôle à la sous-commande invoquée."""
+        cmd_name, command, args = super().resolve_command(ctx, args)
+        index = ctx.meta.get(META_KEY)
+        if index is not None and command is not None:
+            check_command(ctx, command_path(ctx, command.name), index)
+        return cmd_name, command, args
+
     def get_command(self, ctx, cmd_name):
         """Intercepter les erreurs sur les sous-commandes."""
         command = super().get_command(ctx, cmd_name)
@@ -31,3 +58,86 @@ class CustomGroup(click.Group):
             )
             ctx.exit(1)
         return command
+
+
+def pagination_options(func):
+    """Ajoute les options de pagination et de streaming d'une liste."""
+    func = click.option(
+        "--stream", is_flag=True,
+        help="Afficher les lignes au fil de la lecture."
+    )(func)
+    func = click.option(
+        "--after-id", type=int, default=None,
+        help="N'afficher que les lignes d'ID supérieur."
+    )(func)
+    func = click.option(
+        "--page-size", type=click.IntRange(min=1), default=None,
+        help="Nombre maximum de lignes affichées."
+    )(func)
+    return func
+
+
+def print_next_page_hint(console, count, last, page_size):
+    """Indique comment afficher la page suivante si la page est pleine."""
+    if page_size and last is not None and count == page_size:
+        console.print(
+            f"[dim]Page suivante : --page-size {page_size} "
+            f"--after-id {last.id}[/dim]"
+        )
+
+
+_command_errors: ContextVar = ContextVar("command_errors", default=None)
+
+
+@contextmanager
+def non_interactive():
+    """
+    Désactive les saisies interactives (mode batch) : `ask` n'interroge
+    plus l'utilisateur et exige les options correspondantes.
+
+    Fournit la liste des erreurs signalées par `record_error`, y compris
+    celles que les commandes interceptent et se contentent d'afficher.
+    """
+    errors = []
+    reset_token = _command_errors.set(errors)
+    try:
+        yield errors
+    finally:
+        _command_errors.reset(reset_token)
+
+
+def record_error(message):
+    """Signale l'échec de la commande en cours en mode batch."""
+    errors = _command_errors.get()
+    if errors is not None:
+        errors.append(message)
+
+
+def print_error(console, message, **kwargs):
+    """
+    Affiche un message d'erreur (balisage rich) et signale l'échec de la
+    commande en cours au mode batch.
+    """
+    console.print(message, **kwargs)
+    record_error(Text.from_markup(message).plain)
+
+
+def ask(value, text, option, confirm=False, **kwargs):
+    """
+    Retourne `value` si l'option `option` a été fournie, sinon la demande
+    à l'utilisateur (`click.prompt`, ou `click.confirm` si `confirm`).
+
+    En mode non interactif, la valeur par défaut de la saisie est utilisée
+    si elle existe ; sinon l'option est obligatoire.
+    """
+    if value is not None:
+        return value
+    if _command_errors.get() is not None:
+        if "default" in kwargs:
+            return kwargs["default"]
+        error_message = f"L'option {option} est obligatoire en mode batch."
+        record_error(error_message)
+        raise click.UsageError(error_message)
+    if confirm:
+        return click.confirm(text, **kwargs)
+    return click.prompt(text, **kwargs)
@@ -1,9 +1,13 @@
 import os
+from collections import Counter
 from cryptography.fernet import Fernet, InvalidToken
 
 TOKEN_FILE = os.path.expanduser("~/.epicevents_token")
 KEY_FILE = os.path.expanduser("~/.epicevents_key")
 
+# Compteurs d'accès au fichier de clé et de déchiffrements
+STATS = Counter()
+
 
 def generate_key():
     if not os.path.exists(KEY_FILE):
@@ -13,6 +17,7 @@ def generate_key():
 
 
 def load_key():
+    STATS["key_reads"] += 1
     with open(KEY_FILE, "rb") as key_file:
         return key_file.read()
 
@@ -44,6 +49,7 @@ def load_token():
     with open(TOKEN_FILE, "rb") as file:
         encrypted_token = file.read()
 
+    STATS["decrypts"] += 1
     try:
         return cipher.decrypt(encrypted_token).decode()
     except (InvalidToken, TypeError):
@@ -0,0 +1,86 @@
+import datetime
+
+# Identifiant du logiciel et domaine des UID (RFC 5545)
+PRODID = "-//Epic Events//CRM//FR"
+UID_DOMAIN = "epicevents"
+# Longueur maximale d'une ligne, en octets hors CRLF
+LINE_OCTETS = 75
+
+
+def event_uid(evenement_id: int) -> str:
+    """UID stable d'un événement : un nouvel export met à jour l'existant."""
+    return f"evenement-{evenement_id}@{UID_DOMAIN}"
+
+
+def escape_text(value) -> str:
+    """Échappe une valeur texte (antislash, ';', ',' et retours ligne)."""
+    return (
+        str(value).replace("\\", "\\\\").replace(";", "\\;")
+        .replace(",", "\\,").replace("\r\n", "\\n").replace("\n", "\\n")
+    )
+
+
+def fold(line: str) -> bytes:
+    """
+    Encode une ligne en UTF-8, repliée tous les 75 octets (CRLF puis
+    espace) sans couper un caractère.
+    """
+    data = line.encode("utf-8")
+    chunks, start, limit = [], 0, LINE_OCTETS
+    while len(data) - start > limit:
+        cut = start + limit
+        # Recule jusqu'au début du caractère (octets 10xxxxxx : suite)
+        while data[cut] & 0xC0 == 0x80:
+            cut -= 1
+        chunks.append(data[start:cut])
+        # L'espace de continuation compte dans la ligne suivante
+        start, limit = cut, LINE_OCTETS - 1
+    chunks.append(data[start:])
+    return b"\r\n ".join(chunks) + b"\r\n"
+
+
+def event_lines(row, stamp: str):
+    """Lignes VEVENT d'un événement (ligne de `export_evenements_query`)."""
+    # Événement sur des journées entières : la fin est exclusive
+    fin = row.date_fin + datetime.timedelta(days=1)
+    support = (
+        f"{row.support_prenom} {row.support_nom}" if row.id_support
+        else "Non attribué"
+    )
+    description = "\n".join([
+        f"Client : {row.client_nom}",
+        f"Contact : {row.client_email} - {row.client_telephone}",
+        f"Participants : {row.nombre_participants}",
+        f"Support : {support}",
+        f"Notes : {row.notes or 'Aucune'}",
+    ])
+    yield "BEGIN:VEVENT"
+    yield f"UID:{event_uid(row.id)}"
+    yield f"DTSTAMP:{stamp}"
+    yield f"DTSTART;VALUE=DATE:{row.date_debut.strftime('%Y%m%d')}"
+    yield f"DTEND;VALUE=DATE:{fin.strftime('%Y%m%d')}"
+    yield f"SUMMARY:{escape_text(f'Événement {row.id} - {row.client_nom}')}"
+    yield f"LOCATION:{escape_text(row.lieu)}"
+    yield f"DESCRIPTION:{escape_text(description)}"
+    yield "END:VEVENT"
+
+
+def write_ics(stream, rows, name: str = "Epic Events", now=None) -> int:
+    """
+    Écrit un calendrier iCalendar (RFC 5545) dans le flux binaire
+    `stream`, un événement à la fois, et retourne le nombre d'événements.
+    """
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    stamp = now.strftime("%Y%m%dT%H%M%SZ")
+    header = [
+        "BEGIN:VCALENDAR", "VERSION:2.0", f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN", "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(name)}",
+    ]
+    stream.write(b"".join(fold(line) for line in header))
+    count = 0
+    for row in rows:
+        stream.write(b"".join(fold(line) for line in event_lines(row, stamp)))
+        count += 1
+    stream.write(fold("END:VCALENDAR"))
+    return count
@@ -0,0 +1,120 @@
+import random
+
+
+class _Node:
+    __slots__ = (
+        "start", "end", "value", "priority", "max_end", "left", "right"
+    )
+
+    def __init__(self, start, end, value, priority):
+        self.start = start
+        self.end = end
+        self.value = value
+        self.priority = priority
+        self.max_end = end
+        self.left = None
+        self.right = None
+
+
+def _update(node):
+    node.max_end = node.end
+    for child in (node.left, node.right):
+        if child is not None and child.max_end > node.max_end:
+            node.max_end = child.max_end
+
+
+def _rotate_right(node):
+    child = node.left
+    node.left, child.right = child.right, node
+    _update(node)
+    _update(child)
+    return child
+
+
+def _rotate_left(node):
+    child = node.right
+    node.right, child.left = child.left, node
+    _update(node)
+    _update(child)
+    return child
+
+
+class IntervalTree:
+    """
+    Intervalles fermés [début, fin] (dates, nombres...) rangés dans un
+    arbre binaire de recherche équilibré (treap) trié par début, où chaque
+    nœud connaît la plus grande fin de son sous-arbre : insertion et
+    recherche d'un chevauchement en O(log n) en moyenne.
+    """
+
+    def __init__(self, intervals=(), seed=None):
+        self._root = None
+        self._size = 0
+        self._random = random.Random(seed)
+        for start, end, value in intervals:
+            self.add(start, end, value)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, start, end, value=None):
+        """Ajoute l'intervalle [start, end] associé à `value`."""
+        if end < start:
+            raise ValueError("La fin d'un intervalle précède son début.")
+        node = _Node(start, end, value, self._random.random())
+        self._root = self._insert(self._root, node)
+        self._size += 1
+
+    def _insert(self, root, node):
+        if root is None:
+            return node
+        if node.start < root.start:
+            root.left = self._insert(root.left, node)
+            if root.left.priority > root.priority:
+                return _rotate_right(root)
+        else:
+            root.right = self._insert(root.right, node)
+            if root.right.priority > root.priority:
+                return _rotate_left(root)
+        _update(root)
+        return root
+
+    def find_overlap(self, start, end):
+        """
+        Un intervalle (début, fin, valeur) qui chevauche [start, end],
+        ou None. Deux intervalles qui partagent une borne se chevauchent.
+        """
+        node = self._root
+        while node is not None:
+            if node.start <= end and start <= node.end:
+                return node.start, node.end, node.value
+            # Si un intervalle à gauche finit après `start` sans
+            # chevaucher, il commence après `end`, comme tout le côté droit
+            if node.left is not None and node.left.max_end >= start:
+                node = node.left
+            else:
+                node = node.right
+        return None
+
+    def overlapping(self, start, end) -> list:
+        """
+        Tous les intervalles (début, fin, valeur) qui chevauchent
+        [start, end], par début croissant. Les sous-arbres qui finissent
+        avant `start` ou commencent après `end` ne sont pas parcourus.
+        """
+        found, stack = [], []
+        node = self._root
+        while stack or node is not None:
+            # Descente à gauche, tant qu'un intervalle y finit assez tard
+            while node is not None and node.max_end >= start:
+                stack.append(node)
+                node = node.left
+            if not stack:
+                break
+            node = stack.pop()
+            if node.start > end:
+                break
+            if node.end >= start:
+                found.append((node.start, node.end, node.value))
+            node = node.right
+        return found
@@ -0,0 +1,22 @@
+import math
+
+# Centiles rapportés par les tests de charge
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(samples, q: float) -> float:
+    """Centile `q` (méthode du rang le plus proche) d'une liste de mesures."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(1, math.ceil(q / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def summarize(samples) -> dict:
+    """Nombre de mesures, centiles p50/p95/p99 et maximum."""
+    summary = {"count": len(samples)}
+    for q in PERCENTILES:
+        summary[f"p{q}"] = percentile(samples, q)
+    summary["max"] = max(samples, default=0.0)
+    return summary
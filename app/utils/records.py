@@ -0,0 +1,123 @@
+import csv
+import datetime
+import json
+from dataclasses import dataclass, field
+from itertools import islice
+
+# Formats de fichiers d'import
+RECORD_FORMATS = ("csv", "jsonl")
+
+# Formats d'export ; "columnar" regroupe les valeurs par colonne
+EXPORT_FORMATS = ("csv", "jsonl", "columnar")
+
+# Nombre de lignes par groupe du format colonne
+COLUMNAR_ROW_GROUP = 5000
+
+
+@dataclass
+class ImportReport:
+    """Bilan d'un import : lignes insérées et erreurs (ligne, message)."""
+    inserted: int = 0
+    errors: list = field(default_factory=list)
+
+
+def guess_format(filename, default="csv"):
+    """Déduit le format d'un fichier de son extension."""
+    for fmt in RECORD_FORMATS:
+        if filename.lower().endswith(f".{fmt}"):
+            return fmt
+    if filename.lower().endswith(".json"):
+        return "jsonl"
+    return default
+
+
+def read_records(stream, fmt):
+    """
+    Lit un fichier CSV (avec en-tête) ou JSONL ligne à ligne.
+
+    Produit des couples (numéro de ligne, enregistrement) ; une ligne
+    illisible produit (numéro de ligne, ValueError) sans interrompre la
+    lecture.
+    """
+    if fmt == "csv":
+        reader = csv.DictReader(stream)
+        for record in reader:
+            yield reader.line_num, record
+        return
+
+    for lineno, line in enumerate(stream, start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError as e:
+            yield lineno, ValueError(f"JSON invalide : {e}")
+            continue
+        if not isinstance(record, dict):
+            yield lineno, ValueError("Objet JSON attendu.")
+            continue
+        yield lineno, record
+
+
+def chunked(iterable, size):
+    """Découpe `iterable` en listes d'au plus `size` éléments."""
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def to_value(value):
+    """Convertit une valeur de base de données en valeur sérialisable."""
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return value
+
+
+def write_records(stream, fmt, columns, rows):
+    """
+    Écrit les lignes (tuples dans l'ordre de `columns`) au fil de l'eau
+    et retourne leur nombre.
+
+    - csv : en-tête puis une ligne par enregistrement ;
+    - jsonl : un objet JSON par ligne ;
+    - columnar : une ligne d'en-tête JSON (`columns`), puis une ligne JSON
+      par groupe de COLUMNAR_ROW_GROUP lignes contenant les valeurs de
+      chaque colonne (`values`), plus compact pour les gros volumes.
+    """
+    count = 0
+    if fmt == "csv":
+        writer = csv.writer(stream, lineterminator="\n")
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([to_value(value) for value in row])
+            count += 1
+        return count
+
+    if fmt == "jsonl":
+        for row in rows:
+            record = dict(zip(columns, map(to_value, row)))
+            stream.write(json.dumps(record, ensure_ascii=False) + "\n")
+            count += 1
+        return count
+
+    compact = {"ensure_ascii": False, "separators": (",", ":")}
+    stream.write(json.dumps({"columns": list(columns)}, **compact) + "\n")
+    for group in chunked(rows, COLUMNAR_ROW_GROUP):
+        values = [
+            [to_value(value) for value in column] for column in zip(*group)
+        ]
+        stream.write(
+            json.dumps({"count": len(group), "values": values}, **compact)
+            + "\n"
+        )
+        count += len(group)
+    return count
+
+
+def read_columnar(stream):
+    """Relit un fichier au format colonne, ligne par ligne (dict)."""
+    columns = json.loads(next(stream))["columns"]
+    for line in stream:
+        group = json.loads(line)
+        for row in zip(*group["values"]):
+            yield dict(zip(columns, row))
@@ -0,0 +1,44 @@
+from itertools import islice
+from rich.table import Table
+from app.utils.tracing import span
+
+# Nombre de lignes par tableau affiché en mode streaming
+STREAM_CHUNK_SIZE = 200
+
+
+def print_table(console, title, columns, items, row, stream=False):
+    """
+    Affiche `items` dans un tableau rich.
+
+    `columns` est une liste de couples (titre, options de colonne) et `row`
+    transforme un élément en tuple de cellules. En mode streaming, les
+    lignes sont affichées par tableaux successifs de STREAM_CHUNK_SIZE
+    lignes : la mémoire reste constante et les premières lignes
+    apparaissent immédiatement.
+
+    Retourne le nombre d'éléments affichés et le dernier élément.
+    """
+    items = iter(items)
+    chunk_size = STREAM_CHUNK_SIZE if stream else None
+    count, last = 0, None
+
+    while True:
+        chunk = list(islice(items, chunk_size))
+        if not chunk:
+            break
+
+        with span("render", f"Tableau de {len(chunk)} ligne(s)"):
+            table = Table(
+                title=title if count == 0 else None, show_header=count == 0
+            )
+            for name, options in columns:
+                table.add_column(name, **options)
+            for item in chunk:
+                table.add_row(*row(item))
+            console.print(table)
+
+        count += len(chunk)
+        last = chunk[-1]
+        if chunk_size is None:
+            break
+    return count, last
@@ -1,18 +1,51 @@
-import sentry_sdk
 import os
+import sys
 from dotenv import load_dotenv
 
 load_dotenv()
 
 SENTRY_DSN = os.getenv("SENTRY_DSN")
+# Fraction des commandes tracées (transactions Sentry et fichier local)
+TRACES_SAMPLE_RATE = float(os.getenv("TRACES_SAMPLE_RATE", "0.1"))
+# Fichier JSON lines recevant les traces, sans accès réseau
+TRACES_FILE = os.getenv("TRACES_FILE")
 
-if not SENTRY_DSN:
-    print("❌ SENTRY_DSN non défini. Sentry ne sera pas activé.")
 
-else:
-    sentry_sdk.init(
-        dsn=SENTRY_DSN,
-        send_default_pii=True,
-        traces_sample_rate=1.0
-        )
-    print("✅ Sentry est activé.")
+class LazySentry:
+    """
+    Donne accès au SDK Sentry en ne l'important (et en ne l'initialisant)
+    qu'au premier appel, pour ne pas ralentir le démarrage de la CLI.
+    """
+    def __init__(self):
+        self._sdk = None
+
+    def _load(self):
+        if self._sdk is None:
+            import sentry_sdk
+
+            if SENTRY_DSN:
+                sentry_sdk.init(
+                    dsn=SENTRY_DSN,
+                    send_default_pii=True,
+                    traces_sample_rate=TRACES_SAMPLE_RATE
+                )
+            self._sdk = sentry_sdk
+        return self._sdk
+
+    def __getattr__(self, name):
+        return getattr(self._load(), name)
+
+
+sentry_sdk = LazySentry()
+
+
+def report_sentry_status():
+    """
+    Indique au démarrage si Sentry sera activé (sur stderr, pour ne pas
+    se mêler aux exports écrits sur la sortie standard).
+    """
+    if not SENTRY_DSN:
+        print("❌ SENTRY_DSN non défini. Sentry ne sera pas activé.",
+              file=sys.stderr)
+    else:
+        print("✅ Sentry est activé.", file=sys.stderr)
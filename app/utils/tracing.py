@@ -0,0 +1,136 @@
+import datetime
+import json
+import random
+import time
+import uuid
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from app.utils import sentry
+
+# Longueur maximale d'une requête SQL dans la description d'un span
+DESCRIPTION_LENGTH = 300
+
+_current_trace: ContextVar = ContextVar("command_trace", default=None)
+
+
+class CommandTrace:
+    """Durée d'une commande et de ses étapes (auth, requêtes, rendu)."""
+    def __init__(self, name: str):
+        self.name = name
+        self.trace_id = uuid.uuid4().hex
+        self.started_at = datetime.datetime.now(datetime.timezone.utc)
+        self.start = time.perf_counter()
+        self.status = "ok"
+        self.spans = []
+
+    def add_span(self, op: str, description, start: float, end: float):
+        self.spans.append({
+            "op": op,
+            "description": description,
+            "start_ms": round((start - self.start) * 1000, 3),
+            "duration_ms": round((end - start) * 1000, 3),
+        })
+
+    def to_record(self, end: float) -> dict:
+        return {
+            "transaction": self.name,
+            "trace_id": self.trace_id,
+            "timestamp": self.started_at.isoformat(),
+            "duration_ms": round((end - self.start) * 1000, 3),
+            "status": self.status,
+            "spans": self.spans,
+        }
+
+
+def tracing_enabled() -> bool:
+    """Traces envoyées à Sentry ou écrites dans TRACES_FILE."""
+    return bool(sentry.SENTRY_DSN or sentry.TRACES_FILE)
+
+
+def export_trace(record: dict, path: str):
+    """Ajoute une trace au fichier JSON lines local (sans réseau)."""
+    with open(path, "a", encoding="utf-8") as traces:
+        traces.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+@contextmanager
+def command_transaction(name: str):
+    """
+    Mesure une commande, pour une fraction TRACES_SAMPLE_RATE des
+    exécutions : transaction Sentry (si SENTRY_DSN) et ligne JSON dans
+    TRACES_FILE (si défini). Les blocs imbriqués comptent dans le bloc
+    englobant.
+    """
+    if (not tracing_enabled() or _current_trace.get() is not None
+            or random.random() >= sentry.TRACES_SAMPLE_RATE):
+        yield None
+        return
+
+    trace = CommandTrace(name)
+    reset_token = _current_trace.set(trace)
+    # L'échantillonnage est déjà décidé : Sentry le respecte
+    transaction = sentry.sentry_sdk.start_transaction(
+        op="cli.command", name=name, sampled=True
+    ) if sentry.SENTRY_DSN else nullcontext()
+    try:
+        with transaction:
+            yield trace
+    except Exception as e:
+        # ctx.exit(0) lève une exception sans être une erreur
+        if getattr(e, "exit_code", 1) != 0:
+            trace.status = "internal_error"
+        raise
+    finally:
+        _current_trace.reset(reset_token)
+        if sentry.TRACES_FILE:
+            export_trace(trace.to_record(time.perf_counter()),
+                         sentry.TRACES_FILE)
+
+
+@contextmanager
+def span(op: str, description: str = None):
+    """Mesure une étape de la commande en cours (si elle est tracée)."""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    child = sentry.sentry_sdk.start_span(
+        op=op, name=description
+    ) if sentry.SENTRY_DSN else nullcontext()
+    try:
+        with child:
+            yield
+    finally:
+        trace.add_span(op, description, start, time.perf_counter())
+
+
+def install(engine):
+    """
+    Enregistre un span par requête SQL dans les traces locales. Côté
+    Sentry, l'intégration SQLAlchemy du SDK s'en charge déjà.
+    """
+    from sqlalchemy import event
+
+    if event.contains(engine, "before_cursor_execute", before_execute):
+        return
+    event.listen(engine, "before_cursor_execute", before_execute)
+    event.listen(engine, "after_cursor_execute", after_execute)
+
+
+def before_execute(conn, cursor, statement, parameters, context,
+                   executemany):
+    if _current_trace.get() is not None:
+        conn.info.setdefault("span_start", []).append(time.perf_counter())
+
+
+def after_execute(conn, cursor, statement, parameters, context,
+                  executemany):
+    trace = _current_trace.get()
+    starts = conn.info.get("span_start")
+    if trace is not None and starts:
+        trace.add_span(
+            "db", " ".join(statement.split())[:DESCRIPTION_LENGTH],
+            starts.pop(), time.perf_counter()
+        )
@@ -0,0 +1,265 @@
+import argparse
+import datetime
+import io
+import os
+import random
+import time
+from contextlib import redirect_stderr, redirect_stdout
+
+# Opérations rejouées et leur poids par défaut dans le mélange
+OPERATIONS = {
+    "clients": "clients list",
+    "contrats": "contrats list -unpaid",
+    "assign": "evenements assign_support",
+}
+DEFAULT_MIX = "clients=5,contrats=3,assign=2"
+
+
+def parse_mix(value: str) -> dict:
+    """Convertit 'clients=5,assign=2' en poids par opération."""
+    mix = {}
+    for item in value.split(","):
+        name, _, weight = item.partition("=")
+        name = name.strip()
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(
+                f"Opération inconnue : {name} "
+                f"(choix : {', '.join(OPERATIONS)})"
+            )
+        try:
+            mix[name] = float(weight or 1)
+        except ValueError:
+            raise argparse.ArgumentTypeError(f"Poids invalide : {item}")
+    return mix
+
+
+class LoadHarness:
+    """
+    Rejoue un mélange de commandes CLI dans le processus courant, pour le
+    compte d'un gestionnaire, et mesure la durée de chacune (sortie
+    masquée, seule la première erreur est gardée). Chaque commande a sa
+    propre session, comme en ligne de commande.
+    """
+
+    def __init__(self, cli, db, auth, rng, page_size=50):
+        from sqlalchemy import func, select
+        from app.db.models import Client, Collaborateur, Evenement
+        from app.db.models.collaborateur import Departement
+
+        self.cli = cli
+        self.db = db
+        self.auth = auth
+        self.rng = rng
+        self.page_size = page_size
+        self.max_client_id = db.scalar(select(func.max(Client.id))) or 0
+        self.support_ids = list(db.scalars(
+            select(Collaborateur.id).join(Departement)
+            .where(Departement.nom == "support")
+        ))
+        # Événements à assigner, consommés au fil des exécutions
+        self.unassigned = list(db.execute(
+            select(Evenement.id, Evenement.date_debut, Evenement.date_fin)
+            .where(Evenement.id_support.is_(None))
+            .order_by(Evenement.id).limit(100000)
+        ))
+        rng.shuffle(self.unassigned)
+        # Événements abandonnés faute de support libre à leurs dates
+        self.skipped = 0
+        # Première ligne d'erreur de chaque commande en échec
+        self.errors = {}
+
+    def next_args(self, operation):
+        """Arguments de la prochaine exécution (None : plus possible)."""
+        from app.crud.evenements import get_overlapping_evenement
+
+        if operation == "clients":
+            after_id = self.rng.randrange(max(1, self.max_client_id))
+            return ["clients", "list", "-all", "--page-size",
+                    str(self.page_size), "--after-id", str(after_id)]
+        if operation == "contrats":
+            return ["contrats", "list", "-unpaid", "--page-size",
+                    str(self.page_size)]
+        if not self.support_ids:
+            return None
+        # Un support libre à ces dates, sinon l'attribution serait refusée
+        try:
+            while self.unassigned:
+                evenement = self.unassigned.pop()
+                for id_support in self.rng.sample(
+                    self.support_ids, len(self.support_ids)
+                ):
+                    if get_overlapping_evenement(
+                        self.db, id_support, evenement.date_debut,
+                        evenement.date_fin
+                    ) is None:
+                        return ["evenements", "assign_support",
+                                "--evenement", str(evenement.id),
+                                "--support", str(id_support)]
+                self.skipped += 1
+            return None
+        finally:
+            # Termine la lecture : sous SQLite, sa transaction garderait un
+            # verrou partagé et bloquerait l'écriture de la commande
+            self.db.rollback()
+
+    def run_command(self, args):
+        """
+        Exécute une commande ; retourne sa durée et, en cas d'échec, la
+        première ligne d'erreur (None si elle a réussi).
+        """
+        from app.auth.context import auth_scope
+        from app.db.scope import command_session_scope
+        from app.utils.config import non_interactive
+
+        output = io.StringIO()
+        started = time.perf_counter()
+        try:
+            with non_interactive() as errors, auth_scope(self.auth), \
+                    command_session_scope(), redirect_stdout(output), \
+                    redirect_stderr(output):
+                result = self.cli.main(
+                    args=args, prog_name="main.py", standalone_mode=False
+                )
+            if errors:
+                error = errors[0]
+            elif result:
+                error = first_line(output.getvalue()) or f"code {result}"
+            else:
+                error = None
+        except Exception as e:
+            error = f"{type(e).__name__} : {e}"
+        elapsed = time.perf_counter() - started
+        return elapsed, error and first_line(error)
+
+    def run(self, iterations, mix, warmup=0):
+        """
+        Exécute `iterations` commandes tirées selon les poids `mix`.
+        Retourne, par commande, les durées (secondes) et le nombre d'échecs ;
+        la première erreur de chaque commande est gardée dans `errors`.
+        """
+        names = [name for name, weight in mix.items() if weight > 0]
+        weights = [mix[name] for name in names]
+        samples = {OPERATIONS[name]: [] for name in names}
+        failures = dict.fromkeys(samples, 0)
+
+        for i in range(warmup + iterations):
+            operation = self.rng.choices(names, weights)[0]
+            args = self.next_args(operation)
+            if args is None:
+                continue
+            elapsed, error = self.run_command(args)
+            if i < warmup:
+                continue
+            command = OPERATIONS[operation]
+            samples[command].append(elapsed)
+            if error:
+                failures[command] += 1
+                self.errors.setdefault(command, error)
+        return samples, failures
+
+
+def gestion_context(db, login=None):
+    """Identité d'un gestionnaire (le premier, ou celui de `login`)."""
+    from sqlalchemy import select
+    from app.auth.context import AuthContext
+    from app.db.models import Collaborateur
+    from app.db.models.collaborateur import Departement
+
+    query = (
+        select(Collaborateur).join(Departement)
+        .where(Departement.nom == "gestion").order_by(Collaborateur.id)
+    )
+    if login:
+        query = query.where(Collaborateur.login == login)
+    gestionnaire = db.scalars(query.limit(1)).first()
+    if gestionnaire is None:
+        return None
+    return AuthContext(
+        user_id=gestionnaire.id, role="gestion", nom=gestionnaire.nom,
+        prenom=gestionnaire.prenom,
+        expiry=datetime.datetime.max.replace(tzinfo=datetime.timezone.utc)
+    )
+
+
+def first_line(text: str) -> str:
+    """Première ligne non vide d'un texte."""
+    return next(
+        (line.strip() for line in str(text).splitlines() if line.strip()), ""
+    )
+
+
+def print_report(samples, failures, errors=None):
+    from rich.console import Console
+    from rich.table import Table
+    from app.utils.latency import summarize
+
+    table = Table(title="Latences par commande (ms)")
+    for column in ("Commande", "Exécutions", "Échecs",
+                   "p50", "p95", "p99", "max"):
+        table.add_column(column, justify="left" if column == "Commande"
+                         else "right")
+    for command, durations in samples.items():
+        summary = summarize(durations)
+        table.add_row(
+            command, str(summary["count"]), str(failures[command]),
+            *(f"{summary[key] * 1000:.1f}"
+              for key in ("p50", "p95", "p99", "max"))
+        )
+    console = Console()
+    console.print(table)
+    for command, error in (errors or {}).items():
+        console.print(f"Premier échec de « {command} » : {error}",
+                      markup=False)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Rejoue un mélange de commandes CLI et rapporte les "
+                    "latences p50/p95/p99 par commande. Les assignations "
+                    "de supports modifient la base."
+    )
+    parser.add_argument("--iterations", type=int, default=200,
+                        help="Nombre de commandes mesurées.")
+    parser.add_argument("--warmup", type=int, default=5,
+                        help="Commandes exécutées avant les mesures.")
+    parser.add_argument(
+        "--mix", type=parse_mix, default=parse_mix(DEFAULT_MIX),
+        help=f"Poids des opérations (défaut : {DEFAULT_MIX})."
+    )
+    parser.add_argument("--page-size", type=int, default=50,
+                        help="Taille des pages listées.")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Graine du tirage des commandes.")
+    parser.add_argument("--login", default=None,
+                        help="Login du gestionnaire (le premier par défaut).")
+    parser.add_argument(
+        "--database-url", default=None,
+        help="Base ciblée (SQLite ou MySQL locale), DATABASE_URL sinon."
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    # Imports après la configuration : le moteur lit DATABASE_URL
+    from app.cli.main import cli
+    from app.db.session import SessionLocal
+
+    with SessionLocal() as db:
+        auth = gestion_context(db, args.login)
+        if auth is None:
+            print("Erreur : aucun gestionnaire en base.")
+            return 1
+        harness = LoadHarness(
+            cli, db, auth, random.Random(args.seed), args.page_size
+        )
+    samples, failures = harness.run(args.iterations, args.mix, args.warmup)
+    print_report(samples, failures, harness.errors)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
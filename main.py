@@ -1,38 +1,28 @@
 import sys
 import click
-from app.utils.sentry import sentry_sdk
+from app.utils.sentry import sentry_sdk, report_sentry_status
+from app.db.profiling import enable_profiling
 from rich.console import Console
-from prompt_toolkit import PromptSession
-from prompt_toolkit.styles import Style
 from app.cli.main import cli
-from app.db.session import SessionLocal
-from app.db.base import Base
-from sqlalchemy.exc import SQLAlchemyError
 from rich.markup import escape
-from app.utils.file_utils import load_token
-from app.auth.jwt_utils import decode_token
-from app.utils.config import get_role_commands
+from app.auth.context import get_auth_context
+from app.auth.permission_index import get_permission_index
 from app.utils.command_descriptions import get_command_description
 
 
 console = Console()
-ROLE_COMMANDS = get_role_commands()
 
-prompt_style = Style.from_dict({
+PROMPT_STYLE = {
     'prompt': '#00CFFF bold',
-})
+}
 
 
 def get_user_role():
     """Récupère le rôle de l'utilisateur connecté à partir du token."""
-    token = load_token()
-    if not token:
+    auth = get_auth_context()
+    if not auth:
         return None
-
-    payload = decode_token(token)
-    if not payload:
-        return None
-    return payload.get("role")
+    return auth.role
 
 
 def init_database():
@@ -40,6 +30,9 @@ def init_database():
     Initialise la base de données avec les tables nécessaires.
     """
     console.print("[cyan]Initialisation de la base de données...[/cyan]")
+    from sqlalchemy.exc import SQLAlchemyError
+    from app.db.session import SessionLocal
+    from app.db.base import Base
     from app.db.models import collaborateur, client, contrat, evenement # noqa
 
     try:
@@ -58,12 +51,40 @@ def init_database():
         sys.exit(1)
 
 
+def run_batch(argv):
+    """
+    Exécute les commandes d'un fichier (`--batch fichier`) ou de l'entrée
+    standard (`--batch -`), une par ligne, dans un seul processus.
+    Avec `--atomic`, aucune modification n'est enregistrée si une commande
+    échoue. Retourne le code de sortie.
+    """
+    from app.cli.batch import BatchRunner
+
+    index = argv.index("--batch")
+    path = argv[index + 1] if index + 1 < len(argv) else "-"
+    runner = BatchRunner(cli, atomic="--atomic" in argv)
+
+    if path == "-":
+        failures = runner.run(sys.stdin)
+    else:
+        try:
+            with open(path, encoding="utf-8") as lines:
+                failures = runner.run(lines)
+        except OSError as e:
+            console.print(
+                f"[bold red]Erreur : impossible de lire {escape(path)} : "
+                f"{escape(str(e))}[/bold red]"
+            )
+            return 1
+    return 1 if failures else 0
+
+
 def display_welcome_message():
     """
     Affiche un message d'accueil élégant et la liste des commandes autorisées.
     """
     role = get_user_role()
-    allowed_commands = ROLE_COMMANDS.get(role, [])
+    allowed_commands = get_permission_index().commands(role)
 
     console.print(
         """
@@ -114,7 +135,7 @@ def custom_help():
         )
         return
 
-    allowed_commands = ROLE_COMMANDS.get(role, [])
+    allowed_commands = get_permission_index().commands(role)
     if allowed_commands:
         console.print(f"[bold cyan]🎭 Rôle détecté : {role}[/bold cyan]\n")
         console.print("[bold green]Commandes disponibles :[/bold green]\n")
@@ -134,9 +155,24 @@ def interactive_menu():
     """
     Lance un menu interactif avec un prompt en boucle.
     """
+    from prompt_toolkit import PromptSession
+    from prompt_toolkit.styles import Style
+    from app.auth.context import auth_scope
+    from app.cli.shell import InteractiveShell
+
     display_welcome_message()
 
-    session = PromptSession()
+    prompt_style = Style.from_dict(PROMPT_STYLE)
+    shell = InteractiveShell(cli)
+    shell.warm_up()
+    session = PromptSession(completer=shell.completer)
+    # Identité conservée en mémoire pour toute la session
+    with auth_scope():
+        run_shell(shell, session, prompt_style)
+
+
+def run_shell(shell, session, prompt_style):
+    """Boucle du menu interactif."""
     while True:
         try:
             command = session.prompt(
@@ -149,7 +185,7 @@ def interactive_menu():
                 break
 
             elif command:
-                cli.main(standalone_mode=False, args=command.split())
+                shell.run_command(command)
         except KeyboardInterrupt:
             console.print(
                 "\n[bold yellow]Interrompu par l'utilisateur. "
@@ -173,10 +209,19 @@ def main():
     """
     Point d'entrée principal.
     """
+    report_sentry_status()
+
+    if "--profile" in sys.argv:
+        sys.argv.remove("--profile")
+        enable_profiling()
+
     if "--init-db" in sys.argv:
         init_database()
         sys.exit(0)
 
+    if "--batch" in sys.argv:
+        sys.exit(run_batch(sys.argv))
+
     if len(sys.argv) > 1:
         try:
             cli()
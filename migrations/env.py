@@ -2,11 +2,13 @@ from logging.config import fileConfig
 from sqlalchemy import engine_from_config
 from sqlalchemy import pool
 from app.db.base import Base
+from app.db import models  # noqa: F401  (enregistre les tables)
 from alembic import context
 from app.core.config import settings
 
 config = context.config
-fileConfig(config.config_file_name)
+if config.config_file_name and not config.attributes.get("connection"):
+    fileConfig(config.config_file_name)
 config.set_main_option('sqlalchemy.url', settings.DATABASE_URL)
 
 target_metadata = Base.metadata
@@ -37,6 +39,12 @@ def run_migrations_offline() -> None:
 
 
 def run_migrations_online():
+    # Une connexion peut être fournie par l'appelant (tests, scripts)
+    connection = config.attributes.get("connection")
+    if connection is not None:
+        run_migrations_with(connection)
+        return
+
     connectable = engine_from_config(
         config.get_section(config.config_ini_section),
         prefix='sqlalchemy.',
@@ -44,12 +52,16 @@ def run_migrations_online():
     )
 
     with connectable.connect() as connection:
-        context.configure(
-            connection=connection, target_metadata=target_metadata
-        )
+        run_migrations_with(connection)
+
 
-        with context.begin_transaction():
-            context.run_migrations()
+def run_migrations_with(connection):
+    context.configure(
+        connection=connection, target_metadata=target_metadata
+    )
+
+    with context.begin_transaction():
+        context.run_migrations()
 
 
 if context.is_offline_mode():
@@ -0,0 +1,108 @@
+"""schema initial
+
+Revision ID: 5b2f3c9a1d04
+Revises:
+Create Date: 2025-03-05 10:00:00.000000
+
+Schéma tel que créé par `init_db.py` avant l'introduction des migrations.
+Une base existante créée par `init_db.py` doit être marquée avec
+`alembic stamp 5b2f3c9a1d04` avant `alembic upgrade head`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5b2f3c9a1d04'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'departements',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('nom', sa.String(length=50), nullable=False),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('nom')
+    )
+    op.create_index('ix_departements_id', 'departements', ['id'])
+
+    op.create_table(
+        'collaborateurs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('nom', sa.String(length=50), nullable=False),
+        sa.Column('prenom', sa.String(length=50), nullable=False),
+        sa.Column('email', sa.String(length=100), nullable=False),
+        sa.Column('login', sa.String(length=50), nullable=False),
+        sa.Column('password_hash', sa.String(length=255), nullable=False),
+        sa.Column('departement_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['departement_id'], ['departements.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email'),
+        sa.UniqueConstraint('login')
+    )
+    op.create_index('ix_collaborateurs_id', 'collaborateurs', ['id'])
+
+    op.create_table(
+        'clients',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('nom_complet', sa.String(length=100), nullable=False),
+        sa.Column('email', sa.String(length=100), nullable=False),
+        sa.Column('telephone', sa.String(length=20), nullable=True),
+        sa.Column('nom_entreprise', sa.String(length=100), nullable=True),
+        sa.Column('date_creation', sa.DateTime(), nullable=True),
+        sa.Column(
+            'date_derniere_mise_a_jour', sa.DateTime(), nullable=True
+        ),
+        sa.Column('id_commercial', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['id_commercial'], ['collaborateurs.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('email')
+    )
+    op.create_index('ix_clients_id', 'clients', ['id'])
+
+    op.create_table(
+        'contrats',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('id_client', sa.Integer(), nullable=True),
+        sa.Column('montant_total', sa.Float(), nullable=False),
+        sa.Column('montant_restant', sa.Float(), nullable=False),
+        sa.Column('date_creation', sa.DateTime(), nullable=True),
+        sa.Column('statut', sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(['id_client'], ['clients.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_contrats_id', 'contrats', ['id'])
+
+    op.create_table(
+        'evenements',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('id_contrat', sa.Integer(), nullable=True),
+        sa.Column('id_support', sa.Integer(), nullable=True),
+        sa.Column('date_debut', sa.Date(), nullable=False),
+        sa.Column('date_fin', sa.Date(), nullable=False),
+        sa.Column('lieu', sa.String(length=255), nullable=False),
+        sa.Column('nombre_participants', sa.Integer(), nullable=False),
+        sa.Column('notes', sa.Text(), nullable=True),
+        sa.ForeignKeyConstraint(['id_contrat'], ['contrats.id']),
+        sa.ForeignKeyConstraint(['id_support'], ['collaborateurs.id']),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_evenements_id', 'evenements', ['id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_evenements_id', table_name='evenements')
+    op.drop_table('evenements')
+    op.drop_index('ix_contrats_id', table_name='contrats')
+    op.drop_table('contrats')
+    op.drop_index('ix_clients_id', table_name='clients')
+    op.drop_table('clients')
+    op.drop_index('ix_collaborateurs_id', table_name='collaborateurs')
+    op.drop_table('collaborateurs')
+    op.drop_index('ix_departements_id', table_name='departements')
+    op.drop_table('departements')
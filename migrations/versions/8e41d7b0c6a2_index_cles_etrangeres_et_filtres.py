@@ -0,0 +1,61 @@
+"""index des clés étrangères et des filtres
+
+Revision ID: 8e41d7b0c6a2
+Revises: 5b2f3c9a1d04
+Create Date: 2025-03-12 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e41d7b0c6a2'
+down_revision: Union[str, None] = '5b2f3c9a1d04'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Index partiels, uniquement pour les dialectes qui les supportent
+PARTIAL_INDEX_DIALECTS = ("sqlite", "postgresql")
+
+# Index servant aux clés étrangères : MySQL refuse de les supprimer tant que
+# la contrainte existe (il les recrée de lui-même si elles sont absentes).
+FOREIGN_KEY_INDEXES = (
+    ('ix_clients_id_commercial', 'clients'),
+    ('ix_contrats_id_client_statut', 'contrats'),
+    ('ix_evenements_id_contrat', 'evenements'),
+    ('ix_evenements_id_support', 'evenements'),
+)
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_clients_id_commercial', 'clients', ['id_commercial']
+    )
+    op.create_index(
+        'ix_contrats_id_client_statut', 'contrats', ['id_client', 'statut']
+    )
+    op.create_index('ix_contrats_statut', 'contrats', ['statut'])
+    op.create_index('ix_evenements_id_contrat', 'evenements', ['id_contrat'])
+    op.create_index('ix_evenements_id_support', 'evenements', ['id_support'])
+
+    if op.get_context().dialect.name in PARTIAL_INDEX_DIALECTS:
+        op.create_index(
+            'ix_evenements_sans_support', 'evenements', ['date_debut'],
+            sqlite_where=sa.text('id_support IS NULL'),
+            postgresql_where=sa.text('id_support IS NULL')
+        )
+
+
+def downgrade() -> None:
+    dialect = op.get_context().dialect.name
+
+    if dialect in PARTIAL_INDEX_DIALECTS:
+        op.drop_index('ix_evenements_sans_support', table_name='evenements')
+    op.drop_index('ix_contrats_statut', table_name='contrats')
+
+    if dialect != "mysql":
+        for index_name, table_name in FOREIGN_KEY_INDEXES:
+            op.drop_index(index_name, table_name=table_name)
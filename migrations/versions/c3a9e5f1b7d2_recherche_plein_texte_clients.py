@@ -0,0 +1,70 @@
+"""recherche plein texte des clients
+
+Revision ID: c3a9e5f1b7d2
+Revises: 8e41d7b0c6a2
+Create Date: 2025-03-20 10:00:00.000000
+
+MySQL : index FULLTEXT sur les colonnes recherchées. SQLite : table FTS5
+à contenu externe, tenue à jour par des triggers, puis remplie avec les
+clients existants.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3a9e5f1b7d2'
+down_revision: Union[str, None] = '8e41d7b0c6a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+SEARCH_COLUMNS = ["nom_complet", "email", "nom_entreprise", "telephone"]
+
+SQLITE_FTS_DDL = (
+    "CREATE VIRTUAL TABLE clients_fts USING fts5("
+    "nom_complet, email, nom_entreprise, telephone, "
+    "content='clients', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER clients_fts_insert AFTER INSERT ON clients BEGIN "
+    "INSERT INTO clients_fts(rowid, nom_complet, email, nom_entreprise, "
+    "telephone) VALUES (new.id, new.nom_complet, new.email, "
+    "new.nom_entreprise, new.telephone); END",
+    "CREATE TRIGGER clients_fts_delete AFTER DELETE ON clients BEGIN "
+    "INSERT INTO clients_fts(clients_fts, rowid, nom_complet, email, "
+    "nom_entreprise, telephone) VALUES ('delete', old.id, old.nom_complet, "
+    "old.email, old.nom_entreprise, old.telephone); END",
+    "CREATE TRIGGER clients_fts_update AFTER UPDATE ON clients BEGIN "
+    "INSERT INTO clients_fts(clients_fts, rowid, nom_complet, email, "
+    "nom_entreprise, telephone) VALUES ('delete', old.id, old.nom_complet, "
+    "old.email, old.nom_entreprise, old.telephone); "
+    "INSERT INTO clients_fts(rowid, nom_complet, email, nom_entreprise, "
+    "telephone) VALUES (new.id, new.nom_complet, new.email, "
+    "new.nom_entreprise, new.telephone); END",
+    # Indexe les clients déjà présents
+    "INSERT INTO clients_fts(clients_fts) VALUES ('rebuild')",
+)
+
+
+def upgrade() -> None:
+    dialect = op.get_context().dialect.name
+
+    if dialect == "mysql":
+        op.create_index(
+            'ix_clients_recherche', 'clients', SEARCH_COLUMNS,
+            mysql_prefix='FULLTEXT'
+        )
+    elif dialect == "sqlite":
+        for statement in SQLITE_FTS_DDL:
+            op.execute(statement)
+
+
+def downgrade() -> None:
+    dialect = op.get_context().dialect.name
+
+    if dialect == "mysql":
+        op.drop_index('ix_clients_recherche', table_name='clients')
+    elif dialect == "sqlite":
+        for trigger in ("insert", "delete", "update"):
+            op.execute(f"DROP TRIGGER IF EXISTS clients_fts_{trigger}")
+        op.execute("DROP TABLE IF EXISTS clients_fts")
@@ -0,0 +1,41 @@
+"""synthèse du chiffre d'affaires
+
+Revision ID: d81f4a2c6e93
+Revises: c3a9e5f1b7d2
+Create Date: 2025-03-24 10:00:00.000000
+
+Table de synthèse de `reports revenue`, utilisée avec REVENUE_SUMMARY.
+Elle est remplie par `reports revenue --rebuild`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd81f4a2c6e93'
+down_revision: Union[str, None] = 'c3a9e5f1b7d2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'revenus_mensuels',
+        sa.Column('id_commercial', sa.Integer(), autoincrement=False,
+                  nullable=False),
+        sa.Column('annee', sa.Integer(), autoincrement=False,
+                  nullable=False),
+        sa.Column('mois', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('nb_contrats', sa.Integer(), nullable=False),
+        sa.Column('nb_signes', sa.Integer(), nullable=False),
+        sa.Column('montant_total', sa.Float(), nullable=False),
+        sa.Column('montant_signe', sa.Float(), nullable=False),
+        sa.Column('montant_restant', sa.Float(), nullable=False),
+        sa.PrimaryKeyConstraint('id_commercial', 'annee', 'mois')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('revenus_mensuels')
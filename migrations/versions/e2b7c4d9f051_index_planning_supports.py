@@ -0,0 +1,33 @@
+"""index du planning des supports
+
+Revision ID: e2b7c4d9f051
+Revises: d81f4a2c6e93
+Create Date: 2025-03-27 10:00:00.000000
+
+Index (id_support, date_debut, date_fin) pour détecter les événements
+d'un support qui se chevauchent (partiel sous SQLite et PostgreSQL).
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2b7c4d9f051'
+down_revision: Union[str, None] = 'd81f4a2c6e93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_evenements_support_dates', 'evenements',
+        ['id_support', 'date_debut', 'date_fin'],
+        sqlite_where=sa.text('id_support IS NOT NULL'),
+        postgresql_where=sa.text('id_support IS NOT NULL')
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_evenements_support_dates', table_name='evenements')
@@ -0,0 +1,29 @@
+"""index de la date de début des événements
+
+Revision ID: f4c8a1e6d237
+Revises: e2b7c4d9f051
+Create Date: 2025-03-31 10:00:00.000000
+
+Index sur evenements.date_debut pour les filtres par période de
+`evenements list` et la vue `evenements calendar`.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c8a1e6d237'
+down_revision: Union[str, None] = 'e2b7c4d9f051'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_evenements_date_debut', 'evenements', ['date_debut']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_evenements_date_debut', table_name='evenements')
@@ -3,11 +3,53 @@ from app.db.models.collaborateur import Collaborateur, Departement
 from app.db.models.client import Client
 from app.db.models.contrat import Contrat
 from app.db.models.evenement import Evenement
-from datetime import datetime
+from app.auth.hashing import hash_password, hash_passwords
+from app.crud.reports import add_revenue_rows
+from datetime import date, datetime, timedelta
+from sqlalchemy import func, insert, select
+import argparse
 import logging
+import math
+import random
+import secrets
+import time
 
 logging.getLogger('passlib').setLevel(logging.ERROR)
 
+COLLABORATEURS = [
+    ("Jean", "Patrick", "admin@example.com", "gestion", "admin", "admin123"),
+    ("Robert", "John", "admin2@gmail.com", "gestion", "admin2", "admin123"),
+    ("Dion", "Celine", "celine.dion@gmail.com", "commercial", "celine",
+     "password123"),
+    ("Jackson", "Michael", "michael.jackson@gmail.com", "commercial",
+     "michael", "password123"),
+    ("Crusoé", "Robinson", "robinson.crusoé@gmail.com", "support",
+     "robinson", "support123"),
+    ("Hemingway", "Ernest", "ernest.hemingway@gmail.com", "support",
+     "ernest", "support123"),
+]
+
+
+def build_collaborateurs(departement_ids, collaborateurs=COLLABORATEURS):
+    """
+    Crée les collaborateurs (nom, prénom, email, département, login, mot de
+    passe), indexés par login. Les mots de passe sont hachés en parallèle
+    dans un pool de processus.
+    """
+    hashes = hash_passwords(password for *_, password in collaborateurs)
+    return {
+        login: Collaborateur(
+            nom=nom,
+            prenom=prenom,
+            email=email,
+            departement_id=departement_ids[departement],
+            login=login,
+            password_hash=password_hash
+        )
+        for (nom, prenom, email, departement, login, _), password_hash
+        in zip(collaborateurs, hashes)
+    }
+
 
 def seed_departements():
     """
@@ -39,55 +81,17 @@ def seed_data():
             Departement.nom == "commercial"
         ).first().id
 
-        # Création des collaborateurs
-        admin1 = Collaborateur(
-            nom="Jean",
-            prenom="Patrick",
-            email="admin@example.com",
-            departement_id=gestion_id,  # Assignation correcte du département
-            login="admin",
-            password_hash=Collaborateur.set_password("admin123")
-        )
-        admin2 = Collaborateur(
-            nom="Robert",
-            prenom="John",
-            email="admin2@gmail.com",
-            departement_id=gestion_id,
-            login="admin2",
-            password_hash=Collaborateur.set_password("admin123")
-        )
-        commercial1 = Collaborateur(
-            nom="Dion",
-            prenom="Celine",
-            email="celine.dion@gmail.com",
-            departement_id=commercial_id,
-            login="celine",
-            password_hash=Collaborateur.set_password("password123")
-        )
-        commercial2 = Collaborateur(
-            nom="Jackson",
-            prenom="Michael",
-            email="michael.jackson@gmail.com",
-            departement_id=commercial_id,
-            login="michael",
-            password_hash=Collaborateur.set_password("password123")
-        )
-        support1 = Collaborateur(
-            nom="Crusoé",
-            prenom="Robinson",
-            email="robinson.crusoé@gmail.com",
-            departement_id=support_id,
-            login="robinson",
-            password_hash=Collaborateur.set_password("support123")
-        )
-        support2 = Collaborateur(
-            nom="Hemingway",
-            prenom="Ernest",
-            email="ernest.hemingway@gmail.com",
-            departement_id=support_id,
-            login="ernest",
-            password_hash=Collaborateur.set_password("support123")
-        )
+        # Création des collaborateurs (mots de passe hachés en parallèle)
+        collaborateurs = build_collaborateurs({
+            "gestion": gestion_id,
+            "support": support_id,
+            "commercial": commercial_id,
+        })
+        admin1, admin2 = collaborateurs["admin"], collaborateurs["admin2"]
+        commercial1 = collaborateurs["celine"]
+        commercial2 = collaborateurs["michael"]
+        support1 = collaborateurs["robinson"]
+        support2 = collaborateurs["ernest"]
 
         db.add_all([
             admin1, admin2, commercial1, support1, commercial2, support2
@@ -210,6 +214,247 @@ def seed_data():
         db.close()
 
 
+# Données synthétiques pour les tests de charge
+PRENOMS = [
+    "Alice", "Bruno", "Camille", "David", "Emma", "Farid", "Gaelle", "Hugo",
+    "Ines", "Julien", "Karim", "Lea", "Mathis", "Nora", "Oscar", "Pauline",
+    "Quentin", "Rose", "Samir", "Theo", "Ursule", "Victor", "Yasmine", "Zoe",
+]
+NOMS = [
+    "Martin", "Bernard", "Dubois", "Thomas", "Robert", "Richard", "Petit",
+    "Durand", "Leroy", "Moreau", "Simon", "Laurent", "Lefebvre", "Michel",
+    "Garcia", "David", "Bertrand", "Roux", "Vincent", "Fournier", "Morel",
+]
+SECTEURS = [
+    "Conseil", "Solutions", "Industries", "Digital", "Events", "Logistique",
+    "Partners", "Studio", "Group", "Technologies",
+]
+VILLES = [
+    "Paris", "Lyon", "Marseille", "Bordeaux", "Lille", "Nantes", "Nice",
+    "Strasbourg", "Toulouse", "Rennes", "Montpellier", "Annecy",
+]
+DOMAINES = ["gmail.com", "outlook.fr", "orange.fr", "entreprise.fr"]
+GENERATED_PASSWORD = "password123"
+
+
+def ensure_staff(db, departement, count):
+    """
+    Retourne les IDs d'au moins `count` collaborateurs du département, en
+    créant des comptes synthétiques (mot de passe commun) si besoin. Leur
+    création ne consomme pas le générateur des données : un même `seed`
+    produit les mêmes clients, que les comptes existent déjà ou non.
+    """
+    departement_id = db.scalar(
+        select(Departement.id).where(Departement.nom == departement)
+    )
+    ids = list(db.scalars(
+        select(Collaborateur.id)
+        .where(Collaborateur.departement_id == departement_id)
+        .order_by(Collaborateur.id)
+    ))
+    missing = count - len(ids)
+    if missing > 0:
+        # Un seul hachage : tous les comptes générés partagent le mot de
+        # passe GENERATED_PASSWORD.
+        password_hash = hash_password(GENERATED_PASSWORD)
+        suffix = secrets.token_hex(3)
+        rows = [
+            {
+                "nom": NOMS[i % len(NOMS)],
+                "prenom": PRENOMS[i % len(PRENOMS)],
+                "email": f"gen_{departement}_{suffix}_{i}@epicevents.fr",
+                "login": f"gen_{departement}_{suffix}_{i}",
+                "password_hash": password_hash,
+                "departement_id": departement_id,
+            }
+            for i in range(missing)
+        ]
+        db.execute(insert(Collaborateur), rows)
+        db.commit()
+        ids = list(db.scalars(
+            select(Collaborateur.id)
+            .where(Collaborateur.departement_id == departement_id)
+            .order_by(Collaborateur.id)
+        ))
+    return ids[:count]
+
+
+def zipf_weights(count, exponent=0.8):
+    """Poids décroissants : quelques collaborateurs très chargés."""
+    return [1 / (rank + 1) ** exponent for rank in range(count)]
+
+
+def draw_count(rng, mean):
+    """Nombre d'éléments (loi exponentielle arrondie, de moyenne `mean`)."""
+    if mean <= 0:
+        return 0
+    return int(rng.expovariate(1 / (mean + 0.5)))
+
+
+def next_id(db, model):
+    return (db.scalar(select(func.max(model.id))) or 0) + 1
+
+
+def generate_rows(rng, client_id, commercial_ids, commercial_weights,
+                  support_ids, contrats_per_client, evenements_per_contrat,
+                  contrat_id, evenement_id, today):
+    """Génère un client, ses contrats et leurs événements."""
+    prenom, nom = rng.choice(PRENOMS), rng.choice(NOMS)
+    client = {
+        "id": client_id,
+        "nom_complet": f"{prenom} {nom}",
+        "email": (f"{prenom}.{nom}.{client_id}@"
+                  f"{rng.choice(DOMAINES)}").lower(),
+        "telephone": f"0{rng.choice('67')}{rng.randrange(10 ** 8):08d}",
+        "nom_entreprise": f"{rng.choice(NOMS)} {rng.choice(SECTEURS)}",
+        "id_commercial": rng.choices(commercial_ids, commercial_weights)[0],
+        "date_creation": datetime.combine(
+            today - timedelta(days=rng.randrange(3 * 365)), datetime.min.time()
+        ),
+    }
+    contrats, evenements = [], []
+    for _ in range(draw_count(rng, contrats_per_client)):
+        # Montants log-normaux (médiane 8 000 €), 70 % de contrats signés
+        montant_total = round(rng.lognormvariate(math.log(8000), 0.8), 2)
+        statut = rng.random() < 0.7
+        if not statut:
+            montant_restant = montant_total
+        elif rng.random() < 0.4:
+            montant_restant = 0.0
+        else:
+            montant_restant = round(montant_total * rng.random(), 2)
+        contrats.append({
+            "id": contrat_id,
+            "id_client": client_id,
+            "montant_total": montant_total,
+            "montant_restant": montant_restant,
+            "statut": statut,
+            "date_creation": client["date_creation"],
+        })
+        # Seuls les contrats signés ont des événements
+        for _ in range(draw_count(rng, evenements_per_contrat) if statut
+                       else 0):
+            debut = today + timedelta(days=rng.randrange(-730, 365))
+            # Les événements passés ont tous un support, 30 % des futurs
+            # restent à assigner.
+            assigned = debut < today or rng.random() < 0.7
+            evenements.append({
+                "id": evenement_id,
+                "id_contrat": contrat_id,
+                "id_support": rng.choice(support_ids) if assigned else None,
+                "date_debut": debut,
+                "date_fin": debut + timedelta(
+                    days=1 + int(rng.expovariate(1))
+                ),
+                "lieu": rng.choice(VILLES),
+                "nombre_participants": max(1, min(5000, int(
+                    rng.lognormvariate(math.log(80), 0.9)
+                ))),
+                "notes": None,
+            })
+            evenement_id += 1
+        contrat_id += 1
+    return client, contrats, evenements, contrat_id, evenement_id
+
+
+def generate_data(db, clients, contrats_per_client=2.0,
+                  evenements_per_contrat=1.0, commerciaux=20, supports=10,
+                  seed=None, chunk_size=5000):
+    """
+    Génère un jeu de données synthétique à grande échelle par insertions
+    en masse (une instruction par table et par lot), reproductible avec
+    `seed`. Retourne le nombre de lignes insérées par table.
+    """
+    rng = random.Random(seed)
+    # Au moins un gestionnaire, pour le harnais de charge (load_test.py)
+    ensure_staff(db, "gestion", 1)
+    commercial_ids = ensure_staff(db, "commercial", commerciaux)
+    support_ids = ensure_staff(db, "support", supports)
+    commercial_weights = zipf_weights(len(commercial_ids))
+    client_id = next_id(db, Client)
+    contrat_id = next_id(db, Contrat)
+    evenement_id = next_id(db, Evenement)
+    today = date.today()
+    counts = {"clients": 0, "contrats": 0, "evenements": 0}
+
+    for start in range(0, clients, chunk_size):
+        client_rows, contrat_rows, evenement_rows = [], [], []
+        for _ in range(min(chunk_size, clients - start)):
+            client, contrats, evenements, contrat_id, evenement_id = (
+                generate_rows(
+                    rng, client_id, commercial_ids, commercial_weights,
+                    support_ids, contrats_per_client, evenements_per_contrat,
+                    contrat_id, evenement_id, today
+                )
+            )
+            client_rows.append(client)
+            contrat_rows.extend(contrats)
+            evenement_rows.extend(evenements)
+            client_id += 1
+        for model, rows in ((Client, client_rows), (Contrat, contrat_rows),
+                            (Evenement, evenement_rows)):
+            # Insertion Core (table) : l'ORM découperait les lots selon les
+            # colonnes NULL de chaque ligne.
+            if rows:
+                db.execute(insert(model.__table__), rows)
+        # Synthèse du chiffre d'affaires (si REVENUE_SUMMARY), même lot
+        add_revenue_rows(db, contrat_rows, {
+            client["id"]: client["id_commercial"] for client in client_rows
+        })
+        db.commit()
+        counts["clients"] += len(client_rows)
+        counts["contrats"] += len(contrat_rows)
+        counts["evenements"] += len(evenement_rows)
+    return counts
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Ajoute les données de démonstration, ou un jeu de "
+                    "données synthétique avec --clients."
+    )
+    parser.add_argument(
+        "--clients", type=int, default=0,
+        help="Nombre de clients synthétiques à générer (ex. 1_000_000)."
+    )
+    parser.add_argument(
+        "--contracts-per-client", type=float, default=2.0,
+        help="Nombre moyen de contrats par client."
+    )
+    parser.add_argument(
+        "--events-per-contract", type=float, default=1.0,
+        help="Nombre moyen d'événements par contrat signé."
+    )
+    parser.add_argument("--commercials", type=int, default=20,
+                        help="Nombre de commerciaux.")
+    parser.add_argument("--supports", type=int, default=10,
+                        help="Nombre de supports.")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="Graine du générateur (jeu reproductible).")
+    parser.add_argument("--chunk-size", type=int, default=5000,
+                        help="Nombre de clients insérés par lot.")
+    return parser.parse_args(argv)
+
+
 if __name__ == "__main__":
+    args = parse_args()
     seed_departements()
-    seed_data()
+    if not args.clients:
+        seed_data()
+    else:
+        started = time.perf_counter()
+        with SessionLocal() as db:
+            counts = generate_data(
+                db, args.clients,
+                contrats_per_client=args.contracts_per_client,
+                evenements_per_contrat=args.events_per_contract,
+                commerciaux=args.commercials,
+                supports=args.supports,
+                seed=args.seed,
+                chunk_size=args.chunk_size,
+            )
+        print(
+            f"{counts['clients']} clients, {counts['contrats']} contrats et "
+            f"{counts['evenements']} événements générés en "
+            f"{time.perf_counter() - started:.1f} s."
+        )